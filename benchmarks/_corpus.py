@@ -0,0 +1,42 @@
+"""
+Synthetic corpus of real-world-sized product listing pages shared by the HTML benchmarks.
+"""
+import random
+
+WORDS = "ราคา สินค้า premium cotton shirt blue red ส่งฟรี sale new limited edition fast delivery".split()
+
+
+def _words(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def make_page(seed: int, products: int = 400, table_rows: int = 200) -> str:
+    """One listing page of roughly 300-400 KB: nav, product cards, scripts and a spec table."""
+    rng = random.Random(seed)
+    parts = [
+        "<!DOCTYPE html><html><head><meta charset='utf-8'>",
+        f"<title>Listing page {seed}</title>",
+        "<style>" + ".c{color:red}" * 200 + "</style>",
+        "<script>window.__STATE__ = " + '{"k": 1},' * 500 + "</script></head><body>",
+        "<nav class='top main'>" + "".join(f"<a href='/c/{i}' rel='nofollow'>Cat {i}</a>" for i in range(40)) + "</nav>",
+        "<h1 class='title'>Products</h1><div id='grid'>",
+    ]
+    for i in range(products):
+        parts.append(
+            f"<div class='product card' data-id='{seed}-{i}'>"
+            f"<a class='link' href='/p/{seed}/{i}'><img src='/img/{i}.jpg' alt='{_words(rng, 3)}'></a>"
+            f"<h2 class='name'> {_words(rng, 5)} </h2>"
+            f"<div class='meta'><span class='price'>{rng.randint(10, 99999):,}.00</span>"
+            f"<span class='rating' title='{rng.random() * 5:.1f}'>★★★★</span></div>"
+            f"<p class='desc'>{_words(rng, 25)} <b>{_words(rng, 2)}</b></p>"
+            "<!-- tracking pixel --></div>"
+        )
+    parts.append("</div><table id='specs'><thead><tr><th>SKU</th><th>Name</th><th>Stock</th></tr></thead><tbody>")
+    for i in range(table_rows):
+        parts.append(f"<tr><td>SKU-{i}</td><td>{_words(rng, 3)}</td><td>{rng.randint(0, 500)}</td></tr>")
+    parts.append("</tbody></table><footer><p>© shop</p></footer></body></html>")
+    return "".join(parts)
+
+
+def make_corpus(pages: int = 20) -> list:
+    return [make_page(seed) for seed in range(pages)]
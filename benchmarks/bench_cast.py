@@ -0,0 +1,71 @@
+"""
+Benchmark: per-cell vs bulk (column-at-a-time) type casts.
+
+Casts generated scraped columns with to_int / to_float / to_bool one cell
+at a time and with to_ints / to_floats / to_bools, for clean columns and
+columns where 1% of cells do not parse, then times DataConverter.cast
+over the same rows. Reports million cells per second.
+
+Run:
+    python benchmarks/bench_cast.py
+"""
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tlnk import DataConverter  # noqa: E402
+from tlnk.utils import to_int, to_float, to_bool, to_ints, to_floats, to_bools  # noqa: E402
+
+CELLS = 1_000_000
+
+
+def make_columns(count: int, bad: float):
+    rng = random.Random(0)
+
+    def spoil(value: str) -> str:
+        return "n/a" if rng.random() < bad else value
+
+    return {
+        "id": ("int", [spoil(f"{rng.randint(0, 5_000_000):,}") for _ in range(count)]),
+        "stock": ("int", [spoil(str(rng.randint(0, 50))) for _ in range(count)]),
+        "price": ("float", [spoil(f"{rng.random() * 10000:,.2f}") for _ in range(count)]),
+        "active": ("bool", [spoil(rng.choice(("yes", "no", "True", "false", "1", "0"))) for _ in range(count)]),
+    }
+
+
+def best(func, repeat: int = 3) -> float:
+    elapsed = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    return elapsed
+
+
+def main():
+    scalar = {"int": to_int, "float": to_float, "bool": to_bool}
+    bulk = {"int": to_ints, "float": to_floats, "bool": to_bools}
+    print(f"{CELLS:,} cells per column, million cells / second\n")
+    print(f"{'column':<8}{'type':<7}{'bad':>4}{'per cell':>10}{'bulk':>8}{'speedup':>9}  same")
+    for bad in (0.0, 0.01):
+        for name, (dtype, values) in make_columns(CELLS, bad).items():
+            per_cell = best(lambda: list(map(scalar[dtype], values)))
+            in_bulk = best(lambda: bulk[dtype](values))
+            same = list(map(scalar[dtype], values)) == bulk[dtype](values)
+            print(f"{name:<8}{dtype:<7}{bad:>4.0%}{CELLS / per_cell / 1e6:>10.2f}{CELLS / in_bulk / 1e6:>8.2f}"
+                  f"{per_cell / in_bulk:>8.1f}x  {same}")
+
+    columns = make_columns(CELLS // 4, 0.01)
+    rows = [dict(zip(columns, cells)) for cells in zip(*(values for _, values in columns.values()))]
+    schema = {name: dtype for name, (dtype, _) in columns.items()}
+    lazy = best(lambda: DataConverter(rows, lazy=True).cast(schema).to_list())
+    eager = best(lambda: DataConverter(rows).cast(schema).to_list())
+    print(f"\nDataConverter.cast, {len(rows):,} rows x {len(schema)} columns: "
+          f"per row (lazy) {lazy:.2f}s, by column (eager) {eager:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark: columnar vs row (list of dicts) storage in DataCleaner / DataConverter.
+
+Runs the same clean -> convert chain over generated scraped rows with
+storage="rows" and storage="columns" and reports time, peak traced
+memory while running, and the memory the result holds.
+
+Run:
+    python benchmarks/bench_columnar.py [rows]
+"""
+import os
+import sys
+import time
+import random
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tlnk import DataCleaner, DataConverter  # noqa: E402
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+
+def make_rows(count: int):
+    rng = random.Random(0)
+    return [
+        {
+            "sku": str(i),
+            "name": f"  สินค้า {i} " if rng.random() > 0.05 else "",
+            "price": f"{rng.random() * 10000:,.2f}",
+            "stock": str(rng.randint(0, 50)),
+            "active": "yes" if rng.random() > 0.2 else "no",
+        }
+        for i in range(count)
+    ]
+
+
+def chain(rows, storage: str) -> DataConverter:
+    cleaner = DataCleaner(rows, storage=storage).strip_whitespace(["name"]).drop_nulls(["name"])
+    return DataConverter(cleaner).cast({"sku": "int", "price": "float", "stock": "int", "active": "bool"})
+
+
+def measure(func):
+    """Best-of-3 time, then peak and retained traced memory of a separate run (tracing slows allocation)."""
+    elapsed = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        func()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    tracemalloc.start()
+    result = func()
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2 ** 20, held / 2 ** 20, result
+
+
+def main():
+    rows = make_rows(ROWS)
+    print(f"{ROWS:,} rows, strip + drop_nulls + 4 casts\n")
+    print(f"{'storage':<10}{'seconds':>9}{'peak MiB':>10}{'held MiB':>10}")
+    results = []
+    for storage in ("rows", "columns"):
+        seconds, peak, held, converter = measure(lambda: chain(rows, storage))
+        results.append(converter)
+        print(f"{storage:<10}{seconds:>9.2f}{peak:>10.1f}{held:>10.1f}")
+    print(f"\nsame result: {results[0].to_list() == results[1].to_list()}")
+
+
+if __name__ == "__main__":
+    main()
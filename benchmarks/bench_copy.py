@@ -0,0 +1,73 @@
+"""
+Benchmark: memory of an eager fetch -> clean -> convert pipeline.
+
+Rows copied on write (the default) are only duplicated by steps that
+edit them; copy=False hands the fetched rows over to be edited in place.
+Reports time, peak traced memory above the fetched rows, and what the
+result holds on top of them.
+
+Run:
+    python benchmarks/bench_copy.py
+"""
+import os
+import sys
+import time
+import random
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tlnk import DataCleaner, DataConverter  # noqa: E402
+
+ROWS = 200_000
+
+
+def fetch(count: int):
+    """Rows as a scraper returns them: one fresh dict per item."""
+    rng = random.Random(0)
+    return [
+        {
+            "sku": str(i),
+            "name": f"สินค้า {i}" if rng.random() > 0.05 else "",
+            "price": f"{rng.random() * 10000:.2f}",
+            "stock": str(rng.randint(0, 50)),
+            "seller": f"shop {rng.randint(1, 500)}",
+        }
+        for i in range(count)
+    ]
+
+
+def pipeline(rows, copy: bool):
+    cleaner = DataCleaner(rows, copy=copy).drop_nulls(["name"]).drop_duplicates(["sku"])
+    return DataConverter(cleaner, copy=copy).cast({"sku": "int", "price": "float", "stock": "int"}).to_list()
+
+
+def measure(copy: bool):
+    """Best-of-3 time, then peak and retained traced memory of a separate run, on fresh rows each time."""
+    elapsed = float("inf")
+    for _ in range(3):
+        rows = fetch(ROWS)
+        start = time.perf_counter()
+        pipeline(rows, copy)
+        elapsed = min(elapsed, time.perf_counter() - start)
+    rows = fetch(ROWS)
+    tracemalloc.start()
+    result = pipeline(rows, copy)
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2 ** 20, held / 2 ** 20, result
+
+
+def main():
+    print(f"{ROWS:,} rows: drop_nulls -> drop_duplicates -> DataConverter.cast\n")
+    print(f"{'rows':<18}{'seconds':>9}{'peak MiB':>10}{'held MiB':>10}")
+    results = []
+    for label, copy in (("copied on write", True), ("copy=False", False)):
+        seconds, peak, held, result = measure(copy)
+        results.append(result)
+        print(f"{label:<18}{seconds:>9.2f}{peak:>10.1f}{held:>10.1f}")
+    print(f"\nsame result: {results[0] == results[1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark: per-cell to_iso vs the column-level DateParser.
+
+Casts generated date columns (ISO, "%d %B %Y", a mix of formats, and
+mostly or entirely unique values) with to_iso cell by cell and with
+to_isos, and reports million cells per second.
+
+Run:
+    python benchmarks/bench_dates.py
+"""
+import os
+import sys
+import time
+import random
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tlnk.utils import to_iso, to_isos  # noqa: E402
+
+CELLS = 100_000
+
+
+def make_columns(count: int):
+    rng = random.Random(0)
+    days = [date(2023, 1, 1) + timedelta(days=rng.randint(0, 730)) for _ in range(count)]
+    mixed = ("%Y-%m-%d", "%d/%m/%Y", "%d %b %Y", "%d %B %Y")
+    return {
+        "iso": [d.isoformat() for d in days],
+        "%d %B %Y": [d.strftime("%d %B %Y") for d in days],
+        "mixed": [d.strftime(rng.choice(mixed)) for d in days],
+        "timestamps": [f"{d.isoformat()} {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}" for d in days],
+        "unique %d-%m-%Y": [(date(1900, 1, 1) + timedelta(days=i)).strftime("%d-%m-%Y") for i in range(count)],
+    }
+
+
+def best(func, repeat: int = 3) -> float:
+    elapsed = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    return elapsed
+
+
+def main():
+    print(f"{CELLS:,} cells per column, million cells / second\n")
+    print(f"{'column':<18}{'per cell':>10}{'column':>9}{'speedup':>9}  same")
+    for name, values in make_columns(CELLS).items():
+        per_cell = best(lambda: [to_iso(v) for v in values], repeat=1)
+        bulk = best(lambda: to_isos(values))
+        same = [to_iso(v) for v in values] == to_isos(values)
+        print(f"{name:<18}{CELLS / per_cell / 1e6:>10.3f}{CELLS / bulk / 1e6:>9.3f}{per_cell / bulk:>8.1f}x  {same}")
+
+
+if __name__ == "__main__":
+    main()
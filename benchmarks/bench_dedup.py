@@ -0,0 +1,64 @@
+"""
+Benchmark: drop_duplicates strategies (exact, hash, bloom, spill).
+
+Streams generated rows (wide URL / title keys, about 30% duplicates)
+through DataCleaner.drop_duplicates with each strategy and reports time,
+peak traced memory, the memory and false-positive rate the strategy
+reports, and how many rows it kept compared with exact.
+
+Run:
+    python benchmarks/bench_dedup.py [rows]
+"""
+import os
+import sys
+import time
+import random
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tlnk import DataCleaner  # noqa: E402
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+
+def make_rows(count: int):
+    rng = random.Random(0)
+    for i in range(count):
+        n = rng.randint(0, int(count * 0.7))
+        yield {
+            "url": f"https://shop.example.com/products/category-{n % 97}/item-{n:09d}?ref=listing",
+            "title": f"สินค้าตัวอย่าง รุ่น {n} สีดำ ขนาดกลาง",
+            "price": f"{n % 1000}.00",
+        }
+
+
+def run(strategy: str, spill_dir: str):
+    cleaner = DataCleaner(make_rows(ROWS)).drop_duplicates(
+        ["url", "title"], strategy=strategy, capacity=ROWS, spill_dir=spill_dir,
+    )
+    kept = sum(1 for _ in cleaner)
+    return kept, cleaner.dedup_stats()[0]
+
+
+def main():
+    print(f"{ROWS:,} rows, dedup on (url, title)\n")
+    print(f"{'strategy':<10}{'seconds':>9}{'peak MiB':>10}{'held MiB':>10}{'fp rate':>10}{'kept':>10}{'vs exact':>9}")
+    exact = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for strategy in ("exact", "hash", "bloom", "spill"):
+            start = time.perf_counter()
+            run(strategy, tmp)
+            seconds = time.perf_counter() - start
+            tracemalloc.start()
+            kept, stats = run(strategy, tmp)
+            peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+            tracemalloc.stop()
+            exact = kept if exact is None else exact
+            print(f"{strategy:<10}{seconds:>9.2f}{peak:>10.1f}{stats.memory_bytes / 2 ** 20:>10.1f}"
+                  f"{stats.false_positive_rate:>10.1e}{kept:>10,}{kept - exact:>+9,}")
+
+
+if __name__ == "__main__":
+    main()
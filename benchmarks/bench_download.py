@@ -0,0 +1,67 @@
+"""
+Benchmark: peak Python memory of HttpClient.get(...).content vs HttpClient.download.
+
+Run:
+    python benchmarks/bench_download.py
+"""
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tlnk import HttpClient  # noqa: E402
+
+BLOCK = os.urandom(1024 * 1024)
+
+
+def start_server(size_mb: int):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(BLOCK) * size_mb))
+            self.end_headers()
+            for _ in range(size_mb):
+                self.wfile.write(BLOCK)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd, f"http://127.0.0.1:{httpd.server_address[1]}"
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def main():
+    logging.getLogger("tlnk.scraper.http").setLevel(logging.WARNING)
+    print(f"{'size':>8}{'mode':>12}{'seconds':>10}{'peak MiB':>10}")
+    for size_mb in (16, 64, 256):
+        httpd, base_url = start_server(size_mb)
+        try:
+            with HttpClient(base_url=base_url) as client, tempfile.TemporaryDirectory() as tmp:
+                dest = os.path.join(tmp, "out.bin")
+                elapsed, peak = measure(lambda: len(client.get("/export").content))
+                print(f"{size_mb:>6}MB{'get':>12}{elapsed:>10.2f}{peak:>10.1f}")
+                elapsed, peak = measure(lambda: client.download("/export", dest))
+                print(f"{size_mb:>6}MB{'download':>12}{elapsed:>10.2f}{peak:>10.1f}")
+        finally:
+            httpd.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark: iterative JsonParser.flatten / iter_flatten vs the previous recursive flatten.
+
+Measures time and peak traced memory on a multi-MB API payload, and depth
+handling on a deeply nested document.
+
+Run:
+    python benchmarks/bench_flatten.py
+"""
+import io
+import os
+import sys
+import json
+import time
+import random
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tlnk import JsonParser  # noqa: E402
+
+
+def legacy_flatten(data, sep="."):
+    def _flatten(obj, prefix=""):
+        items = {}
+        if isinstance(obj, dict):
+            for k, v in obj.items():
+                new_key = f"{prefix}{sep}{k}" if prefix else k
+                items.update(_flatten(v, new_key))
+        elif isinstance(obj, list):
+            for i, v in enumerate(obj):
+                new_key = f"{prefix}{sep}{i}" if prefix else str(i)
+                items.update(_flatten(v, new_key))
+        else:
+            items[prefix] = obj
+        return items
+    return _flatten(data)
+
+
+def make_payload(records: int) -> dict:
+    rng = random.Random(0)
+    return {
+        "meta": {"total": records, "page": 1},
+        "data": [
+            {
+                "id": i,
+                "attributes": {
+                    "name": f"Item {i}",
+                    "price": {"amount": rng.random() * 100, "currency": "THB"},
+                    "variants": [{"sku": f"{i}-{k}", "stock": {"qty": k, "where": {"zone": "A"}}} for k in range(4)],
+                },
+                "relationships": {"seller": {"data": {"id": rng.randint(1, 999), "type": "seller"}}},
+            }
+            for i in range(records)
+        ],
+    }
+
+
+def measure(func):
+    """Best-of-3 time, then peak traced memory of a separate run (tracing slows allocation)."""
+    elapsed = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        result = func()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def stream(parser: JsonParser) -> int:
+    out = io.StringIO()
+    for key, value in parser.iter_flatten():
+        out.write(f"{key}\t{value}\n")
+        if out.tell() > 1 << 20:  # a writer flushing every MiB
+            out.seek(0)
+            out.truncate()
+    return 0
+
+
+def main():
+    payload = make_payload(20_000)
+    size = len(json.dumps(payload)) / 2 ** 20
+    parser = JsonParser(payload)
+    print(f"payload: {size:.1f} MiB JSON\n")
+    print(f"{'method':<30}{'seconds':>9}{'peak MiB':>10}")
+    legacy_s, legacy_mem, expected = measure(lambda: legacy_flatten(payload))
+    flat_s, flat_mem, flat = measure(parser.flatten)
+    stream_s, stream_mem, _ = measure(lambda: stream(parser))
+    for label, seconds, mem in (
+        ("recursive flatten (before)", legacy_s, legacy_mem),
+        ("flatten", flat_s, flat_mem),
+        ("iter_flatten -> writer", stream_s, stream_mem),
+    ):
+        print(f"{label:<30}{seconds:>9.2f}{mem:>10.1f}")
+    print(f"\nsame result: {flat == expected}, round-trip: {JsonParser.unflatten(flat) == payload}")
+
+    deep = leaf = {}
+    for _ in range(5_000):
+        leaf["child"] = {}
+        leaf = leaf["child"]
+    leaf["value"] = 1
+    try:
+        legacy_flatten(deep)
+        legacy = "ok"
+    except RecursionError:
+        legacy = "RecursionError"
+    key, value = next(JsonParser(deep).iter_flatten())
+    print(f"5,000 levels deep: before -> {legacy}, now -> key of {len(key):,} chars, value {value}")
+
+
+if __name__ == "__main__":
+    main()
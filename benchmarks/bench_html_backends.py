@@ -0,0 +1,55 @@
+"""
+Benchmark: HtmlParser parse + extract time per page for each installed backend.
+
+Run:
+    python benchmarks/bench_html_backends.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _corpus import make_corpus  # noqa: E402
+from tlnk import HtmlParser  # noqa: E402
+from tlnk.scraper.backends import available_backends  # noqa: E402
+
+
+def extract(parser: HtmlParser) -> tuple:
+    return (
+        parser.find_text("h1.title"),
+        parser.find_all_text("div.product h2.name"),
+        parser.find_all_text("span.price"),
+        parser.find_all_attr("a.link", "href"),
+        parser.find_attr("nav", "class"),
+        parser.find_table("#specs"),
+    )
+
+
+def main():
+    corpus = make_corpus(20)
+    size_kb = sum(len(page.encode()) for page in corpus) / len(corpus) / 1024
+    print(f"{len(corpus)} pages, {size_kb:.0f} KB average\n")
+    print(f"{'backend':<12}{'parse ms':>10}{'extract ms':>12}{'total ms':>10}{'speedup':>9}  same results")
+    reference, baseline = None, None
+    for backend in reversed(available_backends()):
+        parse_time = extract_time = 0.0
+        results = []
+        for html in corpus:
+            start = time.perf_counter()
+            parser = HtmlParser(html, backend=backend)
+            parsed = time.perf_counter()
+            results.append(extract(parser))
+            extract_time += time.perf_counter() - parsed
+            parse_time += parsed - start
+        total = (parse_time + extract_time) / len(corpus) * 1000
+        reference = reference or results
+        baseline = baseline or total
+        print(
+            f"{backend:<12}{parse_time / len(corpus) * 1000:>10.1f}{extract_time / len(corpus) * 1000:>12.1f}"
+            f"{total:>10.1f}{baseline / total:>9.1f}  {results == reference}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark: full vs partial (`only=`) HtmlParser parsing per backend.
+
+Extracts the product prices and the spec table of each page, once from the
+full tree and once from a tree restricted to those selectors, reporting
+time per page and the memory held by keeping every page's tree alive
+(measured in a fresh process, so lxml's C allocations are included).
+
+Run:
+    python benchmarks/bench_html_partial.py
+"""
+import os
+import sys
+import time
+import resource
+import multiprocessing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _corpus import make_corpus  # noqa: E402
+from tlnk import HtmlParser  # noqa: E402
+from tlnk.scraper.backends import available_backends  # noqa: E402
+
+SELECTORS = ["span.price", "#specs"]
+
+
+def extract(parser: HtmlParser) -> tuple:
+    return parser.find_all_text("span.price"), parser.find_table("#specs")
+
+
+def _held_memory(corpus: list, backend: str, only, queue) -> None:
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    parsers = [HtmlParser(html, backend=backend, only=only) for html in corpus]
+    queue.put((resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before) / 1024 / len(parsers))
+
+
+def run(corpus: list, backend: str, only):
+    results = []
+    start = time.perf_counter()
+    for html in corpus:
+        results.append(extract(HtmlParser(html, backend=backend, only=only)))
+    elapsed = (time.perf_counter() - start) / len(corpus) * 1000
+    queue = multiprocessing.Queue()
+    child = multiprocessing.Process(target=_held_memory, args=(corpus, backend, only, queue))
+    child.start()
+    held = queue.get()
+    child.join()
+    return elapsed, held, results
+
+
+def main():
+    corpus = make_corpus(10)
+    size_kb = sum(len(page.encode()) for page in corpus) / len(corpus) / 1024
+    print(f"{len(corpus)} pages, {size_kb:.0f} KB average, only={SELECTORS}\n")
+    print(f"{'backend':<12}{'full ms':>9}{'partial ms':>12}{'speedup':>9}{'full MiB/page':>15}{'partial MiB/page':>18}  same results")
+    for backend in reversed(available_backends()):
+        full_ms, full_mem, full = run(corpus, backend, None)
+        part_ms, part_mem, part = run(corpus, backend, SELECTORS)
+        print(
+            f"{backend:<12}{full_ms:>9.1f}{part_ms:>12.1f}{full_ms / part_ms:>9.1f}"
+            f"{full_mem:>15.2f}{part_mem:>18.2f}  {full == part}"
+        )
+
+
+if __name__ == "__main__":
+    main()
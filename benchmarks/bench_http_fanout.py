@@ -0,0 +1,74 @@
+"""
+Benchmark: sequential HttpClient.get vs HttpClient.fetch_all vs AsyncHttpClient.get_many.
+
+Run:
+    python benchmarks/bench_http_fanout.py
+"""
+import asyncio
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _stub_server import start_stub_server  # noqa: E402
+from tlnk import HttpClient, AsyncHttpClient  # noqa: E402
+
+N_REQUESTS = 200
+LATENCY = 0.05
+
+
+def bench_sequential(base_url: str) -> float:
+    start = time.perf_counter()
+    with HttpClient(base_url=base_url) as client:
+        for i in range(N_REQUESTS):
+            client.get(f"/item/{i}")
+    return time.perf_counter() - start
+
+
+def bench_threads(base_url: str, workers: int) -> float:
+    start = time.perf_counter()
+    with HttpClient(base_url=base_url) as client:
+        urls = (f"/item/{i}" for i in range(N_REQUESTS))
+        for result in client.fetch_all(urls, workers=workers):
+            if not result.ok:
+                raise result.error
+    return time.perf_counter() - start
+
+
+def bench_async(base_url: str, concurrency: int) -> float:
+    async def run():
+        async with AsyncHttpClient(base_url=base_url, limit_per_host=concurrency) as client:
+            urls = (f"/item/{i}" for i in range(N_REQUESTS))
+            async for result in client.get_many(urls, concurrency=concurrency):
+                if not result.ok:
+                    raise result.error
+
+    start = time.perf_counter()
+    asyncio.run(run())
+    return time.perf_counter() - start
+
+
+def main():
+    for name in ("tlnk.scraper.http", "tlnk.scraper.async_http"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    httpd, base_url = start_stub_server(latency=LATENCY)
+    try:
+        baseline = bench_sequential(base_url)
+        print(f"{'mode':<24}{'seconds':>10}{'req/s':>10}{'speedup':>10}")
+        print(f"{'HttpClient.get loop':<24}{baseline:>10.2f}{N_REQUESTS / baseline:>10.1f}{1.0:>10.1f}")
+        for workers in (4, 16, 32):
+            elapsed = bench_threads(base_url, workers)
+            label = f"fetch_all(w={workers})"
+            print(f"{label:<24}{elapsed:>10.2f}{N_REQUESTS / elapsed:>10.1f}{baseline / elapsed:>10.1f}")
+        for concurrency in (1, 2, 4, 8, 16, 32, 64):
+            elapsed = bench_async(base_url, concurrency)
+            label = f"get_many(c={concurrency})"
+            print(f"{label:<24}{elapsed:>10.2f}{N_REQUESTS / elapsed:>10.1f}{baseline / elapsed:>10.1f}")
+    finally:
+        httpd.shutdown()
+
+
+if __name__ == "__main__":
+    main()
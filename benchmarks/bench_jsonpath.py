@@ -0,0 +1,82 @@
+"""
+Benchmark: JsonQuery vs JsonParser.get loops for 20 fields over many records.
+
+Run:
+    python benchmarks/bench_jsonpath.py [records]
+"""
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tlnk import JsonParser, JsonQuery  # noqa: E402
+
+
+def make_records(count: int) -> list:
+    rng = random.Random(0)
+    return [
+        {
+            "id": i,
+            "sku": f"SKU-{i}",
+            "name": {"th": "สินค้า", "en": f"Item {i}"},
+            "price": {"amount": rng.random() * 1000, "currency": "THB", "discount": {"pct": rng.randint(0, 50)}},
+            "stock": {"qty": rng.randint(0, 500), "warehouse": {"code": "BKK", "zone": rng.randint(1, 9)}},
+            "seller": {"id": rng.randint(1, 10 ** 5), "name": "shop", "rating": rng.random() * 5},
+            "tags": [{"name": "sale"}, {"name": "new"}],
+            "images": [f"/img/{i}/{k}.jpg" for k in range(3)],
+            "created": "2024-01-01T00:00:00Z",
+            "flags": {"active": True, "featured": i % 7 == 0},
+        }
+        for i in range(count)
+    ]
+
+
+FIELDS = {
+    "id": "id", "sku": "sku", "name_th": "name.th", "name_en": "name.en",
+    "price": "price.amount", "currency": "price.currency", "discount": "price.discount.pct",
+    "qty": "stock.qty", "warehouse": "stock.warehouse.code", "zone": "stock.warehouse.zone",
+    "seller_id": "seller.id", "seller": "seller.name", "rating": "seller.rating",
+    "first_tag": "tags[0].name", "first_image": "images[0]", "created": "created",
+    "active": "flags.active", "featured": "flags.featured", "missing": "price.tax.rate",
+    "tags": "tags[*].name",
+}
+
+
+def get_loop(records: list) -> list:
+    keys = {
+        name: [int(k) if k.isdigit() else k for k in path.replace("[", ".").replace("]", "").split(".")]
+        for name, path in FIELDS.items() if "*" not in path
+    }
+    rows = []
+    for record in records:
+        parser = JsonParser(record)
+        row = {name: parser.get(*path) for name, path in keys.items()}
+        row["tags"] = [parser.get("tags", i, "name") for i in range(len(parser.get("tags", default=[])))]
+        rows.append(row)
+    return rows
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    records = make_records(count)
+    query = JsonQuery(FIELDS)
+    print(f"{count:,} records x {len(FIELDS)} fields\n")
+    base, expected = timed(get_loop, records)
+    rows_time, rows = timed(lambda: list(query.extract_many(records)))
+    cols_time, columns = timed(query.columns, records)
+    print(f"{'method':<26}{'seconds':>9}{'records/s':>13}{'speedup':>9}")
+    for label, seconds in (("JsonParser.get loop", base), ("JsonQuery.extract_many", rows_time), ("JsonQuery.columns", cols_time)):
+        print(f"{label:<26}{seconds:>9.2f}{count / seconds:>13,.0f}{base / seconds:>9.1f}")
+    print(f"\nsame rows: {rows == expected}, same columns: {columns['price'] == [r['price'] for r in expected]}")
+
+
+if __name__ == "__main__":
+    main()
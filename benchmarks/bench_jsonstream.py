@@ -0,0 +1,93 @@
+"""
+Benchmark: JsonStream vs json.load of the whole document.
+
+Writes a JSON export with a nested records array and the same records as
+NDJSON to a temporary directory, then compares time and peak traced
+memory of loading everything vs streaming the records one at a time.
+
+Run:
+    python benchmarks/bench_jsonstream.py
+"""
+import os
+import sys
+import json
+import time
+import random
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tlnk import JsonStream  # noqa: E402
+
+RECORDS = 200_000
+
+
+def make_records(count: int):
+    rng = random.Random(0)
+    for i in range(count):
+        yield {
+            "id": i,
+            "name": f"สินค้า {i}",
+            "price": {"amount": round(rng.random() * 1000, 2), "currency": "THB"},
+            "tags": [f"t{k}" for k in range(rng.randint(0, 4))],
+            "active": rng.random() > 0.1,
+        }
+
+
+def measure(func):
+    """Best-of-3 time, then peak traced memory of a separate run (tracing slows allocation)."""
+    elapsed = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        result = func()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def total_load(path: str) -> float:
+    with open(path, encoding="utf-8") as f:
+        return sum(r["price"]["amount"] for r in json.load(f)["data"]["items"])
+
+
+def total_lines(path: str) -> float:
+    with open(path, encoding="utf-8") as f:
+        return sum(r["price"]["amount"] for r in (json.loads(line) for line in f))
+
+
+def total_stream(filename: str, **options) -> float:
+    return sum(r["price"]["amount"] for r in JsonStream(filename, **options))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        array_path = os.path.join(tmp, "export.json")
+        lines_path = os.path.join(tmp, "export.ndjson")
+        records = list(make_records(RECORDS))
+        with open(array_path, "w", encoding="utf-8") as f:
+            json.dump({"meta": {"total": RECORDS}, "data": {"items": records}}, f, ensure_ascii=False)
+        with open(lines_path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        del records
+        print(f"{RECORDS:,} records, {os.path.getsize(array_path) / 2 ** 20:.1f} MiB\n")
+        print(f"{'method':<36}{'seconds':>9}{'peak MiB':>10}")
+        results = []
+        for label, func in (
+            ("json.load (whole document)", lambda: total_load(array_path)),
+            ("JsonStream path=data.items", lambda: total_stream(array_path, path="data.items")),
+            ("json.loads per line (ndjson)", lambda: total_lines(lines_path)),
+            ("JsonStream ndjson", lambda: total_stream(lines_path)),
+        ):
+            seconds, peak, total = measure(func)
+            results.append(round(total, 2))
+            print(f"{label:<36}{seconds:>9.2f}{peak:>10.1f}")
+        print(f"\nsame totals: {len(set(results)) == 1}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark: eager vs lazy (planned, single-pass) DataCleaner / DataConverter chains.
+
+Runs the same clean -> convert chain over generated scraped rows both ways
+and reports time and peak traced memory.
+
+Run:
+    python benchmarks/bench_lazy_plan.py
+"""
+import os
+import sys
+import time
+import random
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tlnk import DataCleaner, DataConverter  # noqa: E402
+
+ROWS = 200_000
+
+
+def make_rows(count: int):
+    rng = random.Random(0)
+    return [
+        {
+            "sku": str(i),
+            "title": f"  สินค้า   {i}  " if rng.random() > 0.05 else "",
+            "price": f"{rng.random() * 10000:,.2f}",
+            "stock": str(rng.randint(0, 50)),
+            "seller": f" shop {rng.randint(1, 500)} ",
+            "html": "<div>" + "x" * 40 + "</div>",
+            "scraped_at": "2024-01-15",
+        }
+        for i in range(count)
+    ]
+
+
+def chain(rows, lazy: bool):
+    cleaner = (
+        DataCleaner(rows, lazy=lazy)
+        .strip_whitespace()
+        .fill_null("unknown", ["seller"])
+        .rename_columns({"title": "name"})
+        .drop_nulls(["name"])
+        .select_columns(["sku", "name", "price", "stock"])
+    )
+    return DataConverter(cleaner, lazy=lazy).cast({"sku": "int", "price": "float", "stock": "int"})
+
+
+def measure(func):
+    """Best-of-3 time, then peak traced memory of a separate run (tracing slows allocation)."""
+    elapsed = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        result = func()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main():
+    rows = make_rows(ROWS)
+    print(f"{ROWS:,} rows, 5 cleaning steps + 3 casts\n")
+    print(chain(rows, lazy=True).explain(), "\n")
+    print(f"{'chain':<10}{'seconds':>9}{'peak MiB':>10}")
+    eager_s, eager_mem, eager = measure(lambda: chain(rows, lazy=False).to_list())
+    lazy_s, lazy_mem, lazy = measure(lambda: chain(rows, lazy=True).to_list())
+    print(f"{'eager':<10}{eager_s:>9.2f}{eager_mem:>10.1f}")
+    print(f"{'lazy':<10}{lazy_s:>9.2f}{lazy_mem:>10.1f}")
+    print(f"\nsame result: {eager == lazy}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: DataCleaner / DataConverter on one process vs executor="process".
+
+Runs a clean -> dedup -> convert chain over generated rows in one
+process (lazy, single pass) and on worker pools of increasing size, and
+reports time and rows per second. Speed-up needs as many free CPUs as
+workers: on a single CPU the pool only adds the cost of sending rows to
+the workers and back.
+
+Run:
+    python benchmarks/bench_parallel.py [rows]
+"""
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tlnk import DataCleaner, DataConverter  # noqa: E402
+from tlnk.utils import default_workers  # noqa: E402
+from tlnk.utils import TextPipeline  # noqa: E402
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+
+TITLES = TextPipeline().nfkc().keep_chars("-.", thai=True).casefold().collapse_whitespace()
+
+
+def make_rows(count: int):
+    rng = random.Random(0)
+    return [
+        {
+            "sku": str(rng.randint(0, count // 2)),
+            "title": f"  สินค้า   ＳＡＬＥ {i}!!  " if rng.random() > 0.05 else "",
+            "price": f"{rng.random() * 10000:,.2f}",
+            "stock": str(rng.randint(0, 50)),
+            "scraped_at": "15/01/2024",
+        }
+        for i in range(count)
+    ]
+
+
+def chain(rows, **options):
+    cleaner = (
+        DataCleaner(rows, **options)
+        .normalize_text(TITLES, ["title"])
+        .drop_nulls(["title"])
+        .drop_duplicates(["sku"])
+    )
+    return DataConverter(cleaner).cast({"sku": "int", "price": "float", "stock": "int", "scraped_at": "date"})
+
+
+def measure(func):
+    """Best-of-3 time."""
+    elapsed = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        result = func()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    return elapsed, result
+
+
+def main():
+    rows = make_rows(ROWS)
+    cpus = default_workers()
+    print(f"{ROWS:,} rows, {cpus} CPU(s) available\n")
+    print(f"{'executor':<22}{'seconds':>9}{'rows/s':>12}")
+    single_s, expected = measure(lambda: chain(rows, lazy=True).to_list())
+    print(f"{'single process':<22}{single_s:>9.2f}{ROWS / single_s:>12,.0f}")
+    same = True
+    for workers in sorted({1, 2, 4, cpus}):
+        seconds, result = measure(lambda: chain(rows, executor="process", workers=workers).to_list())
+        same = same and result == expected
+        print(f"{f'process, {workers} workers':<22}{seconds:>9.2f}{ROWS / seconds:>12,.0f}")
+    print(f"\nsame result: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Benchmark: ParsePool throughput vs in-process extraction, by worker count.
+
+Run:
+    python benchmarks/bench_parse_pool.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _corpus import make_corpus  # noqa: E402
+from bench_schema import SCHEMA  # noqa: E402
+from tlnk import ParsePool  # noqa: E402
+from tlnk.utils import default_workers  # noqa: E402
+
+
+def main():
+    corpus = make_corpus(48)
+    cpus = default_workers()
+    print(f"{len(corpus)} pages, {cpus} CPUs available\n")
+    print(f"{'workers':<10}{'pages/s':>9}{'speedup':>9}  same rows")
+
+    start = time.perf_counter()
+    expected = [row for page in corpus for row in SCHEMA.extract(page)]
+    baseline = len(corpus) / (time.perf_counter() - start)
+    print(f"{'in-process':<10}{baseline:>9.1f}{1.0:>9.1f}  True")
+
+    counts = sorted({1, 2, 4, 8, cpus} & set(range(1, cpus + 1))) or [1]
+    for workers in counts:
+        with ParsePool(SCHEMA, workers=workers, chunksize=4) as pool:
+            list(pool.extract(corpus[:workers]))  # start the workers
+            start = time.perf_counter()
+            rows = list(pool.extract(corpus))
+            rate = len(corpus) / (time.perf_counter() - start)
+        print(f"{workers:<10}{rate:>9.1f}{rate / baseline:>9.1f}  {rows == expected}")
+
+
+if __name__ == "__main__":
+    main()
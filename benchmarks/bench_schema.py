@@ -0,0 +1,97 @@
+"""
+Benchmark: ExtractionSchema vs per-field HtmlParser calls on listing pages.
+
+The per-field baseline is how rows were built before: one find_all_* call
+per field over the whole document, zipped together. Both sides start from
+HTML text, so parsing is included.
+
+Run:
+    python benchmarks/bench_schema.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from _corpus import make_corpus  # noqa: E402
+from tlnk import HtmlParser, ExtractionSchema  # noqa: E402
+from tlnk.scraper.backends import available_backends  # noqa: E402
+
+SCHEMA = ExtractionSchema(
+    {
+        "id": {"attr": "data-id"},
+        "name": "h2.name",
+        "url": ("a.link", "href"),
+        "image": ("img", "src"),
+        "price": "span.price",
+        "rating": ("span.rating", "title"),
+        "desc": "p.desc",
+    },
+    items="div.product",
+)
+
+
+DETAIL = ExtractionSchema(
+    {
+        "title": "h1.title",
+        "page": "title",
+        "first_price": "span.price",
+        "first_link": ("a.link", "href"),
+        "nav": ("nav", "class"),
+        "specs": {"selector": "#specs td", "many": True},
+    }
+)
+
+
+def detail_per_field(html: str, backend: str) -> list:
+    parser = HtmlParser(html, backend=backend)
+    return [{
+        "title": parser.find_text("h1.title"),
+        "page": parser.find_text("title"),
+        "first_price": parser.find_text("span.price"),
+        "first_link": parser.find_attr("a.link", "href"),
+        "nav": parser.find_attr("nav", "class"),
+        "specs": parser.find_all_text("#specs td"),
+    }]
+
+
+def per_field(html: str, backend: str) -> list:
+    parser = HtmlParser(html, backend=backend)
+    columns = zip(
+        parser.find_all_attr("div.product", "data-id"),
+        parser.find_all_text("div.product h2.name"),
+        parser.find_all_attr("div.product a.link", "href"),
+        parser.find_all_attr("div.product img", "src"),
+        parser.find_all_text("div.product span.price"),
+        parser.find_all_attr("div.product span.rating", "title"),
+        parser.find_all_text("div.product p.desc"),
+    )
+    names = ["id", "name", "url", "image", "price", "rating", "desc"]
+    return [dict(zip(names, values)) for values in columns]
+
+
+def timed(func, corpus: list, backend: str):
+    start = time.perf_counter()
+    rows = [func(html, backend) for html in corpus]
+    return (time.perf_counter() - start) / len(corpus) * 1000, rows
+
+
+def compare(title: str, corpus: list, baseline, schema: ExtractionSchema) -> None:
+    print(title)
+    print(f"{'backend':<12}{'per-field ms':>14}{'schema ms':>11}{'speedup':>9}  same rows")
+    for backend in reversed(available_backends()):
+        base_ms, expected = timed(baseline, corpus, backend)
+        schema_ms, rows = timed(lambda html, b: schema.extract(html, backend=b), corpus, backend)
+        print(f"{backend:<12}{base_ms:>14.1f}{schema_ms:>11.1f}{base_ms / schema_ms:>9.1f}  {rows == expected}")
+    print()
+
+
+def main():
+    corpus = make_corpus(10)
+    compare(f"Listing: {len(corpus)} pages, 400 items x {len(SCHEMA.fields)} fields", corpus, per_field, SCHEMA)
+    compare(f"Detail: {len(corpus)} pages, one row of {len(DETAIL.fields)} fields", corpus, detail_per_field, DETAIL)
+
+
+if __name__ == "__main__":
+    main()
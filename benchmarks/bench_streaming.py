@@ -0,0 +1,88 @@
+"""
+Benchmark: streamed DataCleaner / DataConverter vs loading every row into lists.
+
+Reads an NDJSON export, cleans and converts it, and writes NDJSON back,
+once with lists (JsonStream -> list -> eager chain -> file) and once
+streamed (JsonStream -> lazy chain -> write). Reports time and peak
+traced memory.
+
+Run:
+    python benchmarks/bench_streaming.py
+"""
+import os
+import sys
+import json
+import time
+import random
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tlnk import DataCleaner, DataConverter, JsonStream  # noqa: E402
+
+ROWS = 200_000
+
+
+def write_export(path: str, count: int) -> None:
+    rng = random.Random(0)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            f.write(json.dumps({
+                "sku": str(i % (count // 2)),
+                "name": f"  สินค้า  {i} " if rng.random() > 0.05 else "",
+                "price": f"{rng.random() * 10000:,.2f}",
+                "stock": str(rng.randint(0, 50)),
+                "seller": f" shop {rng.randint(1, 500)} ",
+            }, ensure_ascii=False) + "\n")
+
+
+def chain(rows, lazy: bool) -> DataConverter:
+    cleaner = DataCleaner(rows, lazy=lazy).strip_whitespace().drop_nulls(["name"]).drop_duplicates(["sku"])
+    return DataConverter(cleaner, lazy=lazy).cast({"sku": "int", "price": "float", "stock": "int"})
+
+
+def with_lists(src: str, dest: str) -> int:
+    rows = chain(list(JsonStream(src)), lazy=False).to_list()
+    with open(dest, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    return len(rows)
+
+
+def streamed(src: str, dest: str) -> int:
+    return chain(JsonStream(src), lazy=True).write(dest)
+
+
+def measure(func):
+    """Best-of-3 time, then peak traced memory of a separate run (tracing slows allocation)."""
+    elapsed = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        result = func()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "export.ndjson")
+        write_export(src, ROWS)
+        print(f"{ROWS:,} rows, {os.path.getsize(src) / 2 ** 20:.1f} MiB NDJSON\n")
+        print(f"{'pipeline':<12}{'seconds':>9}{'peak MiB':>10}{'rows out':>10}")
+        outputs = []
+        for label, func in (("lists", with_lists), ("streamed", streamed)):
+            dest = os.path.join(tmp, f"{label}.ndjson")
+            seconds, peak, count = measure(lambda: func(src, dest))
+            with open(dest, encoding="utf-8") as f:
+                outputs.append(f.read())
+            print(f"{label:<12}{seconds:>9.2f}{peak:>10.1f}{count:>10,}")
+        print(f"\nsame output: {outputs[0] == outputs[1]}")
+
+
+if __name__ == "__main__":
+    main()
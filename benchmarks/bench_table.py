@@ -0,0 +1,72 @@
+"""
+Benchmark: table engine vs the previous select-based find_table on large tables.
+
+The previous implementation (kept below as `legacy_find_table`) collected
+every `th` in the table, then ran `tr.select("td")` per row. Times cover
+extraction only; the page is parsed once per backend.
+
+Run:
+    python benchmarks/bench_table.py
+"""
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tlnk import HtmlParser  # noqa: E402
+from tlnk.scraper.backends import available_backends  # noqa: E402
+
+ROWS = 50_000
+
+
+def make_table(rows: int) -> str:
+    rng = random.Random(0)
+    parts = ["<html><body><table id='big'><thead><tr>",
+             "<th>SKU</th><th>Name</th><th>Price</th><th>Stock</th><th>Updated</th></tr></thead><tbody>"]
+    for i in range(rows):
+        parts.append(
+            f"<tr><td>SKU-{i}</td><td>Item {rng.randint(0, 10 ** 6)}</td><td>{rng.random() * 1000:.2f}</td>"
+            f"<td>{rng.randint(0, 500)}</td><td>2024-01-{i % 28 + 1:02d}</td></tr>"
+        )
+    parts.append("</tbody></table></body></html>")
+    return "".join(parts)
+
+
+def legacy_find_table(parser: HtmlParser, selector: str) -> list:
+    backend = parser._backend
+    table = backend.select_one(selector)
+    headers = [backend.text(th) for th in backend.select("th", table)]
+    rows = []
+    for tr in backend.select("tr", table):
+        cells = [backend.text(td) for td in backend.select("td", tr)]
+        if cells and headers:
+            rows.append(dict(zip(headers, cells)))
+    return rows
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    html = make_table(ROWS)
+    print(f"{ROWS:,} rows x 5 columns, {len(html) / 2 ** 20:.1f} MiB\n")
+    print(f"{'backend':<12}{'legacy ms':>11}{'rows ms':>10}{'speedup':>9}{'columns ms':>12}{'speedup':>9}  same rows")
+    for backend in reversed(available_backends()):
+        parser = HtmlParser(html, backend=backend)
+        legacy_ms, expected = timed(lambda: legacy_find_table(parser, "#big"))
+        rows_ms, rows = timed(lambda: parser.find_table("#big"))
+        cols_ms, columns = timed(lambda: parser.find_table_columns("#big"))
+        same = rows == expected and columns["SKU"] == [row["SKU"] for row in expected]
+        print(
+            f"{backend:<12}{legacy_ms:>11.0f}{rows_ms:>10.0f}{legacy_ms / rows_ms:>9.1f}"
+            f"{cols_ms:>12.0f}{legacy_ms / cols_ms:>9.1f}  {same}"
+        )
+
+
+if __name__ == "__main__":
+    main()
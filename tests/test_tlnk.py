@@ -1,16 +1,112 @@
 """
 Unit tests for tlnk package.
 """
+import asyncio
+import gc
+import hashlib
+import io
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import unicodedata
 import unittest
-from tlnk.utils.text import clean_whitespace, to_snake_case, truncate, is_empty
-from tlnk.utils.date import parse_date, to_iso, is_valid_date
-from tlnk.utils.dtype import to_int, to_float, to_bool, to_str
-from tlnk.utils.retry import retry
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from tlnk.utils.text import clean_whitespace, remove_special_chars, to_snake_case, truncate, is_empty, TextPipeline
+from tlnk.utils.date import parse_date, to_iso, is_valid_date, DateParser, to_isos
+from tlnk.utils.dtype import to_int, to_float, to_bool, to_str, to_ints, to_floats, to_bools
+from tlnk.utils.retry import retry, RetryPolicy, RetryStats
+from tlnk.utils.ratelimit import TokenBucket, HostRateLimiter
 from tlnk.utils.headers import get_default_headers, get_random_user_agent
 from tlnk.scraper.parser import HtmlParser, JsonParser, ParserError
-from tlnk.scraper.http import HttpClient
+from tlnk.scraper.backends import available_backends
+from tlnk.scraper.schema import ExtractionSchema
+from tlnk.scraper.pool import ParsePool, parse_many
+from tlnk.scraper.jsonpath import JsonQuery, compile_path
+from tlnk.scraper.jsonstream import JsonStream
+from tlnk.scraper.http import HttpClient, HttpClientError, FetchResult
+from tlnk.scraper.async_http import AsyncHttpClient
+from tlnk.scraper.cache import ResponseCache
 from tlnk.transform.cleaner import DataCleaner, DataCleanerError
-from tlnk.transform.converter import DataConverter, DataConverterError
+from tlnk.transform.converter import DataConverter, DataConverterError, RowConverter
+
+
+try:
+    import aiohttp  # noqa: F401
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """
+    Local test server routes:
+        /status/<code>, /sleep/<ms>  - status code / latency
+        /etag, /maxage               - cache validators / freshness
+        /file/<n>, /norange/<n>      - n * 256 bytes, with / without Range support
+        /api                         - 25 paginated records
+    Anything else echoes the path as JSON.
+    """
+
+    def do_GET(self):
+        parts = self.path.split("?")[0].strip("/").split("/")
+        status, extra = 200, {}
+        body = json.dumps({"path": self.path}).encode()
+        if parts[0] == "status":
+            status = int(parts[1])
+        elif parts[0] == "sleep":
+            time.sleep(int(parts[1]) / 1000)
+        elif parts[0] == "etag":
+            extra["ETag"] = '"v1"'
+            if self.headers.get("If-None-Match") == '"v1"':
+                status, body = 304, b""
+        elif parts[0] == "maxage":
+            extra["Cache-Control"] = "max-age=60"
+        elif parts[0] in ("file", "norange"):
+            body = bytes(range(256)) * int(parts[1])
+            match = re.match(r"bytes=(\d+)-", self.headers.get("Range", ""))
+            if match and parts[0] == "file":
+                start = int(match.group(1))
+                status = 206
+                extra["Content-Range"] = f"bytes {start}-{len(body) - 1}/{len(body)}"
+                body = body[start:]
+        elif parts[0] == "api":
+            # Serves page/size, offset/limit or cursor; the Link header points to the next cursor.
+            query = {k: int(v[0]) for k, v in parse_qs(urlsplit(self.path).query).items()}
+            size = query.get("size", query.get("limit", 10))
+            start = query.get("offset", query.get("cursor", (query.get("page", 1) - 1) * size))
+            nxt = start + size if start + size < 25 else None
+            if nxt is not None:
+                extra["Link"] = f'<{self.server.url}/api?cursor={nxt}&size={size}>; rel="next"'
+            items = [{"id": i} for i in range(start, min(start + size, 25))]
+            body = json.dumps({"data": {"items": items}, "meta": {"total": 25, "next": nxt}}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in extra.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _StubServer:
+    def __enter__(self):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        self.httpd.daemon_threads = True
+        self.url = self.httpd.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self.httpd.shutdown()
+        self.httpd.server_close()
 
 
 # ── Utils ────────────────────────────────────────────────────────
@@ -31,6 +127,19 @@ class TestTextUtils(unittest.TestCase):
         self.assertTrue(is_empty("   "))
         self.assertFalse(is_empty("hello"))
 
+    def test_text_pipeline(self):
+        text = " Ｓale!\u3000 50%  off\n"
+        pipeline = TextPipeline().nfkc().keep_chars("%").casefold().collapse_whitespace()
+        expected = clean_whitespace(remove_special_chars(unicodedata.normalize("NFKC", text), "%").casefold())
+        self.assertEqual(pipeline(text), expected)
+        self.assertEqual(pipeline.map([text, None, 5]), [expected, None, 5])
+        self.assertEqual(pipeline.map([text] * 3), [expected] * 3)
+        self.assertIn("4 steps in 4 passes", pipeline.explain())
+
+        thai = TextPipeline().thai(digits=True).keep_chars(thai=True).collapse_whitespace()
+        self.assertEqual(thai("น\u0e4d\u0e49\u0e32 ๑๒  ช\u200bิ\u0e49น!"), "น\u0e49\u0e33 12 ชิ\u0e49น")
+        self.assertEqual(thai("ก\u0e48\u0e34 เเก"), "ก\u0e34\u0e48 แก")
+
 
 class TestDateUtils(unittest.TestCase):
     def test_parse_date(self):
@@ -44,6 +153,27 @@ class TestDateUtils(unittest.TestCase):
         self.assertTrue(is_valid_date("2024-01-15"))
         self.assertFalse(is_valid_date("hello"))
 
+    def test_date_parser_matches_to_iso(self):
+        values = [
+            "15 January 2024", " 3 March 2024 ", "15 January 2024", "1 May 2024", "2024-02-30",
+            "2024-01-15T10:20:30", "2024-01-15T24:00:00", "2024-1-5", "15/01/2024", "๒๐๒๔-๐๑-๑๕", "bad", "", None,
+        ]
+        parser = DateParser()
+        self.assertEqual(parser.to_iso_many(values), [to_iso(v) if v is not None else None for v in values])
+        self.assertEqual(parser.order[0], "%d %B %Y")
+        self.assertEqual(parser.parse_many(["2024-01-15"])[0].day, 15)
+        formats = ["%m/%d/%Y", "%d/%m/%Y"]
+        self.assertEqual(to_isos(["02/01/2024", "13/01/2024"], formats), ["2024-02-01", "2024-01-13"])
+        self.assertEqual(DateParser(formats).order, formats)
+
+    def test_date_parser_cache_is_bounded(self):
+        values = [f"{day} January 2024" for day in range(1, 29)]
+        parser = DateParser()
+        with mock.patch("tlnk.utils.date.CACHE_SIZE", 8):
+            self.assertEqual(parser.to_iso_many(values), [to_iso(v) for v in values])
+            self.assertLessEqual(len(parser._cache), 8)
+            self.assertEqual(parser.parse(values[0]).day, 1)  # parsed again after the cache started over
+
 
 class TestDtypeUtils(unittest.TestCase):
     def test_to_int(self):
@@ -62,6 +192,18 @@ class TestDtypeUtils(unittest.TestCase):
         self.assertEqual(to_str(None), "")
         self.assertEqual(to_str(42), "42")
 
+    def test_bulk_casts_match_per_cell(self):
+        values = ["1,000", " 7 ", "2.9", "abc", "", None, True, 3, 4.5, "1\x1c", "๑๒", "1e3", "yes", "0", [1]]
+        self.assertEqual(to_ints(values), [to_int(v) for v in values])
+        self.assertEqual(to_ints(values, default=-1), [to_int(v, -1) for v in values])
+        self.assertEqual(to_floats(values), [to_float(v) for v in values])
+        self.assertEqual(to_bools(values), [to_bool(v) for v in values])
+        repeated = ["1,200", "x", "yes", "2"] * 600
+        self.assertEqual(to_ints(repeated), [to_int(v) for v in repeated])
+        self.assertEqual(to_bools(repeated), [to_bool(v) for v in repeated])
+        with self.assertRaises(OverflowError):
+            to_ints(["1", "inf"])
+
 
 class TestHeaders(unittest.TestCase):
     def test_get_random_user_agent(self):
@@ -102,6 +244,104 @@ class TestRetry(unittest.TestCase):
             always_fail()
 
 
+class _FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class _FakeHttpError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.response = _FakeResponse(status_code, headers)
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_retry_then_succeed_with_stats(self):
+        count = [0]
+
+        def flaky():
+            count[0] += 1
+            if count[0] < 3:
+                raise _FakeHttpError(503)
+            return "ok"
+
+        stats = RetryStats()
+        policy = RetryPolicy(max_attempts=3, base_delay=0)
+        self.assertEqual(policy.call(flaky, stats), "ok")
+        self.assertEqual((stats.attempts, stats.retries, stats.failures), (3, 2, 0))
+
+    def test_client_error_not_retried(self):
+        count = [0]
+
+        def not_found():
+            count[0] += 1
+            raise _FakeHttpError(404)
+
+        with self.assertRaises(_FakeHttpError):
+            RetryPolicy(max_attempts=5, base_delay=0).call(not_found)
+        self.assertEqual(count[0], 1)
+
+    def test_retry_after(self):
+        policy = RetryPolicy(max_attempts=3, max_delay=10)
+        self.assertEqual(policy.next_delay(1, _FakeHttpError(429, {"Retry-After": "7"}), 0), 7)
+        self.assertEqual(policy.next_delay(1, _FakeHttpError(429, {"Retry-After": "60"}), 0), 10)  # capped at max_delay
+        self.assertIsNone(RetryPolicy(max_delay=10, budget=5).next_delay(1, _FakeHttpError(429, {"Retry-After": "60"}), 0))
+
+    def test_jitter_and_budget(self):
+        policy = RetryPolicy(max_attempts=10, base_delay=1, multiplier=2, max_delay=4, budget=5)
+        for attempt in range(1, 6):
+            self.assertLessEqual(policy.backoff(attempt), 4)
+        self.assertIsNone(policy.next_delay(1, ValueError("x"), elapsed=4.9 + 1))
+
+    def test_async_call(self):
+        count = [0]
+
+        @RetryPolicy(max_attempts=2, base_delay=0)
+        async def flaky():
+            count[0] += 1
+            if count[0] < 2:
+                raise ValueError("fail")
+            return "ok"
+
+        self.assertEqual(asyncio.run(flaky()), "ok")
+        self.assertEqual(count[0], 2)
+
+
+class TestRateLimit(unittest.TestCase):
+    def test_token_bucket(self):
+        bucket = TokenBucket(rate=10, capacity=2)
+        self.assertEqual(bucket.try_acquire(), 0)
+        self.assertEqual(bucket.try_acquire(), 0)
+        self.assertGreater(bucket.try_acquire(), 0)
+
+    def test_concurrency_window(self):
+        limiter = HostRateLimiter(rate=100, burst=10, concurrency=2)
+        self.assertEqual(limiter.try_acquire("a"), 0)
+        self.assertEqual(limiter.try_acquire("a"), 0)
+        self.assertGreater(limiter.try_acquire("a"), 0)
+        self.assertEqual(limiter.try_acquire("b"), 0)
+        limiter.release("a", 200, 0.01)
+        self.assertEqual(limiter.try_acquire("a"), 0)
+
+    def test_aimd(self):
+        limiter = HostRateLimiter(rate=10, concurrency=8)
+        limiter.acquire("h")
+        limiter.release("h", 429, 0.01)
+        snap = limiter.snapshot()["h"]
+        self.assertEqual((snap["rate"], snap["concurrency"], snap["throttled"]), (5.0, 4, 1))
+        for _ in range(5):
+            limiter.acquire("h")
+            limiter.release("h", 200, 0.01)
+        self.assertGreater(limiter.snapshot()["h"]["rate"], 5.0)
+
+    def test_static(self):
+        limiter = HostRateLimiter(rate=10, adaptive=False)
+        limiter.acquire("h")
+        limiter.release("h", 429, 0.01)
+        self.assertEqual(limiter.snapshot()["h"]["rate"], 10)
+
+
 # ── Scraper ──────────────────────────────────────────────────────
 
 class TestHttpClient(unittest.TestCase):
@@ -121,6 +361,220 @@ class TestHttpClient(unittest.TestCase):
         with HttpClient() as client:
             self.assertIsInstance(client, HttpClient)
 
+    def test_fetch_all_grows_pool(self):
+        client = HttpClient()
+        self.assertEqual(client.pool_size, 10)
+        with _StubServer() as server:
+            list(client.fetch_all([f"{server.url}/a"], workers=32))
+        self.assertEqual(client.pool_size, 32)
+
+    def test_fetch_all_ordered(self):
+        with _StubServer() as server, HttpClient(base_url=server.url) as client:
+            urls = ["/sleep/300", "/sleep/10", "/sleep/100"]
+            results = list(client.fetch_all(urls, workers=3, ordered=True))
+        self.assertEqual([r.url for r in results], urls)
+        self.assertTrue(all(r.ok for r in results))
+
+    def test_fetch_all_error_not_retried(self):
+        with _StubServer() as server, HttpClient(base_url=server.url) as client:
+            results = list(client.fetch_all(["/status/404", "/ok"], workers=2, ordered=True))
+            self.assertFalse(results[0].ok)
+            self.assertEqual(results[0].retry_stats.attempts, 1)
+            self.assertTrue(results[1].ok)
+            self.assertEqual(client.retry_stats.calls, 2)
+
+    def test_rate_limiter(self):
+        limiter = HostRateLimiter(rate=50)
+        with _StubServer() as server, HttpClient(base_url=server.url, rate_limiter=limiter) as client:
+            list(client.fetch_all(["/a", "/b", "/status/404"], workers=3))
+            host = server.url.split("//")[1]
+        snap = limiter.snapshot()[host]
+        self.assertEqual(snap["requests"], 3)
+        self.assertEqual(snap["in_flight"], 0)
+
+    def test_max_retries_used(self):
+        client = HttpClient(max_retries=5)
+        self.assertEqual(client.retry_policy.max_attempts, 6)
+
+    def test_fetch_all_as_completed(self):
+        with _StubServer() as server, HttpClient(base_url=server.url) as client:
+            urls = ["/sleep/300", "/sleep/10"]
+            results = list(client.fetch_all(urls, workers=2))
+        self.assertEqual(results[0].url, "/sleep/10")
+
+
+class TestDownload(unittest.TestCase):
+    DATA = bytes(range(256)) * 64
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dest = os.path.join(self.tmp.name, "out.bin")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_download_to_path_with_checksum(self):
+        checksum = "sha256:" + hashlib.sha256(self.DATA).hexdigest()
+        with _StubServer() as server, HttpClient(base_url=server.url) as client:
+            info = client.download("/file/64", self.dest, chunk_size=1000, checksum=checksum)
+        with open(self.dest, "rb") as f:
+            self.assertEqual(f.read(), self.DATA)
+        self.assertEqual(info["bytes"], len(self.DATA))
+        self.assertFalse(os.path.exists(self.dest + ".part"))
+
+    def test_resume_from_part_file(self):
+        with open(self.dest + ".part", "wb") as f:
+            f.write(self.DATA[:5000])
+        with _StubServer() as server, HttpClient(base_url=server.url) as client:
+            info = client.download("/file/64", self.dest, checksum="md5:" + hashlib.md5(self.DATA).hexdigest())
+        self.assertEqual(info["resumed_from"], 5000)
+        with open(self.dest, "rb") as f:
+            self.assertEqual(f.read(), self.DATA)
+
+    def test_range_ignored_restarts(self):
+        with open(self.dest + ".part", "wb") as f:
+            f.write(b"garbage")
+        with _StubServer() as server, HttpClient(base_url=server.url) as client:
+            client.download("/norange/64", self.dest)
+        with open(self.dest, "rb") as f:
+            self.assertEqual(f.read(), self.DATA)
+
+    def test_file_like_sink_and_mismatch(self):
+        sink = io.BytesIO()
+        with _StubServer() as server, HttpClient(base_url=server.url) as client:
+            client.download("/file/64", sink)
+            self.assertEqual(sink.getvalue(), self.DATA)
+            with self.assertRaises(HttpClientError):
+                client.download("/file/64", self.dest, checksum="sha256:00")
+        self.assertFalse(os.path.exists(self.dest + ".part"))
+
+
+class TestPaginator(unittest.TestCase):
+    def ids(self, **options):
+        with _StubServer() as server, HttpClient(base_url=server.url) as client:
+            pages = client.paginate("/api", records="data.items", **options)
+            ids = [r["id"] for r in pages]
+        return ids, pages.pages_fetched
+
+    def test_page(self):
+        ids, fetched = self.ids(page_size=10, size_param="size")
+        self.assertEqual(ids, list(range(25)))
+        self.assertEqual(fetched, 3)
+
+    def test_page_parallel_with_total(self):
+        ids, fetched = self.ids(page_size=4, size_param="size", total_path="meta.total", workers=4)
+        self.assertEqual(ids, list(range(25)))
+        self.assertEqual(fetched, 7)
+
+    def test_offset(self):
+        ids, _ = self.ids(strategy="offset", page_size=7)
+        self.assertEqual(ids, list(range(25)))
+
+    def test_cursor(self):
+        ids, _ = self.ids(strategy="cursor", cursor_path="meta.next", params={"size": 10})
+        self.assertEqual(ids, list(range(25)))
+
+    def test_link_and_max_pages(self):
+        ids, fetched = self.ids(strategy="link", params={"size": 5}, max_pages=2)
+        self.assertEqual(ids, list(range(10)))
+        self.assertEqual(fetched, 2)
+
+    def test_invalid_strategy(self):
+        with self.assertRaises(ValueError):
+            HttpClient().paginate("/api", strategy="bogus")
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(os.path.join(self.tmp.name, "cache.sqlite"))
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def test_fresh_hit(self):
+        with _StubServer() as server, HttpClient(base_url=server.url, cache=self.cache) as client:
+            first = client.get("/maxage", params={"q": 1})
+            second = client.get("/maxage", params={"q": 1})
+        self.assertFalse(getattr(first, "from_cache", False))
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.json(), first.json())
+        stats = self.cache.stats()
+        self.assertEqual((stats["misses"], stats["hits"]), (1, 1))
+        self.assertEqual(stats["bytes_saved"], len(first.content))
+
+    def test_revalidate_304(self):
+        with _StubServer() as server, HttpClient(base_url=server.url, cache=self.cache) as client:
+            first = client.get("/etag")
+            second = client.get("/etag")
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(self.cache.stats()["revalidated"], 1)
+
+    def test_not_stored_without_validators(self):
+        with _StubServer() as server, HttpClient(base_url=server.url, cache=self.cache) as client:
+            client.get("/plain")
+        self.assertEqual(len(self.cache), 0)
+
+    def test_lru_eviction(self):
+        self.cache.max_size = 1
+        with _StubServer() as server, HttpClient(base_url=server.url, cache=self.cache) as client:
+            client.get("/maxage?a")
+            client.get("/maxage?b")
+        self.assertEqual(self.cache.stats()["evictions"], 2)
+
+
+@unittest.skipUnless(HAS_AIOHTTP, "aiohttp not installed")
+class TestAsyncHttpClient(unittest.TestCase):
+    def test_build_url(self):
+        client = AsyncHttpClient(base_url="https://api.example.com/")
+        self.assertEqual(client._build_url("/users"), "https://api.example.com/users")
+        self.assertIn("AsyncHttpClient", repr(client))
+
+    def test_get(self):
+        async def run(base):
+            async with AsyncHttpClient(base_url=base) as client:
+                client.set_auth("token")
+                return await client.get("/items/1")
+
+        with _StubServer() as server:
+            res = asyncio.run(run(server.url))
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["path"], "/items/1")
+
+    def test_get_many_concurrent(self):
+        async def run(base):
+            async with AsyncHttpClient(base_url=base, limit_per_host=10) as client:
+                urls = [f"/sleep/200?i={i}" for i in range(10)]
+                return [r async for r in client.get_many(urls, concurrency=10)]
+
+        with _StubServer() as server:
+            start = time.perf_counter()
+            results = asyncio.run(run(server.url))
+            elapsed = time.perf_counter() - start
+        self.assertEqual(len(results), 10)
+        self.assertTrue(all(isinstance(r, FetchResult) and r.ok for r in results))
+        self.assertLess(elapsed, 1.5)
+
+    def test_get_many_urls_raise(self):
+        def urls():
+            yield "/items/1"
+            yield "/items/2"
+            raise RuntimeError("bad source")
+
+        async def run(base):
+            fetched = []
+            async with AsyncHttpClient(base_url=base) as client:
+                with self.assertRaises(RuntimeError):
+                    async for result in client.get_many(urls(), concurrency=3):
+                        fetched.append(result)
+            return fetched
+
+        with _StubServer() as server:
+            results = asyncio.run(asyncio.wait_for(run(server.url), 10))
+        self.assertEqual(len(results), 2)
+
 
 class TestHtmlParser(unittest.TestCase):
     def setUp(self):
@@ -167,6 +621,245 @@ class TestHtmlParser(unittest.TestCase):
         self.assertIn("HtmlParser", repr(self.parser))
 
 
+class TestHtmlBackends(unittest.TestCase):
+    HTML = """<!DOCTYPE html><html><head><title> Shop </title><script>var a = "<b>x</b>";</script></head>
+    <body><nav class="top  main"><a href="/" rel="home nofollow">Home</a><a href="/c">Cat</a></nav>
+    <div class="product" data-id="1"><h2>  Widget &amp; Co </h2><span class="price">1,500</span><!-- c --></div>
+    <div class="product" data-id="2"><h2>Gadget <b>Pro</b></h2><span class="price">99</span></div>
+    <ul><li>A</li><li> B <i>b</i></li><li></li></ul>
+    <table><thead><tr><th>Name</th><th>Age</th></tr></thead>
+    <tbody><tr><td>Alice</td><td>30</td></tr><tr><td>Bob</td><td>25</td></tr></tbody></table>
+    <p>ไทย&nbsp;</p><ruby>漢<rt>kan</rt></ruby></body></html>"""
+
+    QUERIES = [
+        ("find_text", ("title",)),
+        ("find_text", ("body",)),
+        ("find_text", ("script",)),
+        ("find_all_text", ("h2",)),
+        ("find_all_text", ("li",)),
+        ("find_all_text", ("div.product > span.price",)),
+        ("find_attr", ("nav", "class")),
+        ("find_attr", ("div.product:nth-of-type(2)", "data-id")),
+        ("find_all_attr", ("a", "href")),
+        ("find_all_attr", ("a", "rel")),
+        ("find_table", ("table",)),
+    ]
+
+    def test_auto_prefers_first_available(self):
+        self.assertEqual(HtmlParser(self.HTML).backend, available_backends()[0])
+
+    def test_backends_agree(self):
+        expected = HtmlParser(self.HTML, backend="bs4")
+        for backend in available_backends():
+            parser = HtmlParser(self.HTML, backend=backend)
+            for method, args in self.QUERIES:
+                with self.subTest(backend=backend, method=method, args=args):
+                    self.assertEqual(getattr(parser, method)(*args), getattr(expected, method)(*args))
+
+    def test_root_anchored_selectors(self):
+        html = '<html lang="th"><body><p>x</p><div><p>y</p></div></body></html>'
+        queries = [
+            ("find_attr", ("html", "lang")),
+            ("find_all_text", ("html > body p",)),
+            ("find_all_text", ("html p, div",)),
+            ("find_text", ("*",)),
+        ]
+        expected = HtmlParser(html, backend="bs4")
+        schema = ExtractionSchema({"lang": ("html", "lang"), "text": {"selector": "html > body > p", "many": True}})
+        for backend in available_backends():
+            parser = HtmlParser(html, backend=backend)
+            self.assertEqual(len(parser._backend.select("*")), len(expected._backend.select("*")))
+            self.assertEqual(schema.extract(html, backend=backend), [{"lang": "th", "text": ["x"]}])
+            for method, args in queries:
+                with self.subTest(backend=backend, method=method, args=args):
+                    self.assertEqual(getattr(parser, method)(*args), getattr(expected, method)(*args))
+            # Element-scoped queries still only match below the element.
+            div = parser._backend.select_one("div")
+            self.assertEqual([parser._backend.text(el) for el in parser._backend.select("p, div", div)], ["y"])
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            HtmlParser(self.HTML, backend="nope")
+
+    def test_partial_parse_matches_full(self):
+        partial_queries = [
+            ("find_all_text", ("div.product > span.price",)),
+            ("find_all_text", ("div.product h2",)),
+            ("find_attr", ("div[data-id='2']", "data-id")),
+            ("find_all_attr", ("nav a", "rel")),
+            ("find_table", ("table",)),
+        ]
+        only = [args[0] for _, args in partial_queries]
+        expected = HtmlParser(self.HTML, backend="bs4")
+        for backend in available_backends():
+            parser = HtmlParser(self.HTML, backend=backend, only=only)
+            self.assertTrue(parser.partial)
+            self.assertIsNone(parser.find_text("title"))
+            for method, args in partial_queries:
+                with self.subTest(backend=backend, method=method, args=args):
+                    self.assertEqual(getattr(parser, method)(*args), getattr(expected, method)(*args))
+
+    def test_auto_falls_back_to_bs4(self):
+        if "lxml" not in available_backends() or len(available_backends()) < 2:
+            self.skipTest("lxml and bs4 not both installed")
+        queries = [
+            ("find_text", (":root > head > title",)),
+            ("find_all_text", (":root li",)),
+            ("find_all_text", ("h2:-soup-contains('Pro')",)),
+            ("find_attr", ("div.product:-soup-contains('Widget')", "data-id")),
+        ]
+        expected = HtmlParser(self.HTML, backend="bs4")
+        for method, args in queries:
+            with self.subTest(method=method, args=args):
+                parser = HtmlParser(self.HTML)
+                self.assertEqual(parser.backend, "lxml")
+                self.assertEqual(getattr(parser, method)(*args), getattr(expected, method)(*args))
+                self.assertNotEqual(parser.backend, "lxml")
+                with self.assertRaises(ParserError):
+                    getattr(HtmlParser(self.HTML, backend="lxml"), method)(*args)
+        parser = HtmlParser(self.HTML)
+        self.assertEqual(parser.find_text("[title=':root'], title"), "Shop")
+        self.assertEqual(parser.backend, "lxml")  # a quoted ":root" is no pseudo-class
+
+    def test_partial_parse_falls_back(self):
+        for only in (["div.product:nth-of-type(2)"], ["h2 ~ span"], ["a[href^='/c']"], ["nav", "li + li"]):
+            with self.subTest(only=only):
+                parser = HtmlParser(self.HTML, only=only)
+                self.assertFalse(parser.partial)
+                self.assertEqual(parser.find_text("title"), "Shop")
+
+
+class TestTable(unittest.TestCase):
+    HTML = """<table id="t">
+    <thead><tr><th rowspan="2">Name</th><th colspan="2">Price</th><th rowspan="2">Name</th></tr>
+           <tr><th>Min</th><th>Max</th></tr></thead>
+    <tbody>
+      <tr><th>A</th><td>1</td><td>2</td><td><table><tr><th>x</th></tr><tr><td>inner</td></tr></table></td></tr>
+      <tr><th rowspan="2">B</th><td colspan="2">3</td><td>b1</td></tr>
+      <tr><td>4</td><td>5</td><td>b2</td></tr>
+      <tr><td>C</td></tr>
+      <tr></tr>
+    </tbody></table>
+    <table id="plain"><tr><th>K</th><th></th></tr><tr><td>k</td><td>v</td></tr></table>
+    <table id="noheader"><tr><td>1</td><td>2</td></tr></table>"""
+
+    EXPECTED = [
+        {"Name": "A", "Price / Min": "1", "Price / Max": "2", "Name_2": "xinner"},
+        {"Name": "B", "Price / Min": "3", "Price / Max": "3", "Name_2": "b1"},
+        {"Name": "B", "Price / Min": "4", "Price / Max": "5", "Name_2": "b2"},
+        {"Name": "C", "Price / Min": None, "Price / Max": None, "Name_2": None},
+    ]
+
+    def test_spans_headers_and_nesting(self):
+        for backend in available_backends():
+            with self.subTest(backend=backend):
+                parser = HtmlParser(self.HTML, backend=backend)
+                self.assertEqual(parser.find_table("#t"), self.EXPECTED)
+                self.assertEqual(parser.find_table("#plain"), [{"K": "k", "column_2": "v"}])
+                self.assertEqual(parser.find_table("#noheader"), [])
+                self.assertEqual(parser.find_table("#missing"), [])
+
+    def test_repeated_header_names(self):
+        html = "<table><tr><th>A</th><th>A</th><th>A_2</th><th>column_4</th><th></th></tr><tr><td>1</td><td>2</td><td>3</td><td>4</td><td>5</td></tr></table>"
+        for backend in available_backends():
+            with self.subTest(backend=backend):
+                rows = HtmlParser(html, backend=backend).find_table()
+                self.assertEqual(rows, [{"A": "1", "A_2": "2", "A_2_2": "3", "column_4": "4", "column_5": "5"}])
+
+    def test_columns_and_lazy_rows(self):
+        parser = HtmlParser(self.HTML)
+        columns = parser.find_table_columns("#t")
+        self.assertEqual(list(columns), list(self.EXPECTED[0]))
+        self.assertEqual(columns["Price / Max"], ["2", "3", "5", None])
+        rows = parser.iter_table("#t")
+        self.assertEqual(next(rows), self.EXPECTED[0])
+        self.assertEqual(parser.table("#t").headers, list(self.EXPECTED[0]))
+        self.assertEqual(parser.find_table("#noheader", headers=["a", "b"]), [{"a": "1", "b": "2"}])
+        self.assertEqual(parser.find_table_columns("#noheader"), {})
+
+
+class TestExtractionSchema(unittest.TestCase):
+    HTML = TestHtmlBackends.HTML.replace("</body>", '<div class="product" data-id="3"><h2>Empty</h2></div></body>')
+
+    SCHEMA = ExtractionSchema(
+        {
+            "id": {"attr": "data-id", "transform": "int"},
+            "name": "h2",
+            "bold": "h2 > b",
+            "price": {"selector": "span.price", "transform": "float", "default": 0.0},
+            "classes": {"selector": "span", "attr": "class", "many": True},
+        },
+        items="div.product",
+    )
+
+    def test_rows_per_item(self):
+        rows = self.SCHEMA.extract(self.HTML)
+        self.assertEqual(rows, [
+            {"id": 1, "name": "Widget & Co", "bold": None, "price": 1500.0, "classes": [["price"]]},
+            {"id": 2, "name": "GadgetPro", "bold": "Pro", "price": 99.0, "classes": [["price"]]},
+            {"id": 3, "name": "Empty", "bold": None, "price": 0.0, "classes": []},
+        ])
+
+    def test_backends_agree(self):
+        expected = self.SCHEMA.extract(self.HTML, backend="bs4")
+        for backend in available_backends():
+            with self.subTest(backend=backend):
+                self.assertEqual(self.SCHEMA.extract(self.HTML, backend=backend), expected)
+                self.assertEqual(self.SCHEMA.extract(HtmlParser(self.HTML, backend=backend)), expected)
+
+    def test_auto_falls_back_to_bs4(self):
+        if "lxml" not in available_backends() or len(available_backends()) < 2:
+            self.skipTest("lxml and bs4 not both installed")
+        schema = ExtractionSchema({"name": "h2", "root": ":root title"}, items="div.product:-soup-contains('Gadget')")
+        expected = schema.extract(self.HTML, backend="bs4")
+        self.assertEqual(len(expected), 1)
+        for _ in range(2):  # the second document skips lxml
+            self.assertEqual(schema.extract(self.HTML), expected)
+        self.assertEqual(schema.extract(HtmlParser(self.HTML)), expected)
+        with self.assertRaises(ParserError):
+            schema.extract(self.HTML, backend="lxml")
+
+    def test_single_row_and_converter(self):
+        schema = ExtractionSchema({"title": "title", "home": ("nav a", "href"), "ages": {"selector": "td + td", "many": True}})
+        rows = schema.extract(self.HTML)
+        self.assertEqual(rows, [{"title": "Shop", "home": "/", "ages": ["30", "25"]}])
+        self.assertEqual(DataConverter(rows).to_str(["title"]).to_list()[0]["title"], "Shop")
+        self.assertEqual(len(list(schema.extract_many([self.HTML, self.HTML]))), 2)
+
+    def test_invalid_schema(self):
+        with self.assertRaises(ValueError):
+            ExtractionSchema({"x": {"selector": "a", "nope": 1}})
+        with self.assertRaises(ValueError):
+            ExtractionSchema({"x": {"selector": "a", "transform": "decimal"}})
+        with self.assertRaises(ValueError):
+            ExtractionSchema({"x": {"attr": "href"}})
+
+
+class TestParsePool(unittest.TestCase):
+    SCHEMA = ExtractionSchema({"n": {"attr": "data-n", "transform": "int"}, "text": "b"}, items="p")
+
+    def pages(self, count):
+        return [f"<p data-n='{i}'><b>{i}</b></p><p data-n='{i + 1000}'></p>" for i in range(count)]
+
+    def test_ordered_matches_in_process(self):
+        pages = self.pages(25)
+        expected = [row for page in pages for row in self.SCHEMA.extract(page)]
+        self.assertEqual(list(parse_many(iter(pages), self.SCHEMA, workers=2, chunksize=3)), expected)
+
+    def test_as_completed_and_errors(self):
+        pages = self.pages(10)
+        pages[4] = "   "
+        with ParsePool(self.SCHEMA, workers=2, chunksize=2) as pool:
+            results = list(pool.map(pages, ordered=False))
+            self.assertEqual(sorted(r.index for r in results), list(range(10)))
+            failed = [r for r in results if not r.ok]
+            self.assertEqual([r.index for r in failed], [4])
+            self.assertIsInstance(failed[0].error, ParserError)
+            with self.assertRaises(ParserError):
+                list(pool.extract(pages))
+            self.assertEqual(len(list(pool.extract(self.pages(3)))), 6)
+
+
 class TestJsonParser(unittest.TestCase):
     def setUp(self):
         self.parser = JsonParser({"user": {"name": "Alice", "city": "Bangkok"}, "items": [1, 2]})
@@ -188,6 +881,33 @@ class TestJsonParser(unittest.TestCase):
         flat = self.parser.flatten()
         self.assertEqual(flat["user.name"], "Alice")
 
+    def test_flatten_options(self):
+        data = {"user": {"name": "A", "tags": ["x", "y"], "addr": {"city": "B"}}, "items": [{"id": 1}], "empty": {}}
+        parser = JsonParser(data)
+        self.assertEqual(parser.flatten(), {
+            "user.name": "A", "user.tags.0": "x", "user.tags.1": "y", "user.addr.city": "B", "items.0.id": 1,
+        })
+        self.assertEqual(parser.flatten(max_depth=2)["user.addr"], {"city": "B"})
+        self.assertEqual(parser.flatten(expand_lists=False)["items"], [{"id": 1}])
+        self.assertEqual(parser.flatten(include=["user.*"], exclude=["user.tags"]), {"user.name": "A", "user.addr.city": "B"})
+        self.assertEqual(next(parser.iter_flatten(sep="/")), ("user/name", "A"))
+        self.assertEqual(JsonParser(5).flatten(), {"": 5})
+
+    def test_flatten_deep_and_unflatten(self):
+        deep = leaf = {}
+        for _ in range(3000):
+            leaf["a"] = {}
+            leaf = leaf["a"]
+        leaf["v"] = [1, {"w": 2}]
+        flat = JsonParser(deep).flatten()
+        self.assertEqual(len(next(iter(flat))), 3000 * 2 + 3)
+        self.assertEqual(JsonParser(JsonParser.unflatten(flat)).flatten(), flat)  # == on the dicts would recurse
+        data = {"user": {"tags": ["x", "y"]}, "rows": [[1, 2], [3]], "kept": {"0": "zero"}}
+        self.assertEqual(JsonParser.unflatten(JsonParser(data).flatten()), dict(data, kept=["zero"]))
+        whole = JsonParser(data).flatten(max_depth=1)
+        self.assertEqual(JsonParser.unflatten(whole), data)
+        self.assertEqual(JsonParser.unflatten({"0": "a", "1": "b"}), ["a", "b"])
+
     def test_keys(self):
         self.assertIn("user", self.parser.keys())
 
@@ -195,6 +915,123 @@ class TestJsonParser(unittest.TestCase):
         self.assertIn("JsonParser", repr(self.parser))
 
 
+class TestJsonPath(unittest.TestCase):
+    DATA = {
+        "items": [{"price": {"amount": 1}}, {"price": {}}, {"price": {"amount": 3}}, "junk"],
+        "a.b": {"c": [1, 2, 3, 4]},
+        "shops": {"x": {"rating": 4}, "y": {"rating": 5}},
+    }
+
+    def test_paths(self):
+        cases = [
+            ("items[*].price.amount", [1, 3]),
+            ("items[0].price.amount", 1),
+            ("items[-2].price", {"amount": 3}),
+            ('["a.b"].c[1:3]', [2, 3]),
+            ("$.shops.*.rating", [4, 5]),
+            ("items[::2].price.amount", [1, 3]),
+            ("items[9].price", None),
+            ("items.price", None),
+        ]
+        for expr, expected in cases:
+            with self.subTest(expr=expr):
+                self.assertEqual(compile_path(expr).find(self.DATA), expected)
+        self.assertIs(compile_path("items[*]"), compile_path("items[*]"))
+        self.assertEqual(JsonParser(self.DATA).query("items[5]", default=0), 0)
+
+    def test_invalid_paths(self):
+        for expr in ("a[", "a..b", "a[x]", 'a["b]', "a[1:2:3:4]", "a[::0]", "a[1:5:0]"):
+            with self.subTest(expr=expr), self.assertRaises(ParserError):
+                compile_path(expr)
+
+    def test_query_rows_and_columns(self):
+        query = JsonQuery({"amount": "price.amount", "all": "price.*"}, records="items", default=-1)
+        expected = [
+            {"amount": 1, "all": [1]}, {"amount": -1, "all": []},
+            {"amount": 3, "all": [3]}, {"amount": -1, "all": []},
+        ]
+        self.assertEqual(query.extract(self.DATA), expected)
+        self.assertEqual(JsonParser(self.DATA).extract(query.fields, records="items", default=-1), expected)
+        self.assertEqual(list(query.extract_many([self.DATA, {}])), expected)
+        self.assertEqual(query.columns([self.DATA, self.DATA])["amount"], [1, -1, 3, -1] * 2)
+
+    def test_query_over_records(self):
+        records = [{"id": i, "tags": [{"n": "a"}, {"n": str(i)}]} for i in range(5000)]
+        query = JsonQuery({"id": "id", "tags": "tags[*].n", "first": "tags[0].n"})
+        rows = list(query.extract_many(iter(records)))
+        self.assertEqual(len(rows), 5000)
+        self.assertEqual(rows[4321], {"id": 4321, "tags": ["a", "4321"], "first": "a"})
+        self.assertEqual(query.columns(records)["id"], list(range(5000)))
+
+        gc_states = []
+
+        def source():
+            for record in records:
+                gc_states.append(gc.isenabled())
+                yield record
+
+        self.assertEqual(query.columns(source())["id"], list(range(5000)))
+        self.assertTrue(all(gc_states))  # queries leave the process's collector alone
+
+
+class TestJsonStream(unittest.TestCase):
+    RECORDS = [{"id": i, "name": f"สินค้า \\\"{i}\"", "price": [i * 1.5, -2e-3, None, True]} for i in range(300)]
+
+    @staticmethod
+    def _chunks(data, size):
+        return [data[i:i + size] for i in range(0, len(data), size)]
+
+    def test_nested_array_any_chunking(self):
+        doc = json.dumps({
+            "meta": {"skip": [1, {"x": "]}\\\""}]}, "note": "[{",
+            "data": {"total": 300, "items": self.RECORDS, "after": [0]},
+        }).encode()
+        for size in (1, 7, 4096, len(doc)):
+            with self.subTest(size=size):
+                stream = JsonStream(self._chunks(doc, size), path="data.items")
+                self.assertEqual(list(stream), self.RECORDS)
+                self.assertEqual(stream.count, 300)
+        self.assertEqual(list(JsonStream([doc], path="data.items[*]")), self.RECORDS)
+        self.assertEqual(list(JsonStream([doc], path="data.missing")), [])
+        self.assertEqual(list(JsonStream(io.StringIO('[[0], [1, [{"k": 5}]]]'), path="[1][1]")), [{"k": 5}])
+
+    def test_ndjson_and_top_level_array(self):
+        lines = "\n".join(json.dumps(r, ensure_ascii=False) for r in self.RECORDS) + "\n\n"
+        for size in (1, 5, 4096):
+            with self.subTest(size=size):
+                self.assertEqual(list(JsonStream(self._chunks(lines.encode(), size))), self.RECORDS)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "export.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.RECORDS, f)
+            stream = JsonStream(path, chunk_size=1000)
+            self.assertEqual([len(b) for b in stream.batches(128)], [128, 128, 44])
+            self.assertEqual(list(stream), self.RECORDS)
+        numbers = b"[1, 2.5e3, -0.5, 12345, null]"
+        self.assertEqual(list(JsonStream(self._chunks(numbers, 1))), [1, 2500.0, -0.5, 12345, None])
+
+    def test_errors(self):
+        for source, kwargs in (
+            (b"[1, 2 3]", {}),
+            (b'{"a": 1}\n{bad\n', {}),
+            (b'["' + b"x" * 100 + b'"]', {"max_record_size": 10, "chunk_size": 4}),
+        ):
+            with self.subTest(source=source[:20]), self.assertRaises(ParserError):
+                list(JsonStream(io.BytesIO(source), chunk_size=kwargs.get("chunk_size", 1024),
+                                max_record_size=kwargs.get("max_record_size", 1024)))
+        with self.assertRaises(ParserError):
+            JsonStream(b"[]", path="items[1:2]")
+        stream = JsonStream(iter([b"[1]"]))
+        list(stream)
+        with self.assertRaises(ParserError):
+            list(stream)
+
+    def test_stream_json_from_client(self):
+        with _StubServer() as server, HttpClient(base_url=server.url) as client:
+            stream = client.stream_json("/api", path="data.items", params={"size": 25}, chunk_size=16)
+            self.assertEqual([r["id"] for r in stream], list(range(25)))
+
+
 # ── Transform ────────────────────────────────────────────────────
 
 class TestDataCleaner(unittest.TestCase):
@@ -247,6 +1084,199 @@ class TestDataCleaner(unittest.TestCase):
     def test_repr(self):
         self.assertIn("DataCleaner", repr(DataCleaner(self.data)))
 
+    def test_lazy_matches_eager(self):
+        chains = [
+            lambda c: c.strip_whitespace().rename_columns({"name": "n"}).drop_nulls(["n"]).select_columns(["n", "city"]),
+            lambda c: c.fill_null("-", ["name"]).drop_duplicates(["name"]).select_columns(["name", "zip"]),
+            lambda c: c.select_columns(["name", "age"]).rename_columns({"age": "name", "name": "age"}).strip_whitespace(["age"]),
+            lambda c: c.rename_columns({"city": "name"}).select_columns(["name"]).drop_nulls(["name"]),
+            lambda c: c.drop_nulls().strip_whitespace(["city"]).fill_null(0).drop_duplicates(),
+        ]
+        for n, chain in enumerate(chains):
+            with self.subTest(chain=n):
+                eager = chain(DataCleaner(self.data)).to_list()
+                lazy = chain(DataCleaner(self.data, lazy=True))
+                self.assertEqual(list(lazy), eager)
+                self.assertEqual([list(row.items()) for row in lazy.to_list()], [list(row.items()) for row in eager])
+        self.assertEqual(self.data[3]["name"], "  Bob  ")
+
+    def test_lazy_plan_explain(self):
+        cleaner = (
+            DataCleaner(self.data, lazy=True)
+            .strip_whitespace()
+            .rename_columns({"name": "full_name"})
+            .drop_nulls(["full_name"])
+            .select_columns(["full_name", "age"])
+        )
+        self.assertTrue(cleaner.lazy)
+        self.assertIn("pending_steps=4", repr(cleaner))
+        plan = cleaner.explain()
+        self.assertIn("3 step(s) in 1 pass (from 4", plan)
+        self.assertIn("project(full_name <- name|full_name, age)", plan)
+        converter = DataConverter(cleaner).cast({"age": "int", "city": "int"})
+        self.assertIn("cast(age: int)", converter.explain())
+        self.assertEqual(converter.to_list(), [
+            {"full_name": "Alice", "age": 30}, {"full_name": "Alice", "age": 30}, {"full_name": "Bob", "age": 28},
+        ])
+        self.assertEqual(cleaner.summary()["dropped"], 1)
+        self.assertEqual(cleaner.explain(), "No pending steps")
+
+    def test_streaming_from_generator(self):
+        rows = ({"id": str(i % 40), "name": "  x  y " if i % 3 else ""} for i in range(200))
+        cleaner = DataCleaner(rows).strip_whitespace().drop_nulls(["name"]).drop_duplicates(["id"])
+        self.assertTrue(cleaner.streaming and cleaner.lazy)
+        converter = DataConverter(cleaner).to_int(["id"])
+        chunks = list(converter.iter_chunks(16))
+        self.assertEqual([len(c) for c in chunks], [16, 16, 8])
+        self.assertEqual(chunks[0][:2], [{"id": 1, "name": "x y"}, {"id": 2, "name": "x y"}])
+        self.assertEqual((converter.count, converter.columns), (40, ["id", "name"]))
+        with self.assertRaises(DataConverterError):
+            list(converter)
+        summary = DataCleaner(iter(self.data)).drop_nulls(["name"]).summary()
+        self.assertEqual((summary["original_count"], summary["dropped"]), (4, 1))
+
+    def test_columnar_matches_rows(self):
+        chains = [
+            lambda c: c.strip_whitespace().drop_nulls(["name"]).drop_duplicates(["name", "age"]),
+            lambda c: c.fill_null("-", ["name", "zip"]).rename_columns({"city": "town"}).select_columns(["town", "name"]),
+            lambda c: c.strip_whitespace(["city"]).drop_duplicates().select_columns(["name", "missing"]),
+        ]
+        data = self.data + [{"name": "Carol", "city": " Krabi "}]
+        for n, chain in enumerate(chains):
+            with self.subTest(chain=n):
+                expected = chain(DataCleaner(data)).to_list()
+                for lazy in (False, True):
+                    cleaner = chain(DataCleaner(data, lazy=lazy, storage="columns"))
+                    self.assertEqual(cleaner.storage, "columns")
+                    self.assertEqual(cleaner.to_list(), expected)
+                    self.assertEqual(cleaner.count, len(expected))
+        # a key first seen later must not jump ahead of the keys it follows
+        rows = [{"a": 1}, {"b": 2, "c": 3}, {"a": 4, "c": 5}]
+        collisions = [
+            lambda c: c.rename_columns({"a": "c", "b": "a"}).fill_null(0),
+            lambda c: c.rename_columns({"a": "c", "b": "a"}).strip_whitespace().drop_nulls(),
+        ]
+        for n, chain in enumerate(collisions):
+            with self.subTest(collision=n):
+                expected = chain(DataCleaner(rows)).to_list()
+                for lazy in (False, True):
+                    self.assertEqual(chain(DataCleaner(rows, lazy=lazy, storage="columns")).to_list(), expected)
+        # Rows disagreeing on key order: each row keeps the value of the key it has last.
+        mixed = [{"a": 1, "b": 2}, {"b": 3, "a": 4}, {"a": 5}, {"b": 6}]
+        self.assertEqual(DataCleaner(mixed, storage="columns").rename_columns({"a": "b"}).to_list(),
+                         [{"b": 2}, {"b": 4}, {"b": 5}, {"b": 6}])
+        reordered = [
+            lambda c: c.rename_columns({"a": "b"}).strip_whitespace(),
+            lambda c: c.rename_columns({"a": "b"}).select_columns(["b"]),
+            lambda c: c.fill_null(0, ["a"]).rename_columns({"a": "b"}),
+            lambda c: c.drop_nulls(["b"]).rename_columns({"a": "c"}).rename_columns({"c": "b"}),
+        ]
+        for n, chain in enumerate(reordered):
+            with self.subTest(reordered=n):
+                expected = chain(DataCleaner(mixed)).to_list()
+                for lazy in (False, True):
+                    result = chain(DataCleaner(mixed, lazy=lazy, storage="columns")).to_list()
+                    self.assertEqual([list(row.items()) for row in result], [list(row.items()) for row in expected])
+        schema = {"a": "int", "c": "int"}
+        expected = DataConverter(DataCleaner(rows).rename_columns({"a": "c", "b": "a"}).to_list()).cast(schema).to_list()
+        renamed = DataCleaner(rows, storage="columns").rename_columns({"a": "c", "b": "a"}).to_list()
+        self.assertEqual(DataConverter(renamed, storage="columns").cast(schema).to_list(), expected)
+        summary = DataCleaner(data, storage="columns").drop_nulls(["age"]).summary()
+        self.assertEqual((summary["original_count"], summary["dropped"]), (5, 1))
+        with self.assertRaises(DataCleanerError):
+            DataCleaner(data, storage="arrow")
+
+    def test_normalize_text(self):
+        pipeline = TextPipeline().nfkc().casefold()
+        data = [{"name": " Ａlice  ", "city": "ＢＫＫ", "age": 30}, {"name": None, "city": "X"}]
+        expected = [{"name": "alice", "city": "ＢＫＫ", "age": 30}, {"name": None, "city": "X"}]
+        for lazy in (False, True):
+            for storage in ("rows", "columns"):
+                cleaner = DataCleaner(data, lazy=lazy, storage=storage).strip_whitespace(["name"]).normalize_text(pipeline, ["name"])
+                self.assertEqual(cleaner.to_list(), expected)
+        plan = DataCleaner(data, lazy=True).strip_whitespace(["name"]).normalize_text(pipeline, ["name"]).explain()
+        self.assertIn("1 step(s)", plan)  # the strip fused into the pipeline
+        with self.assertRaises(DataCleanerError):
+            DataCleaner(data).normalize_text(str.casefold)
+
+    def test_copy_on_write(self):
+        rows = [{"name": " Alice ", "age": "30"}, {"name": "", "age": "25"}]
+        cleaner = DataCleaner(rows).drop_nulls(["name"])
+        self.assertIs(cleaner.to_list()[0], rows[0])  # filters copy nothing
+        converter = DataConverter(cleaner)
+        self.assertIs(converter.to_list()[0], rows[0])  # nor does the handoff
+        converter.to_int(["age"])
+        cleaner.strip_whitespace()
+        self.assertEqual(converter.to_list(), [{"name": " Alice ", "age": 30}])
+        self.assertEqual(cleaner.to_list(), [{"name": "Alice", "age": "30"}])
+        self.assertEqual(rows[0], {"name": " Alice ", "age": "30"})
+
+        owned = [dict(row) for row in rows]
+        cleaner = DataCleaner(owned, copy=False).strip_whitespace()
+        DataConverter(cleaner, copy=False).to_int(["age"])
+        self.assertEqual(owned[0], {"name": "Alice", "age": 30})
+
+    def test_process_executor(self):
+        rows = [{"id": str(i % 40), "name": f" item  {i % 40} ", "price": str(i)} for i in range(120)]
+
+        def chain(cleaner):
+            cleaner = cleaner.strip_whitespace().drop_duplicates(["id"]).drop_nulls(["name"])
+            return DataConverter(cleaner).cast({"id": "int", "price": "float"})
+
+        expected = chain(DataCleaner(rows)).to_list()
+        for strategy in ("exact", "spill"):
+            with self.subTest(strategy=strategy):
+                cleaner = DataCleaner(rows, executor="process", workers=2, chunksize=16)
+                cleaner = cleaner.strip_whitespace().drop_duplicates(["id"], strategy=strategy).drop_nulls(["name"])
+                converter = DataConverter(cleaner).cast({"id": "int", "price": "float"})
+                self.assertIn("Executor: process (2 workers, 16 rows per chunk)", converter.explain())
+                self.assertEqual(converter.to_list(), expected)
+                stats = cleaner.dedup_stats()[0]
+                self.assertEqual((stats.rows, stats.dropped), (120, 80))
+        self.assertEqual(rows[0]["name"], " item  0 ")
+        with self.assertRaises(DataCleanerError):
+            DataCleaner(rows, executor="thread")
+        with self.assertRaises(DataCleanerError):
+            DataCleaner(rows, executor="process", storage="columns")
+
+    def test_process_executor_repeated_rows(self):
+        # The same dict repeated: unpickled chunks share it, so workers must copy before writing.
+        row = {"a": "x", "b": None}
+        for steps in (lambda c: c.drop_duplicates().fill_null(0), lambda c: c.fill_null(0).drop_duplicates(["b"])):
+            expected = steps(DataCleaner([row] * 6)).to_list()
+            result = steps(DataCleaner([row] * 6, executor="process", workers=2, chunksize=3)).to_list()
+            self.assertEqual(result, expected)
+        self.assertEqual(row, {"a": "x", "b": None})
+
+    def test_drop_duplicates_strategies(self):
+        rows = [{"id": i % 7, "tags": [i % 7, "x"], "meta": {"n": i % 7}} for i in range(30)]
+        expected = rows[:7]
+        self.assertEqual(DataCleaner(rows).drop_duplicates().to_list(), expected)
+        with tempfile.TemporaryDirectory() as tmp:
+            for strategy in ("exact", "hash", "bloom", "spill"):
+                with self.subTest(strategy=strategy):
+                    cleaner = DataCleaner(iter(rows)).drop_duplicates(["tags"], strategy=strategy, spill_dir=tmp)
+                    self.assertEqual(cleaner.to_list(), expected)
+                    stats = cleaner.dedup_stats()[0]
+                    self.assertEqual((stats.strategy, stats.rows, stats.dropped, stats.unique), (strategy, 30, 23, 7))
+                    self.assertGreater(stats.memory_bytes, 0)
+                    self.assertLess(stats.false_positive_rate, 1e-6)
+            self.assertEqual(os.listdir(tmp), [])
+        cleaner = DataCleaner(rows, lazy=True).drop_duplicates(["id"], strategy="bloom", capacity=100, error_rate=0.01)
+        self.assertIn("Dedup('bloom', capacity=100, error_rate=0.01)", cleaner.explain())
+        with self.assertRaises(DataCleanerError):
+            DataCleaner(rows).drop_duplicates(strategy="fuzzy")
+
+    def test_write_sinks(self):
+        cleaner = DataCleaner(tuple(self.data)).drop_duplicates().select_columns(["name"])
+        batches = []
+        self.assertEqual(cleaner.write(batches.append, chunk_size=2), 3)
+        self.assertEqual([len(b) for b in batches], [2, 1])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "out.ndjson")
+            self.assertEqual(DataCleaner(self.data).strip_whitespace(["name"]).write(path), 4)
+            self.assertEqual([r["name"] for r in JsonStream(path)], ["Alice", "", "Alice", "Bob"])
+
 
 class TestDataConverter(unittest.TestCase):
     def setUp(self):
@@ -296,6 +1326,61 @@ class TestDataConverter(unittest.TestCase):
     def test_repr(self):
         self.assertIn("DataConverter", repr(DataConverter(self.data)))
 
+    def test_columnar_typed_columns(self):
+        data = self.data + [{"age": "", "price": "n/a"}]
+        schema = {"age": "int", "price": "float", "active": "bool", "date": "date"}
+        cleaner = DataCleaner(data, storage="columns").strip_whitespace()
+        converter = DataConverter(cleaner).cast(schema)
+        self.assertEqual(converter.storage, "columns")
+        self.assertEqual(converter.to_list(), DataConverter(data).cast(schema).to_list())
+        table = converter._table()
+        self.assertEqual([table.columns[c].kind for c in ("age", "price", "active", "date")], ["int", "float", "bool", "object"])
+        self.assertIsNotNone(table.columns["active"].state)
+        self.assertEqual(converter.to_list()[2], {"age": None, "price": None})
+        self.assertEqual(DataConverter(cleaner, storage="rows").storage, "rows")
+
+    def test_row_converter(self):
+        schema = {"age": "int", "price": "float", "active": "bool", "date": "date"}
+        data = self.data + [{"age": "n/a", "price": "", "active": "maybe", "date": "soon"}, {"age": " 7 "}]
+        converter = RowConverter(schema, errors={"age": "collect"}, defaults={"price": 0.0})
+        expected = DataConverter(data).cast(schema).to_list()
+        expected[2]["price"] = None  # empty, not an error: no default
+        self.assertEqual(converter.convert([dict(row) for row in data]), expected)
+        self.assertEqual(converter.error_counts, {"age": 1, "price": 0, "active": 1, "date": 1})
+        self.assertEqual(converter.errors, [(2, "age", "n/a")])
+        self.assertEqual(converter.rows, 4)
+        self.assertIs(RowConverter(schema).source, converter.source)  # compiled once per schema
+
+        # Reused on another batch: counters and row numbers carry on.
+        self.assertEqual(converter({"age": "x"}), {"age": None})
+        self.assertEqual(converter.errors[-1], (4, "age", "x"))
+        converter.reset()
+        self.assertEqual((converter.rows, converter.errors), (0, []))
+
+        # The date memo is bounded, and reset() clears it.
+        dates = [{"date": f"2024-01-{day:02d}"} for day in range(1, 29)]
+        with mock.patch("tlnk.transform.compiled.DATE_MEMO", 8):
+            converter = RowConverter({"date": "date"})
+        self.assertEqual(converter.convert(dates)[-1], {"date": "2024-01-28"})
+        self.assertLessEqual(len(converter._dates[0]), 8)
+        converter.reset()
+        self.assertEqual(converter._dates, [{}])
+
+        for options in ({}, {"lazy": True}, {"storage": "columns"}, {"executor": "process", "workers": 2, "chunksize": 2}):
+            with self.subTest(**options):
+                chain = DataConverter(data, **options).cast(schema, errors="collect")
+                self.assertEqual(chain.to_list(), DataConverter(data).cast(schema).to_list())
+                self.assertEqual(chain.error_counts(), {"age": 1, "price": 0, "active": 1, "date": 1})
+        self.assertEqual(data[2]["age"], "n/a")
+        self.assertIn("convert(age: int, price: float, active: bool, date: date; compiled)",
+                      DataConverter(data, lazy=True).cast(schema, errors="default").explain())
+        with self.assertRaises(DataConverterError):
+            DataConverter(data).cast(schema, errors="raise")
+        with self.assertRaises(DataConverterError):
+            RowConverter(schema, errors="ignore")
+        with self.assertRaises(DataConverterError):
+            RowConverter({"age": "decimal"})
+
 
 if __name__ == "__main__":
     unittest.main()
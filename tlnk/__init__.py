@@ -1,18 +1,35 @@
-from .scraper.http import HttpClient, HttpClientError
+from .scraper.http import HttpClient, HttpClientError, FetchResult
+from .scraper.async_http import AsyncHttpClient
+from .scraper.cache import ResponseCache
+from .scraper.paginate import Paginator
 from .scraper.parser import HtmlParser, JsonParser, ParserError
+from .scraper.schema import ExtractionSchema
+from .scraper.jsonpath import JsonQuery
+from .scraper.pool import ParsePool, parse_many
+from .scraper.jsonstream import JsonStream
 from .transform.cleaner import DataCleaner, DataCleanerError
-from .transform.converter import DataConverter, DataConverterError
+from .transform.converter import DataConverter, DataConverterError, RowConverter
 
 
 
 __all__ = [
     # scraper
     "HttpClient",
+    "AsyncHttpClient",
+    "FetchResult",
+    "ResponseCache",
+    "Paginator",
     "HtmlParser",
     "JsonParser",
+    "JsonQuery",
+    "JsonStream",
+    "ExtractionSchema",
+    "ParsePool",
+    "parse_many",
     # transform
     "DataCleaner",
     "DataConverter",
+    "RowConverter",
     # exceptions
     "HttpClientError",
     "ParserError",
@@ -1,4 +1,21 @@
-from .http import HttpClient, HttpClientError
+from .http import HttpClient, HttpClientError, FetchResult
+from .async_http import AsyncHttpClient, AsyncResponse
+from .cache import ResponseCache
+from .paginate import Paginator
 from .parser import HtmlParser, JsonParser, ParserError
+from .schema import ExtractionSchema, Field
+from .jsonpath import JsonPath, JsonQuery, compile_path
+from .pool import ParsePool, ParseResult, parse_many
+from .jsonstream import JsonStream
 
-__all__ = ["HttpClient", "HttpClientError", "HtmlParser", "JsonParser", "ParserError"]
+__all__ = [
+    "HttpClient", "HttpClientError", "FetchResult",
+    "AsyncHttpClient", "AsyncResponse",
+    "ResponseCache",
+    "Paginator",
+    "HtmlParser", "JsonParser", "ParserError",
+    "ExtractionSchema", "Field",
+    "JsonPath", "JsonQuery", "compile_path",
+    "ParsePool", "ParseResult", "parse_many",
+    "JsonStream",
+]
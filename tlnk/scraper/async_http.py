@@ -0,0 +1,224 @@
+"""
+Async HTTP client.
+"""
+import time
+import asyncio
+import json as _json
+from typing import Optional, Dict, Any, Iterable, AsyncIterator, List
+from urllib.parse import urlsplit
+from ..utils import get_logger, get_default_headers, RetryPolicy, RetryStats, HostRateLimiter
+from .http import FetchResult
+
+logger = get_logger(__name__)
+
+
+class AsyncResponse:
+    """
+    Fully-read response returned by AsyncHttpClient.
+
+    The body is read before the connection goes back to the pool, so the
+    object stays usable after the request context has closed.
+    """
+
+    __slots__ = ("url", "status_code", "headers", "content", "encoding", "retry_stats")
+
+    def __init__(self, url: str, status_code: int, headers: Dict[str, str], content: bytes, encoding: Optional[str]):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+        self.retry_stats: Optional[RetryStats] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return _json.loads(self.text)
+
+    def __repr__(self) -> str:
+        return f"AsyncResponse(url={self.url!r}, status_code={self.status_code})"
+
+
+class AsyncHttpClient:
+    """
+    asyncio HTTP client with bounded concurrent fan-out (requires aiohttp).
+
+    Retries follow `retry_policy` like HttpClient, but back off with
+    `await asyncio.sleep` so other requests keep running meanwhile. An
+    optional `rate_limiter` paces requests per host, as in HttpClient.
+
+    Usage:
+        async with AsyncHttpClient(base_url="https://api.example.com") as client:
+            res = await client.get("/products")
+            async for result in client.get_many(urls, concurrency=20):
+                ...
+    """
+
+    def __init__(
+        self,
+        base_url: str = "",
+        timeout: int = 30,
+        max_retries: int = 3,
+        headers: Optional[Dict[str, str]] = None,
+        limit: int = 100,
+        limit_per_host: int = 10,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[HostRateLimiter] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_policy = retry_policy
+        self.retry_stats = RetryStats()
+        self.rate_limiter = rate_limiter
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self._headers: Dict[str, str] = dict(headers or get_default_headers())
+        self._session = None
+        logger.info(f"AsyncHttpClient initialized (timeout={timeout}, retries={max_retries}, limit_per_host={limit_per_host})")
+
+    def _build_url(self, url: str) -> str:
+        if url.startswith("http"):
+            return url
+        return f"{self.base_url}/{url.lstrip('/')}"
+
+    def _get_session(self):
+        # The session binds to the running loop, so it is created on first use.
+        if self._session is None or self._session.closed:
+            try:
+                import aiohttp
+            except ImportError:
+                raise ImportError("aiohttp is required. Run: pip install aiohttp")
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host)
+            timeout = aiohttp.ClientTimeout(sock_connect=self.timeout, sock_read=self.timeout)
+            self._session = aiohttp.ClientSession(headers=self._headers, timeout=timeout, connector=connector)
+        return self._session
+
+    def _get_retry_policy(self) -> RetryPolicy:
+        if self.retry_policy is None:
+            import aiohttp
+            self.retry_policy = RetryPolicy(
+                max_attempts=self.max_retries + 1, exceptions=(aiohttp.ClientError, asyncio.TimeoutError)
+            )
+        return self.retry_policy
+
+    async def _request(self, method: str, url: str, stats: RetryStats, **kwargs) -> AsyncResponse:
+        full_url = self._build_url(url)
+        session = self._get_session()
+        limiter = self.rate_limiter
+        host = urlsplit(full_url).netloc
+
+        async def attempt() -> AsyncResponse:
+            if limiter is not None:
+                await limiter.acquire_async(host)
+            status = None
+            start = time.monotonic()
+            try:
+                logger.info(f"{method} {full_url}")
+                async with session.request(method, full_url, **kwargs) as resp:
+                    status = resp.status
+                    content = await resp.read()
+                    resp.raise_for_status()
+                    return AsyncResponse(str(resp.url), resp.status, dict(resp.headers), content, resp.charset)
+            finally:
+                if limiter is not None:
+                    limiter.release(host, status, time.monotonic() - start)
+
+        try:
+            response = await self._get_retry_policy().acall(attempt, stats)
+        finally:
+            self.retry_stats.merge(stats)
+        response.retry_stats = stats
+        return response
+
+    async def get(self, url: str, params: Optional[Dict] = None, **kwargs) -> AsyncResponse:
+        return await self._request("GET", url, RetryStats(), params=params, **kwargs)
+
+    async def post(self, url: str, data: Optional[Any] = None, json: Optional[Any] = None, **kwargs) -> AsyncResponse:
+        return await self._request("POST", url, RetryStats(), data=data, json=json, **kwargs)
+
+    async def get_many(
+        self,
+        urls: Iterable[str],
+        concurrency: int = 10,
+        params: Optional[Dict] = None,
+        **kwargs,
+    ) -> AsyncIterator[FetchResult]:
+        """
+        GET many URLs with at most `concurrency` requests in flight.
+
+        Results are yielded as they complete (not in input order); a failed
+        URL yields a FetchResult carrying the error instead of raising.
+        URLs are pulled lazily, so `urls` may be a large generator. If
+        `urls` raises, the results already fetched are yielded and the
+        error is raised after them.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be >= 1")
+        pending = iter(urls)
+        results: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+        done = object()
+        failed: List[BaseException] = []
+        closed = False
+
+        async def worker():
+            try:
+                for url in pending:
+                    stats = RetryStats()
+                    try:
+                        response = await self._request("GET", url, stats, params=params, **kwargs)
+                        result = FetchResult(url, response=response, retry_stats=stats)
+                    except Exception as e:
+                        result = FetchResult(url, error=e, retry_stats=stats)
+                    await results.put(result)
+            except Exception as e:  # raised by the `urls` iterable
+                failed.append(e)
+            finally:
+                # Once the consumer has stopped, nobody reads the queue: a put could wait forever.
+                if not closed:
+                    await results.put(done)
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+        remaining = len(workers)
+        try:
+            while remaining:
+                item = await results.get()
+                if item is done:
+                    remaining -= 1
+                    continue
+                yield item
+            if failed:
+                raise failed[0]
+        finally:
+            closed = True
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    def set_headers(self, headers: Dict[str, str]) -> None:
+        self._headers.update(headers)
+        if self._session is not None:
+            self._session.headers.update(headers)
+
+    def set_auth(self, token: str, scheme: str = "Bearer") -> None:
+        self.set_headers({"Authorization": f"{scheme} {token}"})
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> "AsyncHttpClient":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    def __repr__(self) -> str:
+        return f"AsyncHttpClient(base_url={self.base_url!r}, timeout={self.timeout})"
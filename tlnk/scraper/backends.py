@@ -0,0 +1,433 @@
+"""
+HTML tree backends for HtmlParser.
+
+Each backend wraps one parser library behind the same small interface
+(select / select_one / text / attr), with results matching
+BeautifulSoup's `select` + `get_text(strip=True)` + `get` semantics.
+"""
+import re
+import functools
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from ..utils import get_logger
+
+logger = get_logger(__name__)
+
+BACKENDS = ("lxml", "bs4-lxml", "bs4")
+
+# Attributes BeautifulSoup returns as a list of whitespace-separated values.
+MULTI_VALUED_ATTRIBUTES: Dict[str, Tuple[str, ...]] = {
+    "*": ("class", "accesskey", "dropzone"),
+    "a": ("rel", "rev"),
+    "link": ("rel", "rev"),
+    "td": ("headers",),
+    "th": ("headers",),
+    "form": ("accept-charset",),
+    "object": ("archive",),
+    "area": ("rel",),
+    "icon": ("sizes",),
+    "iframe": ("sandbox",),
+    "output": ("for",),
+}
+
+# Text inside these elements is not part of get_text() of their ancestors.
+HIDDEN_TEXT_TAGS = ("script", "style", "template", "rt", "rp")
+
+
+_COMPOUND_RE = re.compile(
+    r"""\s*(?P<tag>[a-zA-Z][\w-]*|\*)?(?P<parts>(?:[#.][\w-]+|\[[^\]]*\])*)"""
+)
+_PART_RE = re.compile(
+    r"""\#(?P<id>[\w-]+)|\.(?P<cls>[\w-]+)"""
+    r"""|\[\s*(?P<attr>[\w-]+)\s*(?:=\s*(?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<bare>[^\]\s]+))\s*)?\]"""
+)
+
+
+class SelectorScope:
+    """
+    The leftmost compound of a CSS selector (e.g. `div.item` in
+    `div.item > span.price`). Every element the full selector can match lies
+    inside an element matching this compound, so a tree holding only those
+    subtrees gives the same results for the selector.
+    """
+
+    __slots__ = ("css", "tag", "ids", "classes", "attrs")
+
+    def __init__(self, css: str, tag: Optional[str], ids: List[str], classes: List[str], attrs: Dict[str, Optional[str]]):
+        self.css = css
+        self.tag = tag
+        self.ids = ids
+        self.classes = classes
+        self.attrs = attrs
+
+    def matches(self, name: str, attrs: Dict[str, Any]) -> bool:
+        if self.tag is not None and name != self.tag:
+            return False
+        if self.ids and any(attrs.get("id") != i for i in self.ids):
+            return False
+        if self.classes:
+            present = attrs.get("class") or ""
+            present = present.split() if isinstance(present, str) else present
+            if any(c not in present for c in self.classes):
+                return False
+        for attr, value in self.attrs.items():
+            if attr not in attrs:
+                return False
+            if value is not None:
+                present = attrs[attr]
+                if (present if isinstance(present, str) else " ".join(present)) != value:
+                    return False
+        return True
+
+    def __repr__(self) -> str:
+        return f"SelectorScope({self.css!r})"
+
+
+def split_selectors(selector: str) -> List[str]:
+    """Split a selector group ("a, b") on the commas outside brackets, parentheses and quotes."""
+    parts, depth, quote, start = [], 0, None, 0
+    for i, char in enumerate(selector):
+        if quote:
+            quote = None if char == quote else quote
+        elif char in "\"'":
+            quote = char
+        elif char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(selector[start:i].strip())
+            start = i + 1
+    parts.append(selector[start:].strip())
+    return [part for part in parts if part]
+
+
+def selector_scopes(selectors: Iterable[str]) -> Optional[List[SelectorScope]]:
+    """
+    Scopes for a list of selectors, or None when one of them cannot be
+    restricted safely (sibling combinators, pseudo-classes or functions on
+    the leftmost compound, or an empty compound).
+    """
+    scopes = []
+    for selector in selectors:
+        if "(" in selector:
+            return None
+        for part in split_selectors(selector):
+            match = _COMPOUND_RE.match(part)
+            tag, parts = match.group("tag"), match.group("parts")
+            rest = part[match.end():]
+            if not (tag or parts) or (rest.strip() and rest.lstrip()[0] in "+~:") or (rest and not rest[0].isspace() and rest[0] != ">"):
+                return None
+            ids, classes, attrs = [], [], {}
+            for piece in _PART_RE.finditer(parts):
+                if piece.group("id"):
+                    ids.append(piece.group("id"))
+                elif piece.group("cls"):
+                    classes.append(piece.group("cls"))
+                else:
+                    value = next((v for v in piece.group("dq", "sq", "bare") if v is not None), None)
+                    attrs[piece.group("attr").lower()] = value
+            if "".join(piece.group(0) for piece in _PART_RE.finditer(parts)) != parts:
+                return None  # attribute operators other than "=" (^=, ~=, ...)
+            css = part[:match.end()].strip()
+            scopes.append(SelectorScope(css, None if tag in (None, "*") else tag.lower(), ids, classes, attrs))
+    return scopes or None
+
+
+@functools.lru_cache(maxsize=None)
+def _scope_filter_class():
+    from bs4.filter import ElementFilter
+
+    class ScopeFilter(ElementFilter):
+        """Keep only top-level elements matching one of the scopes (and their subtrees)."""
+
+        def __init__(self, scopes: List[SelectorScope]):
+            super().__init__()
+            self.scopes = scopes
+
+        def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+            attrs = dict(attrs or {})
+            return any(scope.matches(name, attrs) for scope in self.scopes)
+
+        def allow_string_creation(self, string: str) -> bool:
+            return False
+
+    return ScopeFilter
+
+
+def _strainer(scopes: List[SelectorScope]) -> Any:
+    try:
+        return _scope_filter_class()(scopes)
+    except ImportError:
+        # beautifulsoup4 < 4.13 calls a callable name with (name, attrs) while parsing.
+        from bs4 import SoupStrainer
+        return SoupStrainer(lambda name, attrs=None: any(s.matches(name, dict(attrs or {})) for s in scopes))
+
+
+@functools.lru_cache(maxsize=None)
+def _has_module(name: str) -> bool:
+    try:
+        __import__(name)
+        return True
+    except ImportError:
+        return False
+
+
+def available_backends() -> List[str]:
+    """Backends that can be used with the installed packages, fastest first."""
+    found = []
+    if _has_module("lxml") and _has_module("cssselect"):
+        found.append("lxml")
+    if _has_module("bs4"):
+        if _has_module("lxml"):
+            found.append("bs4-lxml")
+        found.append("bs4")
+    return found
+
+
+def resolve_backend(backend: str = "auto") -> str:
+    """Map "auto" to the fastest installed backend and validate explicit names."""
+    if backend == "auto":
+        found = available_backends()
+        if not found:
+            raise ImportError("beautifulsoup4 is required. Run: pip install beautifulsoup4")
+        return found[0]
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend!r}. Use: {['auto', *BACKENDS]}")
+    if backend not in available_backends():
+        hint = {"lxml": "lxml cssselect", "bs4-lxml": "beautifulsoup4 lxml", "bs4": "beautifulsoup4"}[backend]
+        raise ImportError(f"The {backend!r} backend requires: pip install {hint}")
+    return backend
+
+
+def fallback_backend() -> Optional[str]:
+    """The BeautifulSoup backend "auto" falls back to for selectors lxml cannot run, or None."""
+    return next((name for name in available_backends() if name != "lxml"), None)
+
+
+def create_backend(html: Any, backend: str = "auto", **options) -> Any:
+    name = resolve_backend(backend)
+    if name == "lxml":
+        return LxmlBackend(html, **options)
+    return Bs4Backend(html, features="lxml" if name == "bs4-lxml" else "html.parser", **options)
+
+
+class Bs4Backend:
+    """
+    BeautifulSoup tree built with `features` ("html.parser" or "lxml").
+
+    With `scopes`, a parse-time filter (SoupStrainer) creates only the
+    subtrees matching them and discards everything else.
+    """
+
+    def __init__(self, html: Any, features: str = "html.parser", scopes: Optional[List[SelectorScope]] = None):
+        from bs4 import BeautifulSoup
+        self.name = "bs4-lxml" if features == "lxml" else "bs4"
+        self.root = BeautifulSoup(html, features, parse_only=_strainer(scopes) if scopes else None)
+
+    def select_one(self, selector: str, node: Any = None) -> Any:
+        return (self.root if node is None else node).select_one(selector)
+
+    def select(self, selector: str, node: Any = None) -> List[Any]:
+        return (self.root if node is None else node).select(selector)
+
+    @staticmethod
+    def compile(selector: str) -> Tuple[Callable[[Any], List[Any]], Callable[[Any], Any]]:
+        """Pre-parsed (select, select_one) functions for `selector`, taking the node to search."""
+        import soupsieve
+        pattern = soupsieve.compile(selector)
+        return pattern.select, pattern.select_one
+
+    @staticmethod
+    def children(node: Any) -> Iterator[Tuple[Any, str, Dict[str, Any]]]:
+        """(element, tag, attributes) for every child element of `node`."""
+        from bs4 import Tag
+        for el in node.children:
+            if isinstance(el, Tag):
+                yield el, el.name, el.attrs
+
+    @staticmethod
+    def descendants(node: Any) -> Iterator[Tuple[Any, str, Dict[str, Any]]]:
+        """(element, tag, attributes) for every element below `node`, in document order."""
+        from bs4 import Tag
+        for el in node.descendants:
+            if isinstance(el, Tag):
+                yield el, el.name, el.attrs
+
+    @staticmethod
+    def text(node: Any) -> str:
+        contents = node.contents
+        if len(contents) == 1 and type(contents[0]) is _navigable_string():
+            return contents[0].strip()
+        return node.get_text(strip=True)
+
+    @staticmethod
+    def attr(node: Any, name: str) -> Any:
+        return node.get(name)
+
+
+@functools.lru_cache(maxsize=None)
+def _navigable_string() -> type:
+    from bs4 import NavigableString
+    return NavigableString
+
+
+# :root translates to an element without a parent, which the descendant
+# axis (searched from the root element) never reaches.
+_LXML_UNSUPPORTED = re.compile(r":root\b")
+_QUOTED = re.compile(r"\"[^\"]*\"|'[^']*'")
+
+
+@functools.lru_cache(maxsize=None)
+def _translator():
+    from cssselect import HTMLTranslator
+    return HTMLTranslator()
+
+
+# XPath evaluated on an lxml tree starts at its root element, which a query
+# from the document matches too (as in BeautifulSoup); a query from an
+# element only matches below it.
+_DOCUMENT_AXIS = "descendant-or-self::"
+_ELEMENT_AXIS = "descendant::"
+
+
+@functools.lru_cache(maxsize=1024)
+def _xpath(selector: str, axis: str = _ELEMENT_AXIS):
+    from lxml import etree
+    return etree.XPath(_translator().css_to_xpath(selector, prefix=axis), smart_strings=False)
+
+
+@functools.lru_cache(maxsize=1024)
+def _first_xpath(selector: str, axis: str = _ELEMENT_AXIS):
+    from lxml import etree
+    return etree.XPath(f"({_translator().css_to_xpath(selector, prefix=axis)})[1]", smart_strings=False)
+
+
+def _is_document(node: Any) -> bool:
+    return hasattr(node, "getroot")  # an ElementTree, not an element
+
+
+@functools.lru_cache(maxsize=256)
+def _scope_xpath(scopes: Tuple[str, ...]):
+    from lxml import etree
+    translator = _translator()
+    union = " | ".join(translator.css_to_xpath(css, prefix="descendant-or-self::") for css in scopes)
+    return etree.XPath(union, smart_strings=False)
+
+
+@functools.lru_cache(maxsize=None)
+def _text_xpaths():
+    from lxml import etree
+    hidden = " or ".join(f"ancestor::{tag}" for tag in HIDDEN_TEXT_TAGS)
+    return (
+        etree.XPath(f"descendant::text()[not({hidden})]", smart_strings=False),
+        etree.XPath("descendant::text()", smart_strings=False),
+    )
+
+
+class LxmlBackend:
+    """
+    Native lxml tree queried with cssselect-compiled XPath.
+
+    Parsing and selection run in C, which makes this several times faster
+    than BeautifulSoup. Selectors scoped to a node only match inside it
+    (":scope"-like). Selectors cssselect cannot translate, or that would
+    match differently here (`:root`), raise ParserError; use the bs4
+    backend for those (HtmlParser with backend="auto" switches by itself).
+    """
+
+    name = "lxml"
+
+    def __init__(self, html: Any, scopes: Optional[List[SelectorScope]] = None):
+        from lxml import etree
+        parser = etree.HTMLParser()
+        try:
+            root = etree.fromstring(html, parser)
+        except ValueError:
+            # Unicode input carrying an XML encoding declaration.
+            root = etree.fromstring(html.encode("utf-8"), parser)
+        if root is None:
+            root = etree.Element("html")
+        # A pruned tree is searched from its made-up root element, which
+        # queries must not match.
+        self.root = self._prune(root, scopes) if scopes else root.getroottree()
+
+    @staticmethod
+    def _prune(root: Any, scopes: List[SelectorScope]) -> Any:
+        """Keep only the outermost subtrees matching `scopes` under a fresh root."""
+        from lxml import etree
+        kept = etree.Element("html")
+        last = None
+        for el in _scope_xpath(tuple(scope.css for scope in scopes))(root):
+            if last is not None and any(a is last for a in el.iterancestors()):
+                continue
+            el.tail = None
+            kept.append(el)
+            last = el
+        return kept
+
+    @staticmethod
+    def _compile(selector: str, cache: Callable = _xpath, axis: str = _ELEMENT_AXIS):
+        from cssselect import SelectorError
+        from cssselect.xpath import ExpressionError
+        try:
+            if _LXML_UNSUPPORTED.search(_QUOTED.sub("", selector)):
+                raise ExpressionError("The pseudo-class :root is not supported")
+            return cache(selector, axis)
+        except (SelectorError, ExpressionError) as e:
+            from .parser import ParserError
+            raise ParserError(f"Selector {selector!r} is not supported by the lxml backend ({e}); use backend='bs4'.")
+
+    @classmethod
+    def compile(cls, selector: str) -> Tuple[Callable[[Any], List[Any]], Callable[[Any], Any]]:
+        """Pre-compiled (select, select_one) functions for `selector`, taking the node to search."""
+        below, anywhere = cls._compile(selector), cls._compile(selector, axis=_DOCUMENT_AXIS)
+        first_below, first_anywhere = cls._compile(selector, _first_xpath), cls._compile(selector, _first_xpath, _DOCUMENT_AXIS)
+
+        def select(node: Any) -> List[Any]:
+            return (anywhere if _is_document(node) else below)(node)
+
+        def select_one(node: Any) -> Any:
+            found = (first_anywhere if _is_document(node) else first_below)(node)
+            return found[0] if found else None
+
+        return select, select_one
+
+    def select_one(self, selector: str, node: Any = None) -> Any:
+        node = self.root if node is None else node
+        found = self._compile(selector, _first_xpath, _DOCUMENT_AXIS if _is_document(node) else _ELEMENT_AXIS)(node)
+        return found[0] if found else None
+
+    def select(self, selector: str, node: Any = None) -> List[Any]:
+        node = self.root if node is None else node
+        return self._compile(selector, axis=_DOCUMENT_AXIS if _is_document(node) else _ELEMENT_AXIS)(node)
+
+    @staticmethod
+    def children(node: Any) -> Iterator[Tuple[Any, str, Dict[str, Any]]]:
+        """(element, tag, attributes) for every child element of `node`."""
+        for el in node.iterchildren():
+            if isinstance(el.tag, str):
+                yield el, el.tag, el.attrib
+
+    @staticmethod
+    def descendants(node: Any) -> Iterator[Tuple[Any, str, Dict[str, Any]]]:
+        """(element, tag, attributes) for every element below `node`, in document order."""
+        for el in node.iterdescendants():
+            if isinstance(el.tag, str):
+                yield el, el.tag, el.attrib
+
+    @staticmethod
+    def text(node: Any) -> str:
+        if not len(node):
+            return (node.text or "").strip()
+        visible, everything = _text_xpaths()
+        strings = everything(node) if node.tag in HIDDEN_TEXT_TAGS else visible(node)
+        return "".join(s.strip() for s in strings)
+
+    @staticmethod
+    def attr(node: Any, name: str) -> Any:
+        value = node.get(name)
+        if value is not None and (
+            name in MULTI_VALUED_ATTRIBUTES["*"] or name in MULTI_VALUED_ATTRIBUTES.get(node.tag, ())
+        ):
+            return value.split()
+        return value
@@ -0,0 +1,275 @@
+"""
+Persistent HTTP response cache.
+"""
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Any
+from urllib.parse import urlencode
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from ..utils import get_logger
+
+logger = get_logger(__name__)
+
+# Headers that describe the wire encoding rather than the (already decoded) body we store.
+_DROP_HEADERS = ("content-encoding", "transfer-encoding", "content-length", "connection")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    raw_size INTEGER NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    expires_at REAL NOT NULL,
+    stored_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    elapsed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access);
+"""
+
+
+def _parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    directives: Dict[str, Optional[str]] = {}
+    for part in (value or "").split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') or None
+    return directives
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class CacheEntry:
+    """A cached response as read back from the store."""
+
+    __slots__ = ("key", "url", "status", "headers", "body", "etag", "last_modified", "expires_at", "elapsed")
+
+    def __init__(self, key, url, status, headers, body, etag, last_modified, expires_at, elapsed):
+        self.key = key
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+        self.elapsed = elapsed
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return (now or time.time()) < self.expires_at
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def to_response(self) -> requests.Response:
+        response = requests.Response()
+        response.status_code = self.status
+        response.reason = "OK"
+        response.url = self.url
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = self.body
+        response.from_cache = True
+        return response
+
+    def __repr__(self) -> str:
+        return f"CacheEntry(url={self.url!r}, fresh={self.is_fresh()})"
+
+
+class ResponseCache:
+    """
+    SQLite-backed HTTP response cache with conditional revalidation.
+
+    Entries are keyed on method + URL + sorted params and stored
+    zlib-compressed. Freshness follows Cache-Control (max-age, no-cache,
+    no-store) and Expires, falling back to `default_ttl` seconds; stale
+    entries with an ETag or Last-Modified are revalidated and a 304 is
+    answered from the cache. When the stored bodies exceed `max_size` bytes
+    the least recently used entries are evicted. Vary is not taken into
+    account, so do not share a cache between clients sending different
+    content-negotiation headers.
+
+    Usage:
+        cache = ResponseCache("crawl_cache.sqlite", max_size=1 << 30)
+        with HttpClient(cache=cache) as client:
+            client.get("https://example.com/products")
+        cache.stats()
+    """
+
+    def __init__(
+        self,
+        path: str = "tlnk_cache.sqlite",
+        max_size: int = 512 * 1024 * 1024,
+        default_ttl: float = 0,
+        compress_level: int = 6,
+    ):
+        self.path = path
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self.compress_level = compress_level
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        self._stats = {
+            "hits": 0, "revalidated": 0, "misses": 0, "stores": 0, "evictions": 0,
+            "bytes_saved": 0, "time_saved": 0.0,
+        }
+        logger.info(f"ResponseCache opened ({path}, {self._size} bytes)")
+
+    @staticmethod
+    def make_key(method: str, url: str, params: Optional[Any] = None) -> str:
+        if isinstance(params, dict):
+            params = sorted(params.items())
+        query = urlencode(params, doseq=True) if params else ""
+        return hashlib.sha256(f"{method.upper()} {url} {query}".encode()).hexdigest()
+
+    def lookup(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, status, headers, body, etag, last_modified, expires_at, elapsed "
+                "FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        url, status, headers, body, etag, last_modified, expires_at, elapsed = row
+        return CacheEntry(key, url, status, json.loads(headers), zlib.decompress(body), etag, last_modified, expires_at, elapsed)
+
+    def _expiry(self, headers, now: float) -> Optional[float]:
+        """Absolute expiry time, or None when the response must not be stored."""
+        directives = _parse_cache_control(headers.get("Cache-Control"))
+        if "no-store" in directives:
+            return None
+        if "no-cache" in directives:
+            return now
+        max_age = directives.get("max-age")
+        if max_age is not None and max_age.isdigit():
+            age = headers.get("Age", "0")
+            return now + int(max_age) - (int(age) if age.isdigit() else 0)
+        expires = _http_date(headers.get("Expires"))
+        if expires is not None:
+            date = _http_date(headers.get("Date")) or now
+            return now + (expires - date)
+        return now + self.default_ttl
+
+    def store(self, key: str, response: requests.Response) -> bool:
+        """Store a 200 response; returns False when it is not cacheable."""
+        if response.status_code != 200:
+            return False
+        now = time.time()
+        expires_at = self._expiry(response.headers, now)
+        if expires_at is None:
+            return False
+        validators = "ETag" in response.headers or "Last-Modified" in response.headers
+        if expires_at <= now and not validators:
+            return False
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in _DROP_HEADERS}
+        raw = response.content
+        body = zlib.compress(raw, self.compress_level)
+        elapsed = response.elapsed.total_seconds() if response.elapsed else 0.0
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, response.url, response.status_code, json.dumps(headers), body, len(body), len(raw),
+                 headers.get("ETag"), headers.get("Last-Modified"), expires_at, now, now, elapsed),
+            )
+            self._size += len(body) - (old[0] if old else 0)
+            self._stats["stores"] += 1
+            self._evict()
+            self._conn.commit()
+        return True
+
+    def revalidate(self, entry: CacheEntry, response: requests.Response) -> CacheEntry:
+        """Refresh a stale entry from a 304 response and return it."""
+        now = time.time()
+        entry.headers.update({k: v for k, v in response.headers.items() if k.lower() not in _DROP_HEADERS})
+        entry.expires_at = self._expiry(response.headers, now) or now
+        entry.etag = entry.headers.get("ETag", entry.etag)
+        entry.last_modified = entry.headers.get("Last-Modified", entry.last_modified)
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET headers = ?, etag = ?, last_modified = ?, expires_at = ?, last_access = ? "
+                "WHERE key = ?",
+                (json.dumps(entry.headers), entry.etag, entry.last_modified, entry.expires_at, now, entry.key),
+            )
+            self._conn.commit()
+        return entry
+
+    def _evict(self) -> None:
+        while self._size > self.max_size:
+            rows = self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY last_access LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if self._size <= self.max_size:
+                    break
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._size -= size
+                self._stats["evictions"] += 1
+
+    def record(self, event: str, entry: Optional[CacheEntry] = None) -> None:
+        """Count a hit / revalidated / miss event, crediting the bytes and time it saved."""
+        with self._lock:
+            self._stats[event] += 1
+            if entry is not None:
+                self._stats["bytes_saved"] += len(entry.body)
+                if event == "hits":
+                    self._stats["time_saved"] += entry.elapsed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            lookups = self._stats["hits"] + self._stats["revalidated"] + self._stats["misses"]
+            served = self._stats["hits"] + self._stats["revalidated"]
+            return dict(
+                self._stats,
+                entries=count,
+                size=self._size,
+                hit_ratio=round(served / lookups, 4) if lookups else 0.0,
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._size = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        return self.stats()["entries"]
+
+    def __repr__(self) -> str:
+        return f"ResponseCache(path={self.path!r}, size={self._size}, max_size={self.max_size})"
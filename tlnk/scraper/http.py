@@ -1,9 +1,17 @@
 """
 HTTP client.
 """
+import os
+import time
+import hashlib
+import threading
 import requests
-from typing import Optional, Dict, Any
-from ..utils import get_logger, retry, get_default_headers
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Optional, Dict, Any, Callable, Iterable, Iterator, BinaryIO, Union
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from ..utils import get_logger, get_default_headers, RetryPolicy, RetryStats, HostRateLimiter
+from .cache import ResponseCache
 
 logger = get_logger(__name__)
 
@@ -12,10 +20,53 @@ class HttpClientError(Exception):
     pass
 
 
+class FetchResult:
+    """
+    Outcome of one URL in a batch fetch: either a response or the error it raised.
+
+    Usage:
+        for result in results:
+            if result.ok:
+                handle(result.response)
+            else:
+                logger.warning(f"{result.url}: {result.error}")
+    """
+
+    __slots__ = ("url", "response", "error", "retry_stats")
+
+    def __init__(
+        self,
+        url: str,
+        response: Any = None,
+        error: Optional[BaseException] = None,
+        retry_stats: Optional[RetryStats] = None,
+    ):
+        self.url = url
+        self.response = response
+        self.error = error
+        self.retry_stats = retry_stats
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self) -> str:
+        status = "ok" if self.ok else f"error={type(self.error).__name__}"
+        return f"FetchResult(url={self.url!r}, {status})"
+
+
 class HttpClient:
     """
     HTTP client with retry, timeout, and session management.
 
+    Requests are retried by `retry_policy` (default: `max_retries` retries
+    with jittered backoff, honouring Retry-After, never retrying 4xx other
+    than 408/425/429). Per-call counters are attached as
+    `response.retry_stats`; `client.retry_stats` aggregates all calls.
+    An optional `rate_limiter` paces every attempt per host and adapts to
+    429/503 responses and latency. With a `cache`, GET responses are served
+    from / stored in a ResponseCache and stale entries are revalidated.
+
     Usage:
         with HttpClient(base_url="https://api.example.com") as client:
             res = client.get("/products")
@@ -27,12 +78,24 @@ class HttpClient:
         timeout: int = 30,
         max_retries: int = 3,
         headers: Optional[Dict[str, str]] = None,
+        pool_size: int = 10,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[HostRateLimiter] = None,
+        cache: Optional[ResponseCache] = None,
     ):
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.max_retries = max_retries
+        self.retry_policy = retry_policy or RetryPolicy(
+            max_attempts=max_retries + 1, exceptions=(requests.RequestException,)
+        )
+        self.retry_stats = RetryStats()
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self._stats_lock = threading.Lock()
         self._session = requests.Session()
         self._session.headers.update(headers or get_default_headers())
+        self._mount_pool(pool_size)
         logger.info(f"HttpClient initialized (timeout={timeout}, retries={max_retries})")
 
     def _build_url(self, url: str) -> str:
@@ -40,21 +103,289 @@ class HttpClient:
             return url
         return f"{self.base_url}/{url.lstrip('/')}"
 
-    @retry(max_attempts=3, delay=1.0, exceptions=(requests.RequestException,))
-    def get(self, url: str, params: Optional[Dict] = None, **kwargs) -> requests.Response:
+    def _mount_pool(self, pool_size: int) -> None:
+        # requests keeps only 10 connections per host by default; extra threads would block on the pool.
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        for prefix in ("http://", "https://"):
+            old = self._session.adapters.get(prefix)
+            self._session.mount(prefix, adapter)
+            if old is not None:
+                old.close()
+        self.pool_size = pool_size
+
+    def _request(self, method: str, url: str, stats: RetryStats, **kwargs) -> requests.Response:
         full_url = self._build_url(url)
-        logger.info(f"GET {full_url}")
-        response = self._session.get(full_url, params=params, timeout=self.timeout, **kwargs)
-        response.raise_for_status()
+        if self.cache is not None and method == "GET" and not kwargs.get("stream"):
+            return self._cached_request(full_url, stats, **kwargs)
+        return self._send(method, full_url, stats, **kwargs)
+
+    def _send(
+        self,
+        method: str,
+        full_url: str,
+        stats: RetryStats,
+        prepare: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+        handler: Optional[Callable[[requests.Response], Any]] = None,
+        **kwargs,
+    ) -> Any:
+        """
+        Send one request through the rate limiter and retry policy.
+
+        `prepare` may rewrite the request kwargs before each attempt and
+        `handler` replaces the default raise_for_status-and-return step; both
+        run inside the retried attempt (used by download to resume).
+        """
+        limiter = self.rate_limiter
+        host = urlsplit(full_url).netloc
+
+        def attempt() -> Any:
+            if limiter is not None:
+                limiter.acquire(host)
+            status = None
+            start = time.monotonic()
+            latency = None
+            try:
+                logger.info(f"{method} {full_url}")
+                request_kwargs = prepare(kwargs) if prepare is not None else kwargs
+                response = self._session.request(method, full_url, timeout=self.timeout, **request_kwargs)
+                latency = time.monotonic() - start
+                status = response.status_code
+                if handler is not None:
+                    return handler(response)
+                response.raise_for_status()
+                response.retry_stats = stats
+                return response
+            finally:
+                if limiter is not None:
+                    limiter.release(host, status, latency if latency is not None else time.monotonic() - start)
+
+        try:
+            return self.retry_policy.call(attempt, stats)
+        finally:
+            with self._stats_lock:
+                self.retry_stats.merge(stats)
+
+    def _cached_request(self, full_url: str, stats: RetryStats, **kwargs) -> requests.Response:
+        cache = self.cache
+        key = cache.make_key("GET", full_url, kwargs.get("params"))
+        entry = cache.lookup(key)
+        if entry is not None and entry.is_fresh():
+            logger.info(f"GET {full_url} (cached)")
+            cache.record("hits", entry)
+            response = entry.to_response()
+            response.retry_stats = stats
+            return response
+        if entry is not None:
+            kwargs["headers"] = dict(kwargs.get("headers") or {}, **entry.conditional_headers())
+        response = self._send("GET", full_url, stats, **kwargs)
+        if entry is not None and response.status_code == 304:
+            cache.record("revalidated", cache.revalidate(entry, response))
+            cached = entry.to_response()
+            cached.retry_stats = stats
+            return cached
+        cache.record("misses")
+        cache.store(key, response)
         return response
 
-    @retry(max_attempts=3, delay=1.0, exceptions=(requests.RequestException,))
+    def get(self, url: str, params: Optional[Dict] = None, **kwargs) -> requests.Response:
+        return self._request("GET", url, RetryStats(), params=params, **kwargs)
+
     def post(self, url: str, data: Optional[Any] = None, json: Optional[Any] = None, **kwargs) -> requests.Response:
+        return self._request("POST", url, RetryStats(), data=data, json=json, **kwargs)
+
+    def download(
+        self,
+        url: str,
+        dest: Union[str, BinaryIO],
+        chunk_size: int = 1024 * 1024,
+        resume: bool = True,
+        checksum: Optional[str] = None,
+        params: Optional[Dict] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """
+        Stream a GET response to a file path or binary file-like sink.
+
+        The body is written in `chunk_size` pieces and never held in memory.
+        For a path, data goes to `<dest>.part` and is renamed on success; with
+        resume=True an existing .part file (or a retry after a dropped
+        connection) continues with a Range request, restarting from zero if
+        the server ignores it. `checksum` ("sha256:<hex>", or any hashlib
+        algorithm name; bare hex means sha256) is verified incrementally.
+        """
         full_url = self._build_url(url)
-        logger.info(f"POST {full_url}")
-        response = self._session.post(full_url, data=data, json=json, timeout=self.timeout, **kwargs)
-        response.raise_for_status()
-        return response
+        algorithm, expected = None, None
+        if checksum:
+            algorithm, _, expected = checksum.rpartition(":")
+            algorithm = algorithm or "sha256"
+            expected = expected.lower()
+        is_path = isinstance(dest, (str, os.PathLike))
+        part = f"{dest}.part" if is_path else None
+        state = {"written": 0, "start": 0, "hasher": hashlib.new(algorithm) if algorithm else None}
+
+        if is_path and resume and os.path.exists(part):
+            with open(part, "rb") as f:
+                for block in iter(lambda: f.read(chunk_size), b""):
+                    if state["hasher"] is not None:
+                        state["hasher"].update(block)
+                    state["written"] += len(block)
+        elif not is_path:
+            try:
+                state["start"] = dest.tell()
+            except (AttributeError, OSError):
+                pass
+        resumed_from = state["written"]
+
+        def restart() -> None:
+            if not is_path:
+                try:
+                    dest.seek(state["start"])
+                    dest.truncate()
+                except (AttributeError, OSError):
+                    raise HttpClientError("Cannot restart the download: the sink cannot be rewound.")
+            state["written"] = 0
+            state["hasher"] = hashlib.new(algorithm) if algorithm else None
+
+        def prepare(request_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+            headers = dict(request_kwargs.get("headers") or {})
+            # Ranges and checksums refer to the raw file, not a gzip transfer encoding of it.
+            headers["Accept-Encoding"] = "identity"
+            if state["written"] and not resume:
+                restart()
+            if state["written"]:
+                headers["Range"] = f"bytes={state['written']}-"
+            return dict(request_kwargs, headers=headers)
+
+        def handler(response: requests.Response) -> None:
+            try:
+                if response.status_code == 416 and state["written"]:
+                    total = response.headers.get("Content-Range", "").rpartition("/")[2]
+                    if total.isdigit() and int(total) == state["written"]:
+                        return
+                response.raise_for_status()
+                if state["written"] and response.status_code != 206:
+                    logger.warning(f"{full_url} ignored Range; restarting download")
+                    restart()
+                sink = open(part, "ab" if state["written"] else "wb") if is_path else dest
+                try:
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        if not chunk:
+                            continue
+                        sink.write(chunk)
+                        if state["hasher"] is not None:
+                            state["hasher"].update(chunk)
+                        state["written"] += len(chunk)
+                finally:
+                    if is_path:
+                        sink.close()
+            finally:
+                response.close()
+
+        stats = RetryStats()
+        self._send("GET", full_url, stats, prepare=prepare, handler=handler, params=params, stream=True, **kwargs)
+
+        digest = state["hasher"].hexdigest() if state["hasher"] is not None else None
+        if expected and digest != expected:
+            if is_path:
+                os.remove(part)
+            raise HttpClientError(f"Checksum mismatch for {full_url}: expected {expected}, got {digest}")
+        if is_path:
+            os.replace(part, dest)
+        logger.info(f"Downloaded {full_url} ({state['written']} bytes, resumed from {resumed_from})")
+        return {
+            "path": str(dest) if is_path else None,
+            "bytes": state["written"],
+            "resumed_from": resumed_from,
+            "checksum": f"{algorithm}:{digest}" if digest else None,
+            "retries": stats.retries,
+        }
+
+    def stream_json(
+        self,
+        url: str,
+        path: Optional[str] = None,
+        format: str = "auto",
+        params: Optional[Dict] = None,
+        chunk_size: int = 1024 * 1024,
+        **kwargs,
+    ) -> "JsonStream":
+        """
+        GET a large JSON array or NDJSON body and iterate its records as
+        they arrive (see JsonStream). The request is retried like any other;
+        the body is read lazily and never cached.
+
+        Usage:
+            for record in client.stream_json("/export", path="data.items"):
+                ...
+        """
+        from .jsonstream import JsonStream
+        response = self._request("GET", url, RetryStats(), params=params, stream=True, **kwargs)
+        return JsonStream(response, path=path, format=format, chunk_size=chunk_size)
+
+    def _fetch_one(self, url: str, params: Optional[Dict], kwargs: Dict[str, Any]) -> FetchResult:
+        stats = RetryStats()
+        try:
+            response = self._request("GET", url, stats, params=params, **kwargs)
+            return FetchResult(url, response=response, retry_stats=stats)
+        except Exception as e:
+            return FetchResult(url, error=e, retry_stats=stats)
+
+    def fetch_all(
+        self,
+        urls: Iterable[str],
+        workers: int = 8,
+        ordered: bool = False,
+        params: Optional[Dict] = None,
+        **kwargs,
+    ) -> Iterator[FetchResult]:
+        """
+        GET many URLs on a thread pool, yielding a FetchResult per URL.
+
+        With ordered=False results arrive as they complete, so one slow host
+        does not hold up the rest; ordered=True yields in input order. Errors
+        are returned on the result instead of raised. At most 2 * workers URLs
+        are in flight or buffered, so `urls` may be a large generator.
+        """
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        if workers > self.pool_size:
+            self._mount_pool(workers)
+        pending = iter(enumerate(urls))
+        window = workers * 2
+        in_flight: Dict[Any, int] = {}
+        buffered: Dict[int, FetchResult] = {}
+        next_index = 0
+
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tlnk-fetch")
+        try:
+            while True:
+                while len(in_flight) + len(buffered) < window:
+                    item = next(pending, None)
+                    if item is None:
+                        break
+                    index, url = item
+                    in_flight[pool.submit(self._fetch_one, url, params, kwargs)] = index
+                if not in_flight:
+                    break
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    index = in_flight.pop(future)
+                    if ordered:
+                        buffered[index] = future.result()
+                    else:
+                        yield future.result()
+                while next_index in buffered:
+                    yield buffered.pop(next_index)
+                    next_index += 1
+        finally:
+            for future in in_flight:
+                future.cancel()
+            pool.shutdown(wait=True)
+
+    def paginate(self, url: str, **options) -> "Paginator":
+        """Iterate over the records of a paginated JSON API; see Paginator for options."""
+        from .paginate import Paginator
+        return Paginator(self, url, **options)
 
     def set_headers(self, headers: Dict[str, str]) -> None:
         self._session.headers.update(headers)
@@ -0,0 +1,251 @@
+"""
+Compiled JSON path expressions.
+"""
+import functools
+from itertools import islice
+from typing import Optional, Dict, Any, Callable, Iterable, Iterator, List, Tuple
+from ..utils import get_logger
+
+logger = get_logger(__name__)
+
+# What a failed lookup raises: missing key, index out of range, or the wrong container type.
+_MISSING = (KeyError, IndexError, TypeError)
+
+Step = Tuple[str, Any]  # ("key", name) | ("index", n) | ("slice", (start, stop, step)) | ("wild", None)
+
+# Records handed to the generated loop at a time by JsonQuery.extract_many.
+BATCH_SIZE = 4096
+
+
+def _error(expr: str, pos: int, message: str) -> Exception:
+    from .parser import ParserError
+    return ParserError(f"Invalid JSON path {expr!r} at position {pos}: {message}")
+
+
+def _parse_int(text: str) -> Optional[int]:
+    text = text.strip()
+    return int(text) if text else None
+
+
+def parse_path(expr: str) -> List[Step]:
+    """
+    Split a path such as `data.items[*].price.amount` into steps.
+
+    Syntax: `.key` (or a leading `key`), `["key"]` / `['key']` for keys with
+    dots or brackets, `[0]` / `[-1]` list indexes, `[1:10:2]` slices, and
+    `[*]` / `.*` wildcards over list items or dict values. A leading `$` is
+    ignored. Dotted segments are always dict keys, even when numeric.
+    """
+    steps: List[Step] = []
+    pos = 1 if expr.startswith("$") else 0
+    length = len(expr)
+    while pos < length:
+        char = expr[pos]
+        if char == "[":
+            end = expr.find("]", pos)
+            if expr[pos + 1:pos + 2] in ("'", '"'):
+                quote = expr[pos + 1]
+                close = expr.find(quote, pos + 2)
+                if close < 0 or expr[close + 1:close + 2] != "]":
+                    raise _error(expr, pos, "unterminated quoted key")
+                steps.append(("key", expr[pos + 2:close]))
+                pos = close + 2
+                continue
+            if end < 0:
+                raise _error(expr, pos, "missing ']'")
+            inner = expr[pos + 1:end].strip()
+            try:
+                if inner == "*":
+                    steps.append(("wild", None))
+                elif ":" in inner:
+                    parts = inner.split(":")
+                    if len(parts) > 3:
+                        raise ValueError
+                    start, stop, step = (parts + [""])[:3] if len(parts) == 2 else parts
+                    if _parse_int(step) == 0:
+                        raise _error(expr, pos, "slice step cannot be zero")
+                    steps.append(("slice", (_parse_int(start), _parse_int(stop), _parse_int(step))))
+                else:
+                    steps.append(("index", int(inner)))
+            except ValueError:
+                raise _error(expr, pos, f"bad subscript [{inner}]")
+            pos = end + 1
+        elif char == "." or pos == (1 if expr.startswith("$") else 0):
+            start = pos + 1 if char == "." else pos
+            end = start
+            while end < length and expr[end] not in ".[":
+                end += 1
+            name = expr[start:end]
+            if not name:
+                raise _error(expr, pos, "empty key")
+            steps.append(("wild", None) if name == "*" else ("key", name))
+            pos = end
+        else:
+            raise _error(expr, pos, f"unexpected {char!r}")
+    return steps
+
+
+def _subscripts(steps: List[Step]) -> str:
+    return "".join(f"[{value!r}]" for _, value in steps)
+
+
+def _emit(lines: List[str], var: str, steps: List[Step], depth: int, append: str = "append", indent: int = 1) -> None:
+    """Code calling `append` with every match of `steps` under `var`."""
+    pad = "    " * (depth + indent)
+    split = next((i for i, (kind, _) in enumerate(steps) if kind in ("wild", "slice")), len(steps))
+    prefix, rest = steps[:split], steps[split:]
+    if not rest:
+        lines += [f"{pad}try:", f"{pad}    {append}({var}{_subscripts(prefix)})", f"{pad}except _MISSING:", f"{pad}    pass"]
+        return
+    value, item = f"v{depth}", f"w{depth}"
+    if prefix:
+        lines += [f"{pad}try:", f"{pad}    {value} = {var}{_subscripts(prefix)}",
+                  f"{pad}except _MISSING:", f"{pad}    {value} = None"]
+    else:
+        lines.append(f"{pad}{value} = {var}")
+    kind, arg = rest[0]
+    if kind == "wild":
+        source = f"{value}.values() if isinstance({value}, dict) else {value} if isinstance({value}, list) else ()"
+    else:
+        start, stop, step = arg
+        source = f"{value}[{start}:{stop}:{step}] if isinstance({value}, list) else ()"
+    lines.append(f"{pad}for {item} in ({source}):")
+    _emit(lines, item, rest[1:], depth + 1, append, indent)
+
+
+def _compile(name: str, source: str, namespace: Optional[Dict[str, Any]] = None) -> Callable:
+    scope = dict(namespace or {}, _MISSING=_MISSING)
+    exec(compile(source, f"<tlnk.jsonpath {name}>", "exec"), scope)
+    return scope[name]
+
+
+class JsonPath:
+    """
+    A path expression parsed once and compiled to a Python function.
+
+    Paths without wildcards or slices return a single value (`default`
+    when any step is missing, like JsonParser.get); the others return the
+    list of every match, skipping records where a step is missing.
+
+    Usage:
+        price = compile_path("items[*].price.amount")
+        price.find(order)          # [120.0, 99.5]
+        compile_path("user.name").find(data, default="")
+    """
+
+    def __init__(self, expr: str):
+        self.expr = expr
+        self.steps = parse_path(expr)
+        self.multi = any(kind in ("wild", "slice") for kind, _ in self.steps)
+        if self.multi:
+            lines = ["def find(doc, default=None):", "    out = []", "    append = out.append"]
+            _emit(lines, "doc", self.steps, 0)
+            lines.append("    return out")
+        else:
+            lines = [
+                "def find(doc, default=None):",
+                "    try:",
+                f"        return doc{_subscripts(self.steps)}",
+                "    except _MISSING:",
+                "        return default",
+            ]
+        self.source = "\n".join(lines)
+        self.find: Callable[..., Any] = _compile("find", self.source)
+
+    def __repr__(self) -> str:
+        return f"JsonPath({self.expr!r})"
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_path(expr: str) -> JsonPath:
+    """Parse and compile `expr` once; repeated calls return the cached JsonPath."""
+    return JsonPath(expr)
+
+
+class JsonQuery:
+    """
+    Extract many fields from many JSON records with one generated loop.
+
+    `fields` maps output names to paths evaluated against each record;
+    `records` optionally points at the list of records inside each
+    document (e.g. "data.items"), otherwise each document is one record.
+    Every field is inlined into one loop compiled for the query, so the
+    per-record cost is the dict lookups themselves rather than a Python
+    call per field; multi-valued (wildcard) fields yield lists.
+
+    Usage:
+        query = JsonQuery({"id": "id", "price": "price.amount", "tags": "tags[*].name"},
+                          records="data.items")
+        rows = query.extract(response.json())
+        columns = query.columns(records)         # {"id": [...], "price": [...], ...}
+    """
+
+    def __init__(self, fields: Dict[str, str], records: Optional[str] = None, default: Any = None):
+        if not fields:
+            raise ValueError("A JSON query needs at least one field.")
+        self.fields = dict(fields)
+        self.records = compile_path(records) if records is not None else None
+        self.default = default
+        paths = [compile_path(expr) for expr in self.fields.values()]
+        loads: List[str] = []
+        for i, path in enumerate(paths):
+            if path.multi:
+                loads.append(f"f{i} = []")
+                _emit(loads, "doc", path.steps, 0, append=f"f{i}.append", indent=0)
+            else:
+                loads += ["try:", f"    f{i} = doc{_subscripts(path.steps)}", "except _MISSING:", f"    f{i} = default"]
+        names = list(self.fields)
+        body = [f"        {line}" for line in loads]
+        row = ", ".join(f"{name!r}: f{i}" for i, name in enumerate(names))
+        self._rows = _compile("rows", "\n".join([
+            "def rows(records, default):",
+            "    out = []",
+            "    append = out.append",
+            "    for doc in records:",
+            *body,
+            f"        append({{{row}}})",
+            "    return out",
+        ]))
+        self._columns = _compile("columns", "\n".join([
+            "def columns(records, default, cols):",
+            *[f"    a{i} = cols[{i}].append" for i in range(len(names))],
+            "    for doc in records:",
+            *body,
+            *[f"        a{i}(f{i})" for i in range(len(names))],
+        ]))
+
+    def _records(self, document: Any) -> List[Any]:
+        if self.records is None:
+            return [document]
+        found = self.records.find(document)
+        return found if isinstance(found, list) else []
+
+    def extract(self, document: Any) -> List[Dict[str, Any]]:
+        """One row per record of `document`."""
+        return self._rows(self._records(document), self.default)
+
+    def extract_many(self, documents: Iterable[Any]) -> Iterator[Dict[str, Any]]:
+        """Rows of every document, in order; documents are processed in batches."""
+        if self.records is not None:
+            for document in documents:
+                yield from self.extract(document)
+            return
+        documents = iter(documents)
+        while True:
+            batch = list(islice(documents, BATCH_SIZE))
+            if not batch:
+                return
+            yield from self._rows(batch, self.default)
+
+    def columns(self, documents: Iterable[Any]) -> Dict[str, List[Any]]:
+        """Field name -> list of values over the records of every document."""
+        cols: List[List[Any]] = [[] for _ in self.fields]
+        if self.records is None:
+            self._columns(documents, self.default, cols)
+        else:
+            for document in documents:
+                self._columns(self._records(document), self.default, cols)
+        return dict(zip(self.fields, cols))
+
+    def __repr__(self) -> str:
+        return f"JsonQuery(fields={list(self.fields)}, records={self.records.expr if self.records else None!r})"
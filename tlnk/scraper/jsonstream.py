@@ -0,0 +1,325 @@
+"""
+Incremental JSON / NDJSON record streams.
+"""
+import os
+import re
+import codecs
+import json
+from itertools import islice
+from typing import Optional, Any, Iterable, Iterator, List, Tuple, Union
+from ..utils import get_logger
+from .jsonpath import parse_path
+from .parser import ParserError
+
+logger = get_logger(__name__)
+
+FORMATS = ("auto", "ndjson", "array")
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRUCTURE = re.compile(r'["\[\]{}]')
+_STRING_TAIL = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+_NUMBER_CHARS = re.compile(r"[0-9.eE+-]*")
+
+
+class _Cursor:
+    """A read position over decoded text chunks; consumed text is dropped as it goes."""
+
+    __slots__ = ("chunks", "buf", "pos", "eof", "limit")
+
+    def __init__(self, chunks: Iterator[str], limit: int):
+        self.chunks = chunks
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.limit = limit
+
+    def more(self, grow: bool = False) -> bool:
+        """
+        Append the next chunk, dropping consumed text. With grow=True keep
+        reading until the unread text has doubled, so a record spanning
+        many chunks is re-scanned a logarithmic number of times.
+        """
+        if self.eof:
+            return False
+        rest = self.buf[self.pos:]
+        if grow and len(rest) > self.limit:
+            raise ParserError(f"JSON record larger than max_record_size ({self.limit} characters)")
+        wanted = max(len(rest), 1) if grow else 1
+        parts = [rest]
+        added = 0
+        while added < wanted:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                self.eof = True
+                break
+            parts.append(chunk)
+            added += len(chunk)
+        self.buf = "".join(parts)
+        self.pos = 0
+        return added > 0
+
+    def peek(self) -> str:
+        """The next non-whitespace character (the cursor stops on it), or "" at the end."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.more():
+                return ""
+
+    def expect(self, char: str) -> bool:
+        if self.peek() != char:
+            return False
+        self.pos += 1
+        return True
+
+    def value(self, decode: Any) -> Any:
+        """Decode the value at the cursor, reading more text while it is cut off."""
+        self.peek()
+        while True:
+            try:
+                value, end = decode(self.buf, self.pos)
+            except json.JSONDecodeError as e:
+                if self.more(grow=True):
+                    continue
+                raise ParserError(f"Invalid JSON: {e}")
+            # A number running to the end of the buffer ("12", "2.") may continue in the next chunk.
+            if (not self.eof and self.buf[self.pos] in "-0123456789"
+                    and _NUMBER_CHARS.match(self.buf, end).end() == len(self.buf) and self.more(grow=True)):
+                continue
+            self.pos = end
+            return value
+
+    def skip(self, decode: Any) -> None:
+        """Move past the value at the cursor without building containers."""
+        char = self.peek()
+        if char not in ("[", "{"):
+            self.value(decode)
+            return
+        depth = 0
+        i = self.pos
+        while True:
+            found = _STRUCTURE.search(self.buf, i)
+            if found is None:
+                self.pos = i = len(self.buf)
+                if not self.more():
+                    raise ParserError("Invalid JSON: unexpected end of data")
+                i = self.pos
+                continue
+            i = found.end()
+            char = found.group()
+            if char == '"':
+                tail = _STRING_TAIL.match(self.buf, i)
+                while tail is None:
+                    # Keep the opening quote in the buffer and retry once more text has arrived.
+                    self.pos = i - 1
+                    if not self.more(grow=True):
+                        raise ParserError("Invalid JSON: unterminated string")
+                    i = self.pos + 1
+                    tail = _STRING_TAIL.match(self.buf, i)
+                i = tail.end()
+            elif char in "[{":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    self.pos = i
+                    return
+
+
+def _text_chunks(blocks: Iterable[Union[str, bytes]]) -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    for block in blocks:
+        if isinstance(block, str):
+            yield block
+        elif block:
+            text = decoder.decode(block)
+            if text:
+                yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+class JsonStream:
+    """
+    Yield the records of a large JSON document one at a time.
+
+    `source` is a streamed requests Response (see HttpClient.stream_json),
+    a file path, a file object, bytes, or an iterable of str/bytes chunks.
+    format="ndjson" reads one JSON value per line (blank lines are
+    skipped); format="array" yields the items of the array at `path`
+    ("data.items", "results[0].rows"), or of the top-level array without
+    one. "auto" reads an array when `path` is given or the document starts
+    with "[", and NDJSON otherwise.
+
+    Only the record being decoded and one chunk are held in memory;
+    siblings of the array on the way to `path` are skipped without being
+    decoded. A record longer than `max_record_size` characters raises
+    ParserError. Records are the plain dicts `response.json()` would have
+    produced, ready for JsonQuery.extract_many, DataCleaner (in `batches`)
+    or DataConverter.
+
+    Usage:
+        stream = client.stream_json("/export", path="data.items")
+        for record in stream:
+            ...
+        for batch in JsonStream("export.ndjson").batches(10000):
+            DataCleaner(batch).drop_nulls(["id"]).to_list()
+    """
+
+    def __init__(
+        self,
+        source: Any,
+        path: Optional[str] = None,
+        format: str = "auto",
+        chunk_size: int = 1024 * 1024,
+        max_record_size: int = 256 * 1024 * 1024,
+    ):
+        if format not in FORMATS:
+            raise ValueError(f"Unknown format: {format!r}. Use: {list(FORMATS)}")
+        if format == "ndjson" and path is not None:
+            raise ValueError("path= selects an array inside one JSON document; it does not apply to NDJSON.")
+        self.source = source
+        self.path = path
+        self.format = format
+        self.chunk_size = chunk_size
+        self.max_record_size = max_record_size
+        self.steps = self._steps(path)
+        self.count = 0
+        self._consumed = False
+
+    @staticmethod
+    def _steps(path: Optional[str]) -> List[Tuple[str, Any]]:
+        if path is None:
+            return []
+        steps = parse_path(path)
+        if steps and steps[-1][0] == "wild":
+            steps = steps[:-1]  # "data.items[*]" names the same records as "data.items"
+        for kind, arg in steps:
+            if kind not in ("key", "index") or (kind == "index" and arg < 0):
+                raise ParserError(f"Stream path {path!r} may only use keys and non-negative indexes")
+        return steps
+
+    def _blocks(self) -> Tuple[Iterable[Union[str, bytes]], Any]:
+        """Raw chunks of the source and the object to close when done (if any)."""
+        source, size = self.source, self.chunk_size
+        if isinstance(source, (str, os.PathLike)):
+            f = open(source, "rb")
+            return iter(lambda: f.read(size), b""), f
+        if self._consumed:
+            raise ParserError("This JSON stream has already been consumed.")
+        self._consumed = True
+        if isinstance(source, (bytes, bytearray)):
+            return [bytes(source)], None
+        if hasattr(source, "iter_content"):
+            return source.iter_content(chunk_size=size), source
+        if hasattr(source, "read"):
+            return iter(lambda: source.read(size), source.read(0)), None
+        return source, None
+
+    def __iter__(self) -> Iterator[Any]:
+        blocks, closing = self._blocks()
+        try:
+            cursor = _Cursor(_text_chunks(blocks), self.max_record_size)
+            fmt = self.format
+            if fmt == "auto":
+                fmt = "array" if self.steps or cursor.peek() == "[" else "ndjson"
+            records = self._lines(cursor) if fmt == "ndjson" else self._array(cursor)
+            for record in records:
+                self.count += 1
+                yield record
+        finally:
+            if closing is not None:
+                closing.close()
+
+    def _lines(self, cursor: _Cursor) -> Iterator[Any]:
+        loads = json.loads
+        number = 0
+        while True:
+            end = cursor.buf.find("\n", cursor.pos)
+            if end < 0:
+                if cursor.more(grow=True):
+                    continue
+                end = len(cursor.buf)
+                if cursor.pos >= end:
+                    return
+            line = cursor.buf[cursor.pos:end]
+            cursor.pos = end + 1
+            number += 1
+            if not line.strip():
+                continue
+            try:
+                yield loads(line)
+            except json.JSONDecodeError as e:
+                raise ParserError(f"Invalid JSON on line {number}: {e}")
+
+    def _array(self, cursor: _Cursor) -> Iterator[Any]:
+        decode = json.JSONDecoder().raw_decode
+        for kind, arg in self.steps:
+            if not self._descend(cursor, decode, kind, arg):
+                logger.warning(f"No array at {self.path!r} in the JSON stream")
+                return
+        if not cursor.expect("["):
+            logger.warning(f"No array at {self.path or 'the top level'!r} in the JSON stream")
+            return
+        if cursor.expect("]"):
+            return
+        while True:
+            yield cursor.value(decode)
+            if cursor.expect(","):
+                continue
+            if cursor.expect("]"):
+                return
+            raise ParserError(f"Invalid JSON: expected ',' or ']' after record {self.count}")
+
+    @staticmethod
+    def _descend(cursor: _Cursor, decode: Any, kind: str, arg: Any) -> bool:
+        """Move the cursor onto the value of one path step; False when it is missing."""
+        close = "}" if kind == "key" else "]"
+        if not cursor.expect("{" if kind == "key" else "["):
+            return False
+        if cursor.expect(close):
+            return False
+        index = 0
+        while True:
+            if kind == "key":
+                key = cursor.value(decode)
+                if not cursor.expect(":"):
+                    raise ParserError("Invalid JSON: expected ':' after an object key")
+                if key == arg:
+                    return True
+            elif index == arg:
+                return True
+            cursor.skip(decode)
+            index += 1
+            if cursor.expect(","):
+                continue
+            if cursor.expect(close):
+                return False
+            raise ParserError(f"Invalid JSON: expected ',' or '{close}'")
+
+    def batches(self, size: int = 10000) -> Iterator[List[Any]]:
+        """Records in lists of at most `size`, e.g. one DataCleaner per batch."""
+        if size < 1:
+            raise ValueError("size must be >= 1")
+        records = iter(self)
+        while True:
+            batch = list(islice(records, size))
+            if not batch:
+                return
+            yield batch
+
+    def close(self) -> None:
+        """Release an unread Response or file object."""
+        if hasattr(self.source, "close") and not isinstance(self.source, (str, bytes, os.PathLike)):
+            self.source.close()
+
+    def __enter__(self) -> "JsonStream":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"JsonStream(path={self.path!r}, format={self.format!r}, records={self.count})"
@@ -0,0 +1,217 @@
+"""
+Pagination over JSON APIs.
+"""
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Iterator, Sequence, Tuple, Union
+import requests
+from ..utils import get_logger
+from .parser import JsonParser
+
+logger = get_logger(__name__)
+
+STRATEGIES = ("page", "offset", "cursor", "link")
+
+KeyPath = Union[str, Sequence[Any]]
+
+
+def _keys(path: Optional[KeyPath]) -> Tuple[Any, ...]:
+    if path is None:
+        return ()
+    if isinstance(path, str):
+        return tuple(path.split("."))
+    return tuple(path)
+
+
+class Paginator:
+    """
+    Iterate lazily over the records of a paginated JSON API.
+
+    Strategies:
+        "page"   - ?page=1,2,... (`page_param`, `start_page`, optional `size_param`)
+        "offset" - ?offset=0,N,2N... with ?limit=N (`offset_param`, `limit_param`)
+        "cursor" - ?cursor=<value at `cursor_path` in the previous page>
+        "link"   - follow the Link: rel="next" header, or the URL at `next_path`
+
+    Records are read from `records` (a dotted path or key tuple, as for
+    JsonParser.get); without it each page must be a list. While the caller
+    consumes page N, page N+1 is already being fetched. For page/offset APIs
+    that report `total_path` (record count) or `page_count_path`, the
+    remaining pages are fetched in parallel with `workers` threads and still
+    yielded in order.
+
+    Usage:
+        pages = Paginator(client, "/products", records="data.items",
+                          page_size=100, size_param="per_page", total_path="meta.total")
+        for record in pages:
+            ...
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        url: str,
+        strategy: str = "page",
+        records: Optional[KeyPath] = None,
+        params: Optional[Dict[str, Any]] = None,
+        page_size: Optional[int] = None,
+        page_param: str = "page",
+        size_param: Optional[str] = None,
+        start_page: int = 1,
+        offset_param: str = "offset",
+        limit_param: str = "limit",
+        cursor_param: str = "cursor",
+        cursor_path: Optional[KeyPath] = None,
+        next_path: Optional[KeyPath] = None,
+        total_path: Optional[KeyPath] = None,
+        page_count_path: Optional[KeyPath] = None,
+        max_pages: Optional[int] = None,
+        prefetch: bool = True,
+        workers: int = 4,
+    ):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy: {strategy!r}. Use: {list(STRATEGIES)}")
+        if strategy == "offset" and not page_size:
+            raise ValueError("The offset strategy requires page_size.")
+        if strategy == "cursor" and cursor_path is None:
+            raise ValueError("The cursor strategy requires cursor_path.")
+        self.client = client
+        self.url = url
+        self.strategy = strategy
+        self.records_path = _keys(records)
+        self.params = dict(params or {})
+        self.page_size = page_size
+        self.page_param = page_param
+        self.size_param = size_param
+        self.start_page = start_page
+        self.offset_param = offset_param
+        self.limit_param = limit_param
+        self.cursor_param = cursor_param
+        self.cursor_path = _keys(cursor_path)
+        self.next_path = _keys(next_path)
+        self.total_path = _keys(total_path)
+        self.page_count_path = _keys(page_count_path)
+        self.max_pages = max_pages
+        self.prefetch = prefetch
+        self.workers = workers
+        self.pages_fetched = 0
+
+    def _fetch(self, url: str, params: Optional[Dict[str, Any]]) -> Tuple[Any, requests.Response]:
+        response = self.client.get(url, params=params)
+        self.pages_fetched += 1
+        return response.json(), response
+
+    def records(self, page: Any) -> list:
+        """Records contained in one page of data."""
+        found = JsonParser(page).get(*self.records_path) if self.records_path else page
+        return found if isinstance(found, list) else []
+
+    def _page_params(self, index: int) -> Dict[str, Any]:
+        params = dict(self.params)
+        if self.strategy == "page":
+            params[self.page_param] = self.start_page + index
+            if self.size_param and self.page_size:
+                params[self.size_param] = self.page_size
+        else:
+            params[self.offset_param] = index * self.page_size
+            params[self.limit_param] = self.page_size
+        return params
+
+    def _total_pages(self, page: Any) -> Optional[int]:
+        parser = JsonParser(page)
+        if self.page_count_path:
+            count = parser.get(*self.page_count_path)
+            return int(count) if isinstance(count, (int, float)) else None
+        if self.total_path and self.page_size:
+            total = parser.get(*self.total_path)
+            return math.ceil(total / self.page_size) if isinstance(total, (int, float)) else None
+        return None
+
+    def _page_url(self, index: int) -> str:
+        full_url = self.client._build_url(self.url)
+        return requests.Request("GET", full_url, params=self._page_params(index)).prepare().url
+
+    def _next_link(self, page: Any, response: requests.Response) -> Optional[Tuple[str, Optional[Dict[str, Any]]]]:
+        if self.strategy == "cursor":
+            cursor = JsonParser(page).get(*self.cursor_path)
+            if cursor in (None, ""):
+                return None
+            return self.url, dict(self.params, **{self.cursor_param: cursor})
+        if self.next_path:
+            url = JsonParser(page).get(*self.next_path)
+        else:
+            url = response.links.get("next", {}).get("url")
+        return (url, None) if url else None
+
+    def pages(self) -> Iterator[Any]:
+        """Yield the decoded JSON of each page in order."""
+        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tlnk-prefetch")
+        if self.strategy in ("page", "offset"):
+            pages = self._numbered_pages(pool)
+        else:
+            pages = self._linked_pages(pool)
+        future = None
+        try:
+            for page, future in pages:
+                yield page
+        finally:
+            if future is not None:
+                future.cancel()
+            pages.close()
+            pool.shutdown(wait=True)
+
+    def _numbered_pages(self, pool: ThreadPoolExecutor) -> Iterator[Tuple[Any, Any]]:
+        page, _ = self._fetch(self.url, self._page_params(0))
+        total_pages = self._total_pages(page)
+        if self.max_pages is not None:
+            total_pages = min(total_pages, self.max_pages) if total_pages is not None else None
+        if total_pages is not None and self.workers > 1:
+            logger.info(f"Fetching {total_pages} pages of {self.url} with {self.workers} workers")
+            yield page, None
+            urls = (self._page_url(index) for index in range(1, total_pages))
+            for result in self.client.fetch_all(urls, workers=self.workers, ordered=True):
+                if not result.ok:
+                    raise result.error
+                self.pages_fetched += 1
+                yield result.response.json(), None
+            return
+
+        index = 0
+        while True:
+            count = len(self.records(page))
+            has_more = count > 0 and (self.page_size is None or count >= self.page_size)
+            if total_pages is not None:
+                has_more = has_more and index + 1 < total_pages
+            elif self.max_pages is not None:
+                has_more = has_more and index + 1 < self.max_pages
+            future = None
+            if has_more and self.prefetch:
+                future = pool.submit(self._fetch, self.url, self._page_params(index + 1))
+            yield page, future
+            if not has_more:
+                return
+            index += 1
+            page, _ = future.result() if future is not None else self._fetch(self.url, self._page_params(index))
+
+    def _linked_pages(self, pool: ThreadPoolExecutor) -> Iterator[Tuple[Any, Any]]:
+        page, response = self._fetch(self.url, self.params)
+        index = 0
+        while True:
+            link = self._next_link(page, response)
+            if self.max_pages is not None and index + 1 >= self.max_pages:
+                link = None
+            future = None
+            if link is not None and self.prefetch:
+                future = pool.submit(self._fetch, *link)
+            yield page, future
+            if link is None:
+                return
+            index += 1
+            page, response = future.result() if future is not None else self._fetch(*link)
+
+    def __iter__(self) -> Iterator[Any]:
+        for page in self.pages():
+            yield from self.records(page)
+
+    def __repr__(self) -> str:
+        return f"Paginator(url={self.url!r}, strategy={self.strategy!r}, pages_fetched={self.pages_fetched})"
@@ -1,8 +1,12 @@
 """
 HTML/JSON parser.
 """
-from typing import Optional, List, Dict, Any
+import re
+from fnmatch import translate
+from typing import Optional, List, Dict, Any, Callable, Iterable, Iterator, Tuple, Union
 from ..utils import get_logger
+from .backends import create_backend, fallback_backend, selector_scopes
+from .table import Table
 
 logger = get_logger(__name__)
 
@@ -11,50 +15,120 @@ class ParserError(Exception):
     pass
 
 
+def _glob(patterns: Optional[List[str]]) -> Optional[Callable[[str], Any]]:
+    if not patterns:
+        return None
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    return re.compile("|".join(translate(pattern) for pattern in patterns)).match
+
+
 class HtmlParser:
     """
-    Parse HTML content using BeautifulSoup.
+    Parse HTML content with the fastest installed backend.
+
+    backend="auto" picks native lxml (with cssselect) when installed, then
+    BeautifulSoup with the lxml tree builder, then BeautifulSoup's
+    "html.parser". Pass backend="bs4" to force the pure-Python builder.
+    Results are the same across backends for well-formed HTML; on broken
+    markup each parser repairs the tree its own way. With "auto", a
+    selector lxml cannot run (`:root`, `:-soup-contains(...)`) reparses
+    the document with BeautifulSoup, which then serves every query.
+
+    `only` declares the selectors that will be queried. The tree then keeps
+    only the subtrees their leftmost compound (`div.product` in
+    `div.product > .price`) matches, which cuts parse time and memory on
+    large pages; other selectors find nothing. Selectors that cannot be
+    scoped this way (sibling combinators or pseudo-classes in the leftmost
+    compound) make the parser fall back to the full tree.
 
     Usage:
         parser = HtmlParser(html)
         title = parser.find_text("h1")
         rows  = parser.find_table("table")
+        cols  = parser.find_table_columns("table#prices")   # {"SKU": [...], ...}
+        for row in parser.iter_table("table#prices"):        # lazily, one dict per row
+            ...
+
+        parser = HtmlParser(html, only=["div.product", "table.specs"])
     """
 
-    def __init__(self, html: str):
+    def __init__(self, html: str, backend: str = "auto", only: Optional[List[str]] = None):
         if not html or not html.strip():
             raise ParserError("HTML content cannot be empty.")
+        scopes = selector_scopes([only] if isinstance(only, str) else only) if only else None
+        if only and scopes is None:
+            logger.debug(f"Selectors {only!r} cannot restrict the tree; parsing the whole document")
+        self.partial = scopes is not None
+        self._backend = create_backend(html, backend, scopes=scopes)
+        # Kept for _fall_back while the tree is lxml picked by "auto".
+        self._source = (html, scopes) if backend == "auto" and self._backend.name == "lxml" else None
+
+    @property
+    def backend(self) -> str:
+        return self._backend.name
+
+    def _fall_back(self) -> bool:
+        """Reparse an "auto" lxml tree with BeautifulSoup; False when that is not possible."""
+        name = fallback_backend() if self._source is not None else None
+        if name is None:
+            return False
+        html, scopes = self._source
+        logger.debug(f"Selector not supported by lxml; reparsing with the {name!r} backend")
+        self._backend = create_backend(html, name, scopes=scopes)
+        self._source = None
+        return True
+
+    def _select(self, selector: str) -> List[Any]:
+        try:
+            return self._backend.select(selector)
+        except ParserError:
+            if not self._fall_back():
+                raise
+            return self._backend.select(selector)
+
+    def _select_one(self, selector: str) -> Any:
         try:
-            from bs4 import BeautifulSoup
-            self._soup = BeautifulSoup(html, "html.parser")
-        except ImportError:
-            raise ImportError("beautifulsoup4 is required. Run: pip install beautifulsoup4")
+            return self._backend.select_one(selector)
+        except ParserError:
+            if not self._fall_back():
+                raise
+            return self._backend.select_one(selector)
 
     def find_text(self, selector: str) -> Optional[str]:
-        el = self._soup.select_one(selector)
-        return el.get_text(strip=True) if el else None
+        el = self._select_one(selector)
+        return self._backend.text(el) if el is not None else None
 
     def find_all_text(self, selector: str) -> List[str]:
-        return [el.get_text(strip=True) for el in self._soup.select(selector)]
+        elements = self._select(selector)
+        text = self._backend.text
+        return [text(el) for el in elements]
 
     def find_attr(self, selector: str, attr: str) -> Optional[str]:
-        el = self._soup.select_one(selector)
-        return el.get(attr) if el else None
+        el = self._select_one(selector)
+        return self._backend.attr(el, attr) if el is not None else None
 
     def find_all_attr(self, selector: str, attr: str) -> List[str]:
-        return [el.get(attr) for el in self._soup.select(selector) if el.get(attr)]
-
-    def find_table(self, selector: str = "table") -> List[Dict[str, str]]:
-        table = self._soup.select_one(selector)
-        if not table:
-            return []
-        headers = [th.get_text(strip=True) for th in table.select("th")]
-        rows = []
-        for tr in table.select("tr"):
-            cells = [td.get_text(strip=True) for td in tr.select("td")]
-            if cells and headers:
-                rows.append(dict(zip(headers, cells)))
-        return rows
+        elements = self._select(selector)
+        get = self._backend.attr
+        values = (get(el, attr) for el in elements)
+        return [value for value in values if value]
+
+    def table(self, selector: str = "table", headers: Optional[List[str]] = None) -> Optional[Table]:
+        """The first table matching `selector` (see Table), or None."""
+        node = self._select_one(selector)
+        return Table(self._backend, node, headers=headers) if node is not None else None
+
+    def find_table(self, selector: str = "table", headers: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        return list(self.iter_table(selector, headers))
+
+    def iter_table(self, selector: str = "table", headers: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        table = self.table(selector, headers)
+        return table.rows() if table is not None else iter(())
+
+    def find_table_columns(self, selector: str = "table", headers: Optional[List[str]] = None) -> Dict[str, List[Any]]:
+        table = self.table(selector, headers)
+        return table.columns() if table is not None else {}
 
     def __repr__(self) -> str:
         title = self.find_text("title") or "untitled"
@@ -68,6 +142,8 @@ class JsonParser:
     Usage:
         parser = JsonParser(data)
         name  = parser.get("user", "name")
+        price = parser.query("items[*].price.amount")
+        rows  = parser.extract({"id": "id", "price": "price.amount"}, records="items")
         flat  = parser.flatten()
     """
 
@@ -85,21 +161,110 @@ class JsonParser:
                 return default
         return result
 
-    def flatten(self, sep: str = ".") -> Dict[str, Any]:
-        def _flatten(obj, prefix=""):
-            items = {}
-            if isinstance(obj, dict):
-                for k, v in obj.items():
-                    new_key = f"{prefix}{sep}{k}" if prefix else k
-                    items.update(_flatten(v, new_key))
-            elif isinstance(obj, list):
-                for i, v in enumerate(obj):
-                    new_key = f"{prefix}{sep}{i}" if prefix else str(i)
-                    items.update(_flatten(v, new_key))
+    def query(self, path: str, default: Any = None) -> Any:
+        """
+        Evaluate a compiled path such as "items[*].price.amount" (see
+        JsonPath); wildcard and slice paths return a list of matches.
+        """
+        from .jsonpath import compile_path
+        return compile_path(path).find(self._data, default)
+
+    def extract(self, fields: Dict[str, str], records: Optional[str] = None, default: Any = None) -> List[Dict[str, Any]]:
+        """Rows of `fields` paths over the list at `records` (or the data itself); see JsonQuery."""
+        from .jsonpath import JsonQuery
+        return JsonQuery(fields, records=records, default=default).extract(self._data)
+
+    def iter_flatten(
+        self,
+        sep: str = ".",
+        max_depth: Optional[int] = None,
+        expand_lists: bool = True,
+        include: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None,
+    ) -> Iterator[Tuple[str, Any]]:
+        """
+        Yield (key, value) leaf pairs lazily, depth-first, without recursion.
+
+        `max_depth` limits how many levels are expanded (1 keeps top-level
+        values whole); `expand_lists=False` keeps lists as values. `include`
+        and `exclude` are glob patterns ("user.*", "meta") matched against
+        the flattened key; an excluded container is skipped with everything
+        under it. Empty dicts and lists produce no keys.
+        """
+        if max_depth is not None and max_depth < 1:
+            raise ValueError("max_depth must be >= 1")
+        wanted = _glob(include)
+        skipped = _glob(exclude)
+        data = self._data
+        if isinstance(data, dict):
+            top = iter(data.items())
+        elif expand_lists and isinstance(data, list):
+            top = ((str(i), v) for i, v in enumerate(data))
+        else:
+            if wanted is None or wanted(""):
+                yield "", data
+            return
+        # Frames of (key prefix, child iterator, depth of the children).
+        stack = [("", top, 1)]
+        push = stack.append
+        while stack:
+            prefix, entries, depth = stack[-1]
+            expand = max_depth is None or depth < max_depth
+            for k, v in entries:
+                key = f"{prefix}{sep}{k}" if prefix else k
+                if skipped is not None and skipped(key):
+                    continue
+                if expand:
+                    if isinstance(v, dict):
+                        push((key, iter(v.items()), depth + 1))
+                        break
+                    if expand_lists and isinstance(v, list):
+                        push((key, enumerate(v), depth + 1))
+                        break
+                if wanted is None or wanted(key):
+                    yield key, v
             else:
-                items[prefix] = obj
-            return items
-        return _flatten(self._data)
+                stack.pop()
+
+    def flatten(
+        self,
+        sep: str = ".",
+        max_depth: Optional[int] = None,
+        expand_lists: bool = True,
+        include: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        return dict(self.iter_flatten(sep, max_depth, expand_lists, include, exclude))
+
+    @staticmethod
+    def unflatten(flat: Union[Dict[str, Any], Iterable[Tuple[str, Any]]], sep: str = ".") -> Any:
+        """
+        Rebuild nested data from flattened (key, value) pairs, turning
+        containers keyed "0".."n-1" back into lists. Keys that themselves
+        contain `sep` cannot be told apart from nesting.
+        """
+        root: Dict[str, Any] = {}
+        created: List[Tuple[Optional[Dict[str, Any]], Any, Dict[str, Any]]] = [(None, None, root)]
+        owned = {id(root)}
+        for key, value in (flat.items() if isinstance(flat, dict) else flat):
+            parts = key.split(sep) if isinstance(key, str) else [key]
+            node = root
+            for part in parts[:-1]:
+                child = node.get(part)
+                if id(child) not in owned:
+                    # Missing, a leaf value, or a dict value kept whole by max_depth (copied, never mutated).
+                    child = node[part] = dict(child) if isinstance(child, dict) else {}
+                    created.append((node, part, child))
+                    owned.add(id(child))
+                node = child
+            node[parts[-1]] = value
+        for parent, part, node in reversed(created):
+            if node and all(k == str(i) for i, k in enumerate(node)):
+                items = list(node.values())
+                if parent is None:
+                    return items
+                parent[part] = items
+        return root
 
     def keys(self) -> List[str]:
         return list(self._data.keys()) if isinstance(self._data, dict) else []
@@ -0,0 +1,172 @@
+"""
+Multi-process HTML extraction.
+"""
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Optional, Dict, Any, Iterable, Iterator, List, Tuple, Union
+from ..utils import default_workers, get_logger
+from .schema import ExtractionSchema
+
+logger = get_logger(__name__)
+
+Document = Union[str, bytes]
+
+# Set in each worker process by _init_worker.
+_worker_schema: Optional[ExtractionSchema] = None
+_worker_backend = "auto"
+
+
+class ParseResult:
+    """Rows extracted from the document at `index`, or the error it raised."""
+
+    __slots__ = ("index", "rows", "error")
+
+    def __init__(self, index: int, rows: Optional[List[Dict[str, Any]]] = None, error: Optional[Exception] = None):
+        self.index = index
+        self.rows = rows
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self) -> str:
+        if self.error is not None:
+            return f"ParseResult(index={self.index}, error={self.error!r})"
+        return f"ParseResult(index={self.index}, rows={len(self.rows)})"
+
+
+def _init_worker(schema: ExtractionSchema, backend: str) -> None:
+    global _worker_schema, _worker_backend
+    _worker_schema, _worker_backend = schema, backend
+
+
+def _extract_chunk(chunk: List[Tuple[int, Document]]) -> List[ParseResult]:
+    results = []
+    for index, document in chunk:
+        try:
+            results.append(ParseResult(index, _worker_schema.extract(document, backend=_worker_backend)))
+        except Exception as e:
+            results.append(ParseResult(index, error=e))
+    return results
+
+
+class ParsePool:
+    """
+    Extract rows from many HTML documents on a pool of worker processes.
+
+    Parsing holds the GIL, so threads cannot use more than one core; each
+    worker process here parses with its own interpreter. The schema is sent
+    to every worker once at start-up and documents travel in chunks of
+    `chunksize`, so per-document IPC is a single pickled string each way.
+    At most 2 * workers chunks are in flight or buffered, so `documents`
+    may be a large generator. The pool is reusable across batches; close it
+    (or use it as a context manager) when done.
+
+    Usage:
+        with ParsePool(schema, workers=4) as pool:
+            for row in pool.extract(pages):
+                ...
+    """
+
+    def __init__(
+        self,
+        schema: ExtractionSchema,
+        workers: Optional[int] = None,
+        chunksize: int = 8,
+        backend: str = "auto",
+    ):
+        if chunksize < 1:
+            raise ValueError("chunksize must be >= 1")
+        self.schema = schema
+        self.workers = workers or default_workers()
+        if self.workers < 1:
+            raise ValueError("workers must be >= 1")
+        self.chunksize = chunksize
+        self.backend = backend
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_worker, initargs=(schema, backend)
+        )
+        logger.info(f"ParsePool started ({self.workers} workers, chunksize={chunksize})")
+
+    def _chunks(self, documents: Iterable[Document]) -> Iterator[List[Tuple[int, Document]]]:
+        chunk = []
+        for item in enumerate(documents):
+            chunk.append(item)
+            if len(chunk) == self.chunksize:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def map(self, documents: Iterable[Document], ordered: bool = True) -> Iterator[ParseResult]:
+        """
+        Yield a ParseResult per document, in input order or, with
+        ordered=False, chunk by chunk as workers finish. Errors are returned
+        on the result instead of raised.
+        """
+        pending = self._chunks(documents)
+        window = self.workers * 2
+        in_flight: Dict[Any, int] = {}
+        buffered: Dict[int, List[ParseResult]] = {}
+        next_chunk = 0
+        submitted = 0
+        try:
+            while True:
+                while len(in_flight) + len(buffered) < window:
+                    chunk = next(pending, None)
+                    if chunk is None:
+                        break
+                    in_flight[self._pool.submit(_extract_chunk, chunk)] = submitted
+                    submitted += 1
+                if not in_flight:
+                    break
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    number = in_flight.pop(future)
+                    if ordered:
+                        buffered[number] = future.result()
+                    else:
+                        yield from future.result()
+                while next_chunk in buffered:
+                    yield from buffered.pop(next_chunk)
+                    next_chunk += 1
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+    def extract(self, documents: Iterable[Document], ordered: bool = True) -> Iterator[Dict[str, Any]]:
+        """Yield the rows of every document; the first failing document raises its error."""
+        for result in self.map(documents, ordered=ordered):
+            if not result.ok:
+                raise result.error
+            yield from result.rows
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"ParsePool(workers={self.workers}, chunksize={self.chunksize}, backend={self.backend!r})"
+
+
+def parse_many(
+    documents: Iterable[Document],
+    schema: ExtractionSchema,
+    workers: Optional[int] = None,
+    chunksize: int = 8,
+    ordered: bool = True,
+    backend: str = "auto",
+) -> Iterator[Dict[str, Any]]:
+    """
+    Rows extracted from `documents` with `schema` on a temporary ParsePool.
+
+    Usage:
+        rows = list(parse_many(pages, schema, workers=4))
+    """
+    with ParsePool(schema, workers=workers, chunksize=chunksize, backend=backend) as pool:
+        yield from pool.extract(documents, ordered=ordered)
@@ -0,0 +1,243 @@
+"""
+Declarative extraction schemas for HTML documents.
+"""
+from typing import Optional, Dict, Any, Callable, Iterable, Iterator, List, Tuple, Union
+from ..utils import get_logger, to_int, to_float, to_bool, to_str, to_iso
+from .backends import LxmlBackend, SelectorScope, fallback_backend, resolve_backend, selector_scopes, split_selectors
+from .parser import HtmlParser, ParserError
+
+logger = get_logger(__name__)
+
+
+def _to_date_iso(value: Any) -> Optional[str]:
+    return to_iso(to_str(value))
+
+
+# Named transforms, matching the type names of DataConverter.cast.
+TRANSFORMS: Dict[str, Callable[[Any], Any]] = {
+    "int": to_int,
+    "float": to_float,
+    "bool": to_bool,
+    "str": to_str,
+    "date": _to_date_iso,
+}
+
+FieldSpec = Union[str, Tuple[str, str], Dict[str, Any]]
+
+
+class Field:
+    """
+    One output column: the text (or `attr`) of the first element matching
+    `selector`, or of all of them with `many=True`, passed through
+    `transform`. Without a selector the value is read from the item element
+    itself.
+    """
+
+    __slots__ = ("name", "selector", "attr", "many", "transform", "default")
+
+    def __init__(
+        self,
+        name: str,
+        selector: Optional[str] = None,
+        attr: Optional[str] = None,
+        many: bool = False,
+        transform: Optional[Union[str, Callable[[Any], Any]]] = None,
+        default: Any = None,
+    ):
+        if isinstance(transform, str):
+            if transform not in TRANSFORMS:
+                raise ValueError(f"Unknown transform: {transform!r}. Use: {list(TRANSFORMS)} or a callable")
+            transform = TRANSFORMS[transform]
+        self.name = name
+        self.selector = selector or None
+        self.attr = attr
+        self.many = many
+        self.transform = transform
+        self.default = default
+
+    @classmethod
+    def parse(cls, name: str, spec: FieldSpec) -> "Field":
+        if isinstance(spec, Field):
+            return spec
+        if isinstance(spec, str):
+            return cls(name, spec)
+        if isinstance(spec, tuple) and len(spec) == 2:
+            return cls(name, spec[0], attr=spec[1])
+        if isinstance(spec, dict):
+            unknown = set(spec) - {"selector", "attr", "many", "transform", "default"}
+            if unknown:
+                raise ValueError(f"Unknown option(s) for field {name!r}: {sorted(unknown)}")
+            return cls(name, **spec)
+        raise ValueError(f"Field {name!r} must be a selector, a (selector, attr) tuple or a dict, got {spec!r}")
+
+    def __repr__(self) -> str:
+        return f"Field({self.name!r}, selector={self.selector!r}, attr={self.attr!r}, many={self.many})"
+
+
+class ExtractionSchema:
+    """
+    Extract many fields from HTML documents in one pass.
+
+    `fields` maps output names to a selector (text of the first match), a
+    (selector, attr) tuple, or a dict with `selector`, `attr`, `many`,
+    `transform` ("int", "float", "bool", "str", "date" or a callable) and
+    `default`. With `items`, each element matching it yields one row and
+    field selectors are evaluated inside that element only; without it
+    each document yields a single row.
+
+    Selectors are compiled once per backend and reused for every document,
+    and with the BeautifulSoup backends text documents are parsed with
+    `only=` restricted to what the schema reads. Fields whose selectors are plain compounds ("h2.name",
+    "a[rel=next]") are all filled by a single walk over each item's
+    subtree; other selectors run as pre-compiled queries on the item. The
+    output is a list of dicts, ready for DataCleaner and DataConverter.
+
+    Usage:
+        schema = ExtractionSchema(
+            {
+                "id":    {"attr": "data-id"},
+                "name":  "h2.name",
+                "url":   ("a.link", "href"),
+                "price": {"selector": "span.price", "transform": "float"},
+            },
+            items="div.product",
+        )
+        rows = schema.extract(html)
+        rows = DataCleaner(rows).drop_nulls(["name"]).to_list()
+    """
+
+    def __init__(self, fields: Dict[str, FieldSpec], items: Optional[str] = None):
+        if not fields:
+            raise ValueError("An extraction schema needs at least one field.")
+        self.fields = [Field.parse(name, spec) for name, spec in fields.items()]
+        self.items = items
+        if items is None and any(field.selector is None for field in self.fields):
+            raise ValueError("Fields without a selector read the item element and require items=.")
+        # Per backend class; None when the backend cannot run the selectors.
+        self._compiled: Dict[type, Optional[Tuple[Any, List[Tuple[Field, Any, Any]]]]] = {}
+        self._walk_plan = self._plan_walk()
+        self._walked = {k for entries in (*self._walk_plan[0].values(), self._walk_plan[1]) for k, _ in entries}
+        self._many = [field.many for field in self.fields]
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Compiled selectors are per process (lxml XPath objects do not pickle).
+        return dict(self.__dict__, _compiled={})
+
+    @property
+    def selectors(self) -> List[str]:
+        """Selectors a document is queried with from its root (used as HtmlParser `only=`)."""
+        if self.items is not None:
+            return [self.items]
+        return [field.selector for field in self.fields]
+
+    def _compile(self, backend: Any) -> Tuple[Any, List[Tuple[Field, Any, Any]]]:
+        kind = type(backend)
+        compiled = self._compiled.get(kind)
+        if compiled is None:
+            items = backend.compile(self.items)[0] if self.items is not None else None
+            fields = [
+                (field, *(backend.compile(field.selector) if field.selector else (None, None)))
+                for field in self.fields
+            ]
+            compiled = self._compiled[kind] = (items, fields)
+        return compiled
+
+    def _plan_walk(self) -> Tuple[Dict[str, List[Tuple[int, SelectorScope]]], List[Tuple[int, SelectorScope]]]:
+        """
+        Index the fields whose selectors are plain compounds ("h2.name",
+        "a[rel=next]", "img, video") by tag, so one walk of an item's
+        subtree can serve all of them.
+        """
+        by_tag: Dict[str, List[Tuple[int, SelectorScope]]] = {}
+        wildcard: List[Tuple[int, SelectorScope]] = []
+        for k, field in enumerate(self.fields):
+            if field.selector is None:
+                continue
+            scopes = selector_scopes([field.selector])
+            if scopes is None or [scope.css for scope in scopes] != split_selectors(field.selector):
+                continue
+            for scope in scopes:
+                if scope.tag is None:
+                    wildcard.append((k, scope))
+                else:
+                    by_tag.setdefault(scope.tag, []).append((k, scope))
+        for entries in by_tag.values():
+            entries.extend(wildcard)
+        return by_tag, wildcard
+
+    @staticmethod
+    def _value(field: Field, elements: List[Any], backend: Any) -> Any:
+        if field.many:
+            if field.attr is None:
+                values = [backend.text(el) for el in elements]
+            else:
+                values = [value for value in (backend.attr(el, field.attr) for el in elements) if value]
+            if field.transform is not None:
+                values = [field.transform(value) for value in values]
+            return values
+        if not elements:
+            return field.default
+        value = backend.text(elements[0]) if field.attr is None else backend.attr(elements[0], field.attr)
+        if value is None:
+            return field.default
+        return field.transform(value) if field.transform is not None else value
+
+    def _item_row(self, node: Any, fields: List[Tuple[Field, Any, Any]], tree: Any) -> Dict[str, Any]:
+        by_tag, wildcard = self._walk_plan
+        found: List[List[Any]] = [[] for _ in fields]
+        if by_tag or wildcard:
+            many = self._many
+            for el, tag, attrs in tree.descendants(node):
+                for k, scope in by_tag.get(tag, wildcard):
+                    if (many[k] or not found[k]) and scope.matches(tag, attrs):
+                        found[k].append(el)
+        row = {}
+        for k, (field, select, select_one) in enumerate(fields):
+            if field.selector is None:
+                elements = [node]
+            elif k in self._walked:
+                elements = found[k]
+            elif field.many:
+                elements = select(node)
+            else:
+                first = select_one(node)
+                elements = [first] if first is not None else []
+            row[field.name] = self._value(field, elements, tree)
+        return row
+
+    def extract(self, document: Union[str, bytes, HtmlParser], backend: str = "auto") -> List[Dict[str, Any]]:
+        """Rows extracted from one document (HTML text or an HtmlParser)."""
+        if not isinstance(document, HtmlParser):
+            if backend == "auto" and self._compiled.get(LxmlBackend, ()) is None:
+                backend = fallback_backend() or backend  # lxml cannot run these selectors
+            # lxml parses a whole page faster than it can prune one, and the tree is dropped right away.
+            only = None if resolve_backend(backend) == "lxml" else self.selectors
+            document = HtmlParser(document, backend=backend, only=only)
+        tree = document._backend
+        try:
+            items, fields = self._compile(tree)
+        except ParserError:
+            if not document._fall_back():
+                raise
+            self._compiled[type(tree)] = None
+            tree = document._backend
+            items, fields = self._compile(tree)
+        if items is None:
+            row = {}
+            for field, select, select_one in fields:
+                if field.many:
+                    elements = select(tree.root)
+                else:
+                    first = select_one(tree.root)
+                    elements = [first] if first is not None else []
+                row[field.name] = self._value(field, elements, tree)
+            return [row]
+        return [self._item_row(node, fields, tree) for node in items(tree.root)]
+
+    def extract_many(self, documents: Iterable[Union[str, bytes, HtmlParser]], backend: str = "auto") -> Iterator[Dict[str, Any]]:
+        """Rows of every document, in order."""
+        for document in documents:
+            yield from self.extract(document, backend=backend)
+
+    def __repr__(self) -> str:
+        return f"ExtractionSchema(fields={[field.name for field in self.fields]}, items={self.items!r})"
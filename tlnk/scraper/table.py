@@ -0,0 +1,213 @@
+"""
+HTML table extraction.
+"""
+from typing import Optional, Dict, Any, Iterator, List, Tuple
+from ..utils import get_logger
+
+logger = get_logger(__name__)
+
+ROW_GROUPS = ("thead", "tbody", "tfoot")
+
+# Browsers cap spans at these values; they also keep a hostile page from exhausting memory.
+MAX_COLSPAN = 1000
+MAX_ROWSPAN = 65534
+
+
+def _span(value: Any, limit: int, zero: int) -> int:
+    try:
+        span = int(str(value).strip())
+    except (TypeError, ValueError):
+        return 1
+    if span == 0:
+        return zero
+    return min(max(span, 1), limit)
+
+
+class _Grid:
+    """Expands cells into positional rows, carrying rowspans down one row group."""
+
+    __slots__ = ("pending",)
+
+    def __init__(self):
+        self.pending: Dict[int, List[Any]] = {}  # column -> [rows left, value]
+
+    def _take(self, row: List[Any]) -> None:
+        col = len(row)
+        entry = self.pending[col]
+        row.append(entry[1])
+        entry[0] -= 1
+        if entry[0] <= 0:
+            del self.pending[col]
+
+    def expand(self, cells: List[Tuple[Any, int, int]]) -> List[Any]:
+        row: List[Any] = []
+        pending = self.pending
+        for value, colspan, rowspan in cells:
+            while len(row) in pending:
+                self._take(row)
+            for _ in range(colspan):
+                if rowspan > 1:
+                    pending[len(row)] = [rowspan - 1, value]
+                row.append(value)
+        if pending:
+            last = max(pending)
+            while len(row) <= last:
+                if len(row) in pending:
+                    self._take(row)
+                else:
+                    row.append(None)
+        return row
+
+    def end_group(self) -> None:
+        self.pending.clear()
+
+
+class Table:
+    """
+    A single HTML table, walked once in document order.
+
+    Only the table's own rows are read (directly or through thead / tbody /
+    tfoot), so nested tables never leak rows into the outer one. colspan
+    and rowspan are expanded so every row lines up with the columns, and
+    body `th` cells (row headers) are kept as values. Header rows are the
+    rows in thead or, without one, the leading rows made only of `th`;
+    several header rows are joined per column with `header_sep`
+    ("Price / Min"). Duplicate names get a "_2", "_3" suffix and empty ones
+    become "column_N". Pass `headers` to name the columns explicitly.
+    Rows shorter than the header are padded with None.
+
+    Usage:
+        table = HtmlParser(html).table("#prices")
+        for row in table.rows():
+            ...
+        columns = table.columns()
+    """
+
+    def __init__(self, backend: Any, node: Any, headers: Optional[List[str]] = None, header_sep: str = " / "):
+        self.backend = backend
+        self.node = node
+        self.header_sep = header_sep
+        self._explicit = list(headers) if headers is not None else None
+
+    def _row_elements(self) -> Iterator[Tuple[Optional[str], Any]]:
+        """(row group, tr) pairs; rows directly under <table> report None as their group."""
+        children = self.backend.children
+        for el, tag, _ in children(self.node):
+            if tag == "tr":
+                yield None, el
+            elif tag in ROW_GROUPS:
+                for tr, tr_tag, _ in children(el):
+                    if tr_tag == "tr":
+                        yield tag, tr
+
+    def grid(self) -> Iterator[Tuple[bool, List[Any]]]:
+        """(in_header, values) per non-empty row, spans expanded; `in_header` marks thead / all-th rows."""
+        backend = self.backend
+        children, text = backend.children, backend.text
+        grid = _Grid()
+        group = "start"
+        leading = True
+        has_thead = False
+        for row_group, tr in self._row_elements():
+            if row_group != group:
+                grid.end_group()
+                group = row_group
+            values = []
+            spans = None
+            all_th = True
+            for cell, tag, attrs in children(tr):
+                if tag != "td" and tag != "th":
+                    continue
+                all_th = all_th and tag == "th"
+                values.append(text(cell))
+                if attrs and ("colspan" in attrs or "rowspan" in attrs):
+                    spans = spans or {}
+                    spans[len(values) - 1] = (
+                        _span(attrs.get("colspan"), MAX_COLSPAN, 1),
+                        _span(attrs.get("rowspan", 1), MAX_ROWSPAN, MAX_ROWSPAN),
+                    )
+            if not values and not grid.pending:
+                continue
+            if row_group == "thead":
+                in_header = has_thead = True
+            else:
+                in_header = leading and not has_thead and row_group != "tfoot" and all_th and bool(values)
+            leading = leading and in_header
+            if spans is None and not grid.pending:
+                yield in_header, values
+            else:
+                spans = spans or {}
+                yield in_header, grid.expand([(v, *spans.get(i, (1, 1))) for i, v in enumerate(values)])
+
+    def _names(self, header_rows: List[List[Any]]) -> List[str]:
+        width = max((len(row) for row in header_rows), default=0)
+        names = []
+        used = set()
+        seen: Dict[str, int] = {}
+        for i in range(width):
+            parts: List[str] = []
+            for row in header_rows:
+                part = row[i] if i < len(row) else None
+                if part and (not parts or parts[-1] != part):
+                    parts.append(part)
+            base = name = self.header_sep.join(parts) or f"column_{i + 1}"
+            # Suffix repeats until the name is free: headers may already read "A_2".
+            while name in used:
+                seen[base] = seen.get(base, 1) + 1
+                name = f"{base}_{seen[base]}"
+            used.add(name)
+            names.append(name)
+        return names
+
+    def _split(self) -> Tuple[List[str], Iterator[List[Any]]]:
+        """Column names and the remaining data rows of a single pass over the grid."""
+        rows = self.grid()
+        header_rows = []
+        first = None
+        for in_header, values in rows:
+            if not in_header:
+                first = values
+                break
+            header_rows.append(values)
+        names = self._explicit if self._explicit is not None else self._names(header_rows)
+
+        def data() -> Iterator[List[Any]]:
+            if first is not None:
+                yield first
+                for _, values in rows:
+                    yield values
+
+        return names, data()
+
+    @property
+    def headers(self) -> List[str]:
+        return self._split()[0]
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """Yield a dict per data row, lazily; nothing when the table has no header."""
+        names, data = self._split()
+        if not names:
+            return
+        width = len(names)
+        for values in data:
+            if len(values) < width:
+                values = values + [None] * (width - len(values))
+            yield dict(zip(names, values))
+
+    def columns(self) -> Dict[str, List[Any]]:
+        """Column name -> list of values, without building a dict per row."""
+        names, data = self._split()
+        columns: Dict[str, List[Any]] = {name: [] for name in names}
+        appenders = [columns[name].append for name in names]
+        width = len(names)
+        if not width:
+            return {}
+        for values in data:
+            if len(values) < width:
+                values = values + [None] * (width - len(values))
+            for append, value in zip(appenders, values):
+                append(value)
+        return columns
+
+    def __repr__(self) -> str:
+        return f"Table(headers={self.headers!r})"
@@ -1,4 +1,5 @@
 from .cleaner import DataCleaner, DataCleanerError
-from .converter import DataConverter, DataConverterError
+from .converter import DataConverter, DataConverterError, RowConverter
+from .dedup import Dedup, DedupStats
 
-__all__ = ["DataCleaner", "DataCleanerError", "DataConverter", "DataConverterError"]
+__all__ = ["DataCleaner", "DataCleanerError", "DataConverter", "DataConverterError", "RowConverter", "Dedup", "DedupStats"]
@@ -1,18 +1,51 @@
 """
 Data cleaner.
 """
-from typing import List, Dict, Any, Optional
-from ..utils import clean_whitespace, is_empty, to_str
+from typing import List, Dict, Any, Iterable, Optional
+from ..utils import TextPipeline
+from .dedup import Dedup, DedupStats
+from .plan import RowChain, Step
 
 
 class DataCleanerError(Exception):
     pass
 
 
-class DataCleaner:
+class DataCleaner(RowChain):
     """
     Clean and normalize a list of dicts using method chaining.
 
+    Input rows are never modified: they are shared until a step edits
+    them and copied then (filters such as drop_nulls copy nothing;
+    select / rename build new rows anyway). copy=False hands the rows
+    over instead, to be edited in place. A chain built from another
+    chain shares its rows the same way, so DataConverter(cleaner) copies
+    nothing up front.
+
+    With lazy=True the chained calls only record a plan. to_list(),
+    iteration, count or summary() optimize it (adjacent steps fused,
+    select/rename moved ahead of the per-column work they make unnecessary,
+    drop_nulls moved ahead of steps that cannot change its columns) and run
+    it in a single pass over the rows; explain() shows the optimized plan.
+    The output is the same as the eager chain's.
+
+    Any other iterable of dicts (a generator, a JsonStream) is streamed
+    instead of copied: the chain is lazy, rows flow through it one at a
+    time on iteration, iter_chunks() or write(sink), and count / summary()
+    come from counters kept during that pass.
+
+    storage="columns" keeps the rows as a ColumnTable: each step works
+    column by column, int / float / bool casts are packed into typed
+    arrays, and a DataConverter built from the cleaner reuses the table.
+    Rows come back with their keys in schema order. Iterables are read
+    into the table, not streamed.
+
+    executor="process" runs the chain on `workers` processes (default:
+    one per CPU): steps are recorded as with lazy=True and the plan runs
+    over chunks of `chunksize` rows, results in input order.
+    drop_duplicates keys are computed in the workers and resolved here,
+    so the first row per key is kept as in a single process.
+
     Usage:
         result = (
             DataCleaner(rows)
@@ -21,77 +54,112 @@ class DataCleaner:
             .strip_whitespace()
             .to_list()
         )
+
+        cleaner = DataCleaner(rows, lazy=True).strip_whitespace().select_columns(["id", "name"])
+        print(cleaner.explain())
+
+        DataCleaner(JsonStream("export.ndjson")).drop_nulls(["id"]).write("clean.ndjson")
+
+        cleaner = DataCleaner(rows, storage="columns").strip_whitespace()
+
+        cleaner = DataCleaner(rows, executor="process", workers=8).strip_whitespace().drop_duplicates(["id"])
     """
 
-    def __init__(self, data: List[Dict[str, Any]]):
-        if not isinstance(data, list):
-            raise DataCleanerError("Data must be a list of dicts.")
-        self._data = [row.copy() for row in data]
-        self._original_count = len(data)
+    _error = DataCleanerError
+
+    def __init__(
+        self,
+        data: Iterable[Dict[str, Any]],
+        lazy: bool = False,
+        storage: Optional[str] = None,
+        executor: Optional[str] = None,
+        workers: Optional[int] = None,
+        chunksize: int = 10000,
+        copy: bool = True,
+    ):
+        self._init_rows(data, lazy, storage, executor, workers, chunksize, copy)
+        self._dedups: List[Dedup] = []
+        self._original_count = None if self._stream else len(self._data)
 
     @property
     def count(self) -> int:
-        return len(self._data)
+        return self._count()
 
     @property
     def columns(self) -> List[str]:
-        return list(self._data[0].keys()) if self._data else []
+        return self._columns()
 
     def drop_nulls(self, columns: Optional[List[str]] = None) -> "DataCleaner":
-        def is_valid(row):
-            cols = columns or row.keys()
-            return all(not is_empty(to_str(row.get(c, ""))) for c in cols)
-        self._data = [row for row in self._data if is_valid(row)]
-        return self
-
-    def drop_duplicates(self, keys: Optional[List[str]] = None) -> "DataCleaner":
-        seen = set()
-        result = []
-        for row in self._data:
-            identifier = tuple(row.get(k) for k in keys) if keys else tuple(sorted(row.items()))
-            if identifier not in seen:
-                seen.add(identifier)
-                result.append(row)
-        self._data = result
-        return self
+        return self._apply(Step("drop_nulls", columns))
+
+    def drop_duplicates(
+        self,
+        keys: Optional[List[str]] = None,
+        strategy: str = "exact",
+        capacity: int = 1_000_000,
+        error_rate: float = 0.001,
+        spill_dir: Optional[str] = None,
+        partitions: int = 64,
+    ) -> "DataCleaner":
+        """
+        Keep the first row per `keys` (or per whole row). `strategy` picks
+        how seen rows are remembered: "exact", "hash" (64-bit fingerprints),
+        "bloom" (approximate, fixed memory for `capacity` rows at
+        `error_rate`) or "spill" (hash partitions on disk); see Dedup.
+        dedup_stats() reports each pass's memory and false-positive rate.
+        """
+        try:
+            dedup = Dedup(strategy, capacity, error_rate, spill_dir, partitions)
+        except ValueError as e:
+            raise DataCleanerError(str(e)) from e
+        self._dedups.append(dedup)
+        return self._apply(Step("drop_duplicates", keys, args=dedup))
+
+    def dedup_stats(self) -> List[DedupStats]:
+        """DedupStats of the latest pass of each drop_duplicates step that has run."""
+        return [dedup.stats for dedup in self._dedups if dedup.stats is not None]
 
     def strip_whitespace(self, columns: Optional[List[str]] = None) -> "DataCleaner":
-        for row in self._data:
-            cols = columns or list(row.keys())
-            for col in cols:
-                if isinstance(row.get(col), str):
-                    row[col] = clean_whitespace(row[col])
-        return self
+        return self._apply(Step("strip_whitespace", columns))
+
+    def normalize_text(self, pipeline: TextPipeline, columns: Optional[List[str]] = None) -> "DataCleaner":
+        """
+        Run a TextPipeline over the string values of `columns` (or all).
+        Columnar storage applies it to each column in batch.
+        """
+        if not isinstance(pipeline, TextPipeline):
+            raise DataCleanerError(f"Expected a TextPipeline, got {type(pipeline).__name__}")
+        return self._apply(Step("normalize_text", columns, args=pipeline))
 
     def rename_columns(self, mapping: Dict[str, str]) -> "DataCleaner":
-        self._data = [{mapping.get(k, k): v for k, v in row.items()} for row in self._data]
-        return self
+        return self._apply(Step("rename_columns", args=dict(mapping)))
 
     def select_columns(self, columns: List[str]) -> "DataCleaner":
-        self._data = [{k: row.get(k) for k in columns} for row in self._data]
-        return self
+        return self._apply(Step("select_columns", args=tuple(columns)))
 
     def fill_null(self, value: Any = "", columns: Optional[List[str]] = None) -> "DataCleaner":
-        for row in self._data:
-            cols = columns or list(row.keys())
-            for col in cols:
-                if is_empty(to_str(row.get(col, ""))):
-                    row[col] = value
-        return self
-
-    def to_list(self) -> List[Dict[str, Any]]:
-        return self._data
+        return self._apply(Step("fill_null", columns, args=value))
 
     def summary(self) -> Dict[str, Any]:
+        """Row counts and columns; a stream reports its last full pass (reading it if needed)."""
+        if self._stream:
+            stats = self._stream_stats()
+            original, count, columns = stats.input, stats.output, stats.columns
+        else:
+            original, count, columns = self._original_count, self.count, self.columns
         return {
-            "original_count": self._original_count,
-            "cleaned_count": self.count,
-            "dropped": self._original_count - self.count,
-            "columns": self.columns,
+            "original_count": original,
+            "cleaned_count": count,
+            "dropped": original - count,
+            "columns": columns,
         }
 
     def __len__(self) -> int:
         return self.count
 
     def __repr__(self) -> str:
+        if self._stream:
+            return f"DataCleaner(streaming, pending_steps={len(self._plan)})"
+        if self._plan:
+            return f"DataCleaner(rows={len(self._data)}, pending_steps={len(self._plan)}, lazy=True)"
         return f"DataCleaner(rows={self.count}, columns={self.columns})"
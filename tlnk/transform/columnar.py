@@ -0,0 +1,510 @@
+"""
+Columnar storage for DataCleaner / DataConverter.
+"""
+import functools
+import heapq
+import operator
+from array import array
+from itertools import compress
+from typing import Optional, Callable, Dict, Any, Iterable, Iterator, List, Tuple
+from ..utils import is_empty, to_str
+from .dedup import Dedup
+from .plan import WHITESPACE, Step, cast_values
+
+
+class _Missing:
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "MISSING"
+
+
+# A cell whose row has no such key (rows need not share every column).
+MISSING = _Missing()
+
+# Cast results stored as typed arrays: array module type code per cast.
+TYPED = {"int": "q", "float": "d", "bool": "b"}
+
+# The Python type of the values of each typed cast.
+_PYTHON_TYPES = {"int": int, "float": float, "bool": bool}
+
+# Per-cell state of typed columns.
+_GONE, _NULL, _VALUE = 0, 1, 2
+
+
+@functools.lru_cache(maxsize=None)
+def _numpy() -> Any:
+    """NumPy when installed; typed columns then use ndarrays instead of array.array."""
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        return None
+
+
+class Column:
+    """
+    One column's cells, in row order.
+
+    Object columns keep a list where MISSING marks rows without the key.
+    Columns produced by int / float / bool casts are packed into a typed
+    array (NumPy when available, else array.array) with a `state` byte per
+    row telling missing, None and value cells apart.
+    """
+
+    __slots__ = ("values", "kind", "state")
+
+    def __init__(self, values: Any, kind: str = "object", state: Optional[bytearray] = None):
+        self.values = values
+        self.kind = kind
+        self.state = state
+
+    @classmethod
+    def typed(cls, cells: List[Any], kind: str) -> "Column":
+        """Pack `cells` (values, None or MISSING) as a typed column; an object column if they do not fit."""
+        state = bytearray(_VALUE if v is not None and v is not MISSING else _NULL if v is None else _GONE for v in cells)
+        packed = [v if s == _VALUE else 0 for v, s in zip(cells, state)]
+        np = _numpy()
+        try:
+            if np is not None:
+                values = np.array(packed, dtype={"int": np.int64, "float": np.float64, "bool": np.bool_}[kind])
+            else:
+                values = array(TYPED[kind], packed)
+        except (OverflowError, TypeError, ValueError):
+            return cls(cells)
+        return cls(values, kind, state)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def has_missing(self) -> bool:
+        if self.state is None:
+            return any(v is MISSING for v in self.values)
+        return _GONE in self.state
+
+    def cells(self) -> List[Any]:
+        """Python values, None and MISSING, one per row."""
+        if self.state is None:
+            return self.values
+        values = self.values.tolist()
+        if self.kind == "bool":
+            values = [v == 1 for v in values]
+        if _VALUE in self.state and (_NULL in self.state or _GONE in self.state):
+            return [v if s == _VALUE else None if s == _NULL else MISSING for v, s in zip(values, self.state)]
+        if _VALUE in self.state:
+            return values
+        return [None if s == _NULL else MISSING for s in self.state]
+
+    def take(self, keep: bytearray) -> "Column":
+        """The rows whose `keep` byte is set."""
+        if self.state is None:
+            return Column(list(compress(self.values, keep)))
+        np = _numpy()
+        if np is not None:
+            values = self.values[np.frombuffer(bytes(keep), dtype=np.bool_)]
+        else:
+            values = array(self.values.typecode, compress(self.values, keep))
+        return Column(values, self.kind, bytearray(compress(self.state, keep)))
+
+    def nbytes(self) -> int:
+        """Approximate memory of the container (not of the objects an object column points to)."""
+        if self.state is None:
+            return 8 * len(self.values) + 56
+        return self.values.nbytes if hasattr(self.values, "nbytes") else self.values.itemsize * len(self.values) + len(self.state)
+
+
+def _schema_order(names: List[str], orders: Iterable[Tuple[str, ...]]) -> List[str]:
+    """
+    `names` (in first-seen order) sorted so that each key order in
+    `orders` is kept: a key some rows lack goes between its neighbours
+    in the rows that have it. Where rows disagree, the first-seen order
+    decides for the keys involved.
+    """
+    rank = {name: i for i, name in enumerate(names)}
+    after: Dict[str, List[str]] = {name: [] for name in names}
+    waiting = dict.fromkeys(names, 0)
+    for keys in orders:
+        for first, second in zip(keys, keys[1:]):
+            after[first].append(second)
+            waiting[second] += 1
+    ready = [rank[name] for name in names if not waiting[name]]
+    heapq.heapify(ready)
+    order: List[str] = []
+    while ready:
+        name = names[heapq.heappop(ready)]
+        order.append(name)
+        for follower in after[name]:
+            waiting[follower] -= 1
+            if not waiting[follower]:
+                heapq.heappush(ready, rank[follower])
+    if len(order) < len(names):
+        placed = set(order)
+        order += [name for name in names if name not in placed]  # rows with conflicting orders
+    return order
+
+
+def _getter(positions: List[int]) -> Callable[[Tuple[Any, ...]], Tuple[Any, ...]]:
+    """The values at `positions` of a tuple, as a tuple."""
+    if len(positions) == 1:
+        i = positions[0]
+        return lambda values: (values[i],)
+    return operator.itemgetter(*positions) if positions else lambda values: ()
+
+
+def _follows(names: Iterable[str], orders: Iterable[Tuple[str, ...]]) -> bool:
+    """Whether the keys of every order in `orders` come in the order of `names`."""
+    position = {name: i for i, name in enumerate(names)}
+    return all(position[a] < position[b] for keys in orders for a, b in zip(keys, keys[1:]))
+
+
+class ColumnTable:
+    """
+    Rows stored as one Column per name, all of `length` cells, with a
+    schema (the column order) shared by every row. Operations return new
+    tables that share the columns they do not change, so handing a table
+    from a DataCleaner to a DataConverter copies nothing.
+
+    Rows whose keys leave the schema order (rows that disagree on it, or a
+    fill_null adding a key a row lacked) keep their own order: `orders`
+    holds the distinct key orders and `order_ids` the index of each row's.
+    A rename landing two columns on one name then keeps, per row, the
+    value of the key that row has last, as row storage does. Both are None
+    while every row follows the schema.
+    """
+
+    __slots__ = ("columns", "length", "orders", "order_ids")
+
+    def __init__(
+        self,
+        columns: Dict[str, Column],
+        length: int,
+        orders: Optional[List[Tuple[str, ...]]] = None,
+        order_ids: Optional[List[int]] = None,
+    ):
+        self.columns = columns
+        self.length = length
+        self.orders = orders
+        self.order_ids = order_ids
+
+    @classmethod
+    def _keyed(cls, columns: Dict[str, Column], length: int, orders: List[Tuple[str, ...]], order_ids: List[int]) -> "ColumnTable":
+        """A table keeping the rows' key orders only if they leave the schema order."""
+        if _follows(columns, orders):
+            return cls(columns, length)
+        return cls(columns, length, orders, order_ids)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]]) -> "ColumnTable":
+        """
+        Columns in an order that keeps every row's key order (see
+        _schema_order); rows lacking a key get MISSING.
+        """
+        lists: Dict[str, List[Any]] = {}
+        orders: Dict[Tuple[str, ...], int] = {(): 0}
+        changes = [(0, 0)]  # (row, order) wherever the key order changes
+        keys: Tuple[str, ...] = ()
+        appenders: List[Any] = []
+        n = 0
+        for row in rows:
+            if tuple(row) != keys:
+                keys = tuple(row)
+                changes.append((n, orders.setdefault(keys, len(orders))))
+                for key in keys:
+                    if key not in lists:
+                        lists[key] = [MISSING] * n
+                appenders = [lists[key].append for key in keys]
+            for append, value in zip(appenders, row.values()):
+                append(value)
+            n += 1
+            if len(lists) != len(keys):
+                for values in lists.values():
+                    if len(values) < n:
+                        values.append(MISSING)
+        columns = {name: Column(lists[name]) for name in _schema_order(list(lists), orders)}
+        if _follows(columns, orders):
+            return cls(columns, n)
+        order_ids: List[int] = []
+        for (start, k), (end, _) in zip(changes, changes[1:] + [(n, 0)]):
+            order_ids += [k] * (end - start)
+        return cls(columns, n, list(orders), order_ids)
+
+    @property
+    def names(self) -> List[str]:
+        return list(self.columns)
+
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        """Rows as dicts in schema order (or their own), without the keys a row was missing."""
+        names = list(self.columns)
+        cells = [column.cells() for column in self.columns.values()]
+        if not cells:
+            for _ in range(self.length):
+                yield {}
+            return
+        if self.orders is not None:
+            position = {name: i for i, name in enumerate(names)}
+            getters = [(keys, _getter([position[key] for key in keys])) for keys in self.orders]
+            for values, k in zip(zip(*cells), self.order_ids):
+                keys, get = getters[k]
+                yield dict(zip(keys, get(values)))
+            return
+        if not any(column.has_missing for column in self.columns.values()):
+            for values in zip(*cells):
+                yield dict(zip(names, values))
+            return
+        for values in zip(*cells):
+            yield {name: value for name, value in zip(names, values) if value is not MISSING}
+
+    def to_rows(self) -> List[Dict[str, Any]]:
+        return list(self.iter_rows())
+
+    def first_columns(self) -> List[str]:
+        """Keys of the first row."""
+        if not self.length:
+            return []
+        if self.orders is not None:
+            return list(self.orders[self.order_ids[0]])
+        return [name for name, column in self.columns.items() if column.cells()[0] is not MISSING]
+
+    def _key_orders(self) -> Tuple[List[Tuple[str, ...]], List[int]]:
+        """`orders` and `order_ids`, worked out from the missing cells while rows follow the schema."""
+        if self.orders is not None:
+            return self.orders, self.order_ids
+        names = list(self.columns)
+        lacking = [0] * self.length  # per row, a bit per column it lacks
+        for bit, column in enumerate(self.columns.values()):
+            if column.has_missing:
+                for i, value in enumerate(column.cells()):
+                    if value is MISSING:
+                        lacking[i] |= 1 << bit
+        index: Dict[int, int] = {}
+        order_ids = [index.setdefault(mask, len(index)) for mask in lacking]
+        orders = [tuple(name for bit, name in enumerate(names) if not mask >> bit & 1) for mask in index]
+        return orders, order_ids
+
+    def _merge(self, names: List[str], orders: List[Tuple[str, ...]], order_ids: List[int]) -> List[Any]:
+        """
+        Cells of the one column `names` are renamed to: per row, the value
+        of the name that row has last, as in a dict; MISSING if it has none.
+        """
+        cells = [self.columns[name].cells() for name in names]
+        picks = []
+        for keys in orders:
+            present = [(keys.index(name), k) for k, name in enumerate(names) if name in keys]
+            picks.append(max(present)[1] if present else -1)
+        return [cells[k][i] if k >= 0 else MISSING for i, k in enumerate(map(picks.__getitem__, order_ids))]
+
+    def nbytes(self) -> int:
+        return sum(column.nbytes() for column in self.columns.values())
+
+    # ── Steps ──────────────────────────────────────────────────────
+
+    def apply(self, step: Step) -> "ColumnTable":
+        """The table after one cleaning / conversion step, computed column by column."""
+        return getattr(self, f"_{step.op}")(step)
+
+    def _take(self, keep: bytearray) -> "ColumnTable":
+        if all(keep):
+            return self
+        columns = {name: column.take(keep) for name, column in self.columns.items()}
+        if self.orders is None:
+            return ColumnTable(columns, sum(keep))
+        return ColumnTable(columns, sum(keep), self.orders, list(compress(self.order_ids, keep)))
+
+    def _drop_nulls(self, step: Step) -> "ColumnTable":
+        keep = bytearray(b"\x01") * self.length
+        if not step.columns:
+            checks = [(column, False) for column in self.columns.values()]
+        else:
+            if any(name not in self.columns for name in step.columns):
+                return self._take(bytearray(self.length))  # row.get(col, "") is empty for every row
+            checks = [(self.columns[name], True) for name in step.columns]
+        for column, missing_is_null in checks:
+            if column.state is not None:
+                for i, s in enumerate(column.state):
+                    if s == _NULL or (s == _GONE and missing_is_null):
+                        keep[i] = 0
+                continue
+            for i, value in enumerate(column.values):
+                if value is MISSING:
+                    if missing_is_null:
+                        keep[i] = 0
+                elif is_empty(to_str(value)):
+                    keep[i] = 0
+        return self._take(keep)
+
+    def _drop_duplicates(self, step: Step) -> "ColumnTable":
+        if step.columns:
+            cells = [self.columns[name].cells() if name in self.columns else [None] * self.length for name in step.columns]
+            keys = zip(*[[None if v is MISSING else v for v in column] for column in cells])
+        else:
+            names = list(self.columns)
+            cells = [column.cells() for column in self.columns.values()]
+            keys = (
+                {name: value for name, value in zip(names, values) if value is not MISSING}
+                for values in (zip(*cells) if cells else [()] * self.length)
+            )
+        dedup = step.args or Dedup()
+        keep = bytearray(self.length)
+        if dedup.blocking:
+            for i, _ in dedup.spill(enumerate(keys), lambda item: item[1]):
+                keep[i] = 1
+        else:
+            is_new = dedup.start()
+            for i, key in enumerate(keys):
+                if is_new(key):
+                    keep[i] = 1
+        return self._take(keep)
+
+    def _replace(self, changed: Dict[str, Column]) -> "ColumnTable":
+        columns = dict(self.columns)
+        columns.update(changed)
+        return ColumnTable(columns, self.length, self.orders, self.order_ids)
+
+    def _strip_whitespace(self, step: Step) -> "ColumnTable":
+        return self._normalize_text(step.but(args=WHITESPACE))
+
+    def _normalize_text(self, step: Step) -> "ColumnTable":
+        pipeline = step.args
+        names = step.columns or list(self.columns)
+        changed = {}
+        for name in names:
+            column = self.columns.get(name)
+            if column is None or column.state is not None:
+                continue  # typed columns hold no strings
+            changed[name] = Column(pipeline.map(column.values))
+        return self._replace(changed)
+
+    def _fill_null(self, step: Step) -> "ColumnTable":
+        value = step.args
+        changed = {}
+        if not step.columns:
+            for name, column in self.columns.items():
+                changed[name] = Column([
+                    v if v is MISSING or not is_empty(to_str(v)) else value for v in column.cells()
+                ])
+        else:
+            lacking = []  # (name, cells) of columns some rows lacked: the key goes last in those rows
+            for name in dict.fromkeys(step.columns):
+                column = self.columns.get(name)
+                if column is None:
+                    changed[name] = Column([value] * self.length)
+                    lacking.append((name, None))
+                else:
+                    cells = column.cells()
+                    changed[name] = Column([
+                        value if v is MISSING or is_empty(to_str(v)) else v for v in cells
+                    ])
+                    if column.has_missing:
+                        lacking.append((name, cells))
+            # New columns alone go last in the schema as in every row.
+            if any(cells is not None for _, cells in lacking) or (lacking and self.orders is not None):
+                return self._append_keys(changed, lacking)
+        return self._replace(changed)
+
+    def _append_keys(self, changed: Dict[str, Column], lacking: List[Tuple[str, Optional[List[Any]]]]) -> "ColumnTable":
+        """_replace(changed), each name in `lacking` added last to the rows whose cells (all if None) were MISSING."""
+        orders, order_ids = self._key_orders()
+        orders, order_ids = list(orders), list(order_ids)
+        for name, cells in lacking:
+            if cells is None:
+                orders = [keys + (name,) for keys in orders]
+                continue
+            extended: Dict[int, int] = {}
+            for i, v in enumerate(cells):
+                if v is MISSING:
+                    k = order_ids[i]
+                    new = extended.get(k)
+                    if new is None:
+                        new = extended[k] = len(orders)
+                        orders.append(orders[k] + (name,))
+                    order_ids[i] = new
+        columns = dict(self.columns)
+        columns.update(changed)
+        return ColumnTable._keyed(columns, self.length, orders, order_ids)
+
+    def _rename_columns(self, step: Step) -> "ColumnTable":
+        mapping = step.args
+        sources: Dict[str, List[str]] = {}
+        for name in self.columns:
+            sources.setdefault(mapping.get(name, name), []).append(name)
+        if all(len(names) == 1 for names in sources.values()):
+            columns = {new: self.columns[names[0]] for new, names in sources.items()}
+            if self.orders is None:
+                return ColumnTable(columns, self.length)
+            orders = [tuple(mapping.get(key, key) for key in keys) for keys in self.orders]
+            return ColumnTable(columns, self.length, orders, self.order_ids)
+        # Two keys landing on one name: the one each row has last wins, as in a dict.
+        orders, order_ids = self._key_orders()
+        columns = {
+            new: self.columns[names[0]] if len(names) == 1 else Column(self._merge(names, orders, order_ids))
+            for new, names in sources.items()
+        }
+        renamed = [tuple(dict.fromkeys(mapping.get(key, key) for key in keys)) for keys in orders]
+        return ColumnTable._keyed(columns, self.length, renamed, order_ids)
+
+    def _select_columns(self, step: Step) -> "ColumnTable":
+        columns = {}
+        for name in step.args:
+            column = self.columns.get(name)
+            if column is None:
+                column = Column([None] * self.length)
+            elif column.has_missing:
+                column = Column([None if v is MISSING else v for v in column.cells()])
+            columns[name] = column
+        return ColumnTable(columns, self.length)
+
+    def _project(self, step: Step) -> "ColumnTable":
+        columns = {}
+        key_orders = None
+        for out, src in step.args:
+            if isinstance(src, tuple):
+                # A fused rename: the candidate each row has last wins, as in rename_columns.
+                if key_orders is None:
+                    key_orders = self._key_orders()
+                column = Column(self._merge([name for name in self.columns if name in src], *key_orders))
+            else:
+                column = self.columns.get(src)
+                if column is None:
+                    column = Column([None] * self.length)
+            if column.has_missing:
+                column = Column([None if v is MISSING else v for v in column.cells()])
+            columns[out] = column
+        return ColumnTable(columns, self.length)
+
+    def _cast(self, step: Step) -> "ColumnTable":
+        table = self
+        for name, dtype in step.args:
+            column = table.columns.get(name)
+            if column is None:
+                continue
+            cells = column.cells()
+            if column.has_missing:
+                present = [i for i, v in enumerate(cells) if v is not MISSING]
+                cells = list(cells)
+                for i, value in zip(present, cast_values([cells[i] for i in present], dtype)):
+                    cells[i] = value
+            else:
+                cells = cast_values(cells, dtype)
+            column = Column.typed(cells, dtype) if dtype in TYPED else Column(cells)
+            table = table._replace({name: column})
+        return table
+
+    def _convert(self, step: Step) -> "ColumnTable":
+        converter = step.args
+        cells = {name: self.columns[name].cells() for name in converter.schema if name in self.columns}
+        converted = converter._convert_columns(cells, self.length, MISSING)
+        changed = {}
+        for name, values in converted.items():
+            dtype = converter.schema[name]
+            # Packing would turn a default of another type (0 in a float column) into the column's type.
+            default = converter.defaults.get(name)
+            packable = dtype in TYPED and (default is None or type(default) is _PYTHON_TYPES[dtype])
+            changed[name] = Column.typed(values, dtype) if packable else Column(values)
+        return self._replace(changed)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __repr__(self) -> str:
+        return f"ColumnTable(rows={self.length}, columns={self.names})"
@@ -0,0 +1,126 @@
+"""
+Cast schemas compiled to Python functions.
+"""
+import functools
+from types import CodeType
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from ..utils import to_int, to_float, to_bool, to_str
+from .plan import _to_date_iso
+
+_UNSET = object()
+
+# Most distinct texts a "date" column memoizes; a full memo starts over.
+DATE_MEMO = 4096
+
+# Code computing `r` from the cell `v` per cast, with the same result as CASTS.
+# Text is parsed inline; anything else, and text that fails, goes to the helper.
+_CELL = {
+    "int": (
+        "if type(v) is str:",
+        "    try:",
+        "        r = int(float(v.replace(',', '')))",
+        "    except ValueError:",
+        "        r = _int(v)",
+        "else:",
+        "    r = _int(v)",
+    ),
+    "float": (
+        "if type(v) is str:",
+        "    try:",
+        "        r = float(v.replace(',', ''))",
+        "    except ValueError:",
+        "        r = _float(v)",
+        "else:",
+        "    r = _float(v)",
+    ),
+    "bool": ("r = _bools.get(v.lower()) if type(v) is str else _bool(v)",),
+    "str": ("r = v.strip() if type(v) is str else _str(v)",),
+    "date": (
+        "if type(v) is str:",
+        "    r = _dates{i}.get(v, _UNSET)",
+        "    if r is _UNSET:",
+        "        if len(_dates{i}) >= _DATE_MEMO:",
+        "            _dates{i}.clear()",
+        "        r = _dates{i}[v] = _date(v)",
+        "else:",
+        "    r = _date(v)",
+    ),
+}
+
+_BOOLS = {**dict.fromkeys(("true", "yes", "1", "y"), True), **dict.fromkeys(("false", "no", "0", "n"), False)}
+
+
+def _cell(i: int, dtype: str, pad: str) -> List[str]:
+    lines = [line.format(i=i) for line in _CELL[dtype]]
+    if dtype != "str":
+        # None is a failed cast, unless the cell was empty.
+        lines += ["if r is None:", f"    r = _failed{i}(v, n)"]
+    return [pad + line for line in lines]
+
+
+def _key(i: int, column: Any) -> str:
+    """`column` as a literal in the generated code, or the name it is bound to (_key{i})."""
+    return repr(column) if type(column) in (str, int) else f"_key{i}"
+
+
+@functools.lru_cache(maxsize=256)
+def compile_schema(schema: Tuple[Tuple[str, str], ...]) -> Tuple[str, CodeType]:
+    """
+    Source and code of the functions casting the (column, type) pairs of
+    `schema` in order: convert(row, n) and convert_rows(rows, start) with
+    every column inlined, and column{i}(cells, start, absent) per pair.
+    What happens to failed cells is bound by load_schema, so one compile
+    serves every error policy.
+    """
+    body = []
+    for i, (col, dtype) in enumerate(schema):
+        key = _key(i, col)
+        body += [f"if {key} in row:", f"    v = row[{key}]", *_cell(i, dtype, "    "), f"    row[{key}] = r"]
+    lines = ["def convert(row, n=0):", *[f"    {line}" for line in body], "    return row", ""]
+    lines += [
+        "def convert_rows(rows, start):",
+        "    n = start - 1",
+        "    for n, row in enumerate(rows, start):",
+        *[f"        {line}" for line in body],
+        "    return n + 1 - start",
+    ]
+    for i, (col, dtype) in enumerate(schema):
+        lines += [
+            "",
+            f"def column{i}(cells, start, absent):",
+            "    out = []",
+            "    append = out.append",
+            "    for n, v in enumerate(cells, start):",
+            "        if v is absent:",
+            "            append(v)",
+            "            continue",
+            *_cell(i, dtype, "        "),
+            "        append(r)",
+            "    return out",
+        ]
+    source = "\n".join(lines)
+    return source, compile(source, "<tlnk.compiled cast>", "exec")
+
+
+def _none(value: Any, n: int) -> None:
+    return None
+
+
+def load_schema(schema: Tuple[Tuple[str, str], ...], failures: Optional[List[Callable[[Any, int], Any]]] = None) -> Dict[str, Any]:
+    """
+    The compiled functions of `schema` (see compile_schema), by name. The
+    i-th failure function gets each cell of pair i whose cast failed, and
+    its row number, and returns the value to store; by default None, the
+    result of the cast itself. `_dates{i}` holds the date memo of pair i
+    (at most DATE_MEMO texts).
+    """
+    scope: Dict[str, Any] = {
+        "_int": to_int, "_float": to_float, "_bool": to_bool, "_bools": _BOOLS,
+        "_str": to_str, "_date": _to_date_iso, "_UNSET": _UNSET, "_DATE_MEMO": DATE_MEMO,
+    }
+    for i, (col, _) in enumerate(schema):
+        scope[f"_key{i}"] = col
+        scope[f"_failed{i}"] = failures[i] if failures else _none
+        scope[f"_dates{i}"] = {}
+    exec(compile_schema(schema)[1], scope)
+    return scope
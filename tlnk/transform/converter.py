@@ -1,17 +1,176 @@
 """
 Data type converter.
 """
-from typing import List, Dict, Any
-from ..utils import to_int, to_float, to_bool, to_str, to_iso
+from typing import List, Dict, Any, Iterable, Optional, Tuple, Union
+from ..utils import is_empty, to_str
+from .compiled import compile_schema, load_schema
+from .plan import CASTS, RowChain, Step
 
 
 class DataConverterError(Exception):
     pass
 
 
-class DataConverter:
+# What RowConverter does with a cell that does not convert.
+ERROR_POLICIES = ("default", "raise", "collect")
+
+
+class RowConverter:
+    """
+    A cast schema compiled into one function that converts every column
+    of a row in a single pass, with the same results as DataConverter.cast.
+
+    The generated code is cached per schema, so converters for the same
+    columns and types share one compile, and a converter is meant to be
+    kept and reused across batches and files. A cell that does not
+    convert (not empty, but its cast gives None) is handled by its
+    column's policy in `errors` (one for all columns, or a dict):
+
+        default   the cell becomes the column's value in `defaults` (None)
+        raise     DataConverterError
+        collect   as default, and (row, column, value) is added to `errors`
+
+    Empty cells (None or blank text) become None, as with cast, and are
+    not errors. `error_counts` holds the failed cells per column and
+    `rows` the rows converted, over every call until reset(); rows are
+    numbered in that order.
+
+    Usage:
+        converter = RowConverter({"price": "float", "stock": "int"}, errors={"price": "collect"})
+        for path in paths:
+            for batch in JsonStream(path).batches():
+                converter.convert(batch)
+        converter.error_counts  # {"price": 3, "stock": 0}
+        converter.errors        # [(17, "price", "n/a"), ...]
+
+        rows = DataConverter(rows).convert(converter).to_list()
+    """
+
+    def __init__(
+        self,
+        schema: Dict[str, str],
+        errors: Union[str, Dict[str, str]] = "default",
+        defaults: Optional[Dict[str, Any]] = None,
+    ):
+        if not schema:
+            raise DataConverterError("A RowConverter needs at least one column.")
+        for dtype in schema.values():
+            if dtype not in CASTS:
+                raise DataConverterError(f"Unknown type: {dtype!r}. Use: {list(CASTS.keys())}")
+        policies = errors if isinstance(errors, dict) else dict.fromkeys(schema, errors)
+        defaults = dict(defaults or {})
+        for col in list(policies) + list(defaults):
+            if col not in schema:
+                raise DataConverterError(f"Column {col!r} is not in the schema")
+        self.schema = dict(schema)
+        self.policies = {col: policies.get(col, "default") for col in schema}
+        for policy in self.policies.values():
+            if policy not in ERROR_POLICIES:
+                raise DataConverterError(f"Unknown error policy: {policy!r}. Use: {list(ERROR_POLICIES)}")
+        self.defaults = defaults
+        self.rows = 0
+        self._counts: Dict[str, int] = dict.fromkeys(schema, 0)
+        self._errors: List[Tuple[int, str, Any]] = []
+        pairs = tuple(self.schema.items())
+        self.source = compile_schema(pairs)[0]
+        scope = load_schema(pairs, [self._failure(col) for col in self.schema])
+        self._row, self._rows = scope["convert"], scope["convert_rows"]
+        self._cells = {col: scope[f"column{i}"] for i, col in enumerate(self.schema)}
+        self._dates = [scope[f"_dates{i}"] for i in range(len(pairs))]
+
+    def _failure(self, column: str) -> Any:
+        """What the generated code calls when `column`'s cast gives None."""
+        policy, default, dtype = self.policies[column], self.defaults.get(column), self.schema[column]
+        counts, errors = self._counts, self._errors
+
+        def failed(value: Any, n: int) -> Any:
+            if is_empty(to_str(value)):
+                return None
+            counts[column] += 1
+            if policy == "raise":
+                raise DataConverterError(f"Cannot convert {column!r} value {value!r} to {dtype}")
+            if policy == "collect":
+                errors.append((n, column, value))
+            return default
+        return failed
+
+    @property
+    def error_counts(self) -> Dict[str, int]:
+        """Cells that failed to convert, per column."""
+        return dict(self._counts)
+
+    @property
+    def errors(self) -> List[Tuple[int, str, Any]]:
+        """(row, column, value) of each failed cell of the "collect" columns."""
+        return list(self._errors)
+
+    def __call__(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert one row in place and return it."""
+        n = self.rows
+        self.rows = n + 1
+        return self._row(row, n)
+
+    def convert(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Convert `rows` in place, in one generated loop, and return them."""
+        self.rows += self._rows(rows, self.rows)
+        return rows
+
+    def _convert_columns(self, columns: Dict[str, List[Any]], length: int, absent: Any) -> Dict[str, List[Any]]:
+        """
+        The converted cells of those schema columns in `columns` (`length`
+        rows, `absent` marking rows without the key), column by column;
+        collected errors are kept in row order.
+        """
+        start, collected = self.rows, len(self._errors)
+        out = {col: self._cells[col](columns[col], start, absent) for col in self.schema if col in columns}
+        order = {col: i for i, col in enumerate(self.schema)}
+        self._errors[collected:] = sorted(self._errors[collected:], key=lambda error: (error[0], order[error[1]]))
+        self.rows += length
+        return out
+
+    def _absorb(self, rows: int, counts: Dict[str, int], errors: List[Tuple[int, str, Any]]) -> None:
+        """Add the counters of a copy that converted the next `rows` rows (in a worker process)."""
+        for col, count in counts.items():
+            self._counts[col] += count
+        self._errors.extend((self.rows + n, col, value) for n, col, value in errors)
+        self.rows += rows
+
+    def reset(self) -> None:
+        """Clear the row and error counters, and the date memos."""
+        self.rows = 0
+        self._counts.update(dict.fromkeys(self._counts, 0))
+        self._errors.clear()
+        for dates in self._dates:
+            dates.clear()
+
+    def __reduce__(self) -> Any:
+        # Generated functions do not pickle: rebuild (from the cache) with fresh counters.
+        return RowConverter, (self.schema, self.policies, self.defaults)
+
+    def __repr__(self) -> str:
+        return f"RowConverter(columns={list(self.schema)}, rows={self.rows}, errors={sum(self._counts.values())})"
+
+
+class DataConverter(RowChain):
     """
-    Convert column types using method chaining.
+    Convert column types using method chaining. Row chains run a cast
+    schema compiled into one function that casts every column of a row
+    (see compiled.py); columnar chains cast a whole column at a time
+    (utils.to_ints / to_floats / to_bools). Both give the same results as
+    casting cell by cell.
+
+    With lazy=True, casts are recorded and run in one pass on to_list() or
+    iteration (see DataCleaner). A lazy DataCleaner passed in hands over its
+    pending plan, so cleaning and conversion share that pass. Iterables
+    other than lists are streamed, as with DataCleaner. A columnar
+    DataCleaner (storage="columns") hands over its table unless
+    storage="rows" is asked for. A DataCleaner with executor="process"
+    hands over its executor with its plan. Rows are copied on write, or
+    handed over with copy=False, as with DataCleaner.
+
+    cast() with an `errors` policy, or convert(), runs a RowConverter: the
+    schema compiled into one function per row that counts (and can
+    collect or raise on) the cells that do not convert.
 
     Usage:
         result = (
@@ -19,79 +178,98 @@ class DataConverter:
             .cast({"age": "int", "price": "float", "date": "date"})
             .to_list()
         )
+
+        rows = DataConverter(DataCleaner(raw, lazy=True).drop_nulls(["id"])).cast(schema).to_list()
+
+        converter = DataConverter(rows).cast({"price": "float"}, errors="collect")
+        converter.error_counts()  # {"price": 2}
     """
 
-    def __init__(self, data: List[Dict[str, Any]]):
-        if not isinstance(data, list):
-            raise DataConverterError("Data must be a list of dicts.")
-        self._data = [row.copy() for row in data]
+    _error = DataConverterError
+
+    def __init__(
+        self,
+        data: Iterable[Dict[str, Any]],
+        lazy: bool = False,
+        storage: Optional[str] = None,
+        executor: Optional[str] = None,
+        workers: Optional[int] = None,
+        chunksize: int = 10000,
+        copy: bool = True,
+    ):
+        self._init_rows(data, lazy, storage, executor, workers, chunksize, copy)
+        self._converters: List[RowConverter] = []
 
     @property
     def count(self) -> int:
-        return len(self._data)
+        return self._count()
 
     @property
     def columns(self) -> List[str]:
-        return list(self._data[0].keys()) if self._data else []
+        return self._columns()
+
+    def _cast(self, columns: List[str], dtype: str) -> "DataConverter":
+        return self._apply(Step("cast", args=tuple((col, dtype) for col in columns)))
 
     def to_int(self, columns: List[str]) -> "DataConverter":
-        for row in self._data:
-            for col in columns:
-                if col in row:
-                    row[col] = to_int(row[col])
-        return self
+        return self._cast(columns, "int")
 
     def to_float(self, columns: List[str]) -> "DataConverter":
-        for row in self._data:
-            for col in columns:
-                if col in row:
-                    row[col] = to_float(row[col])
-        return self
+        return self._cast(columns, "float")
 
     def to_bool(self, columns: List[str]) -> "DataConverter":
-        for row in self._data:
-            for col in columns:
-                if col in row:
-                    row[col] = to_bool(row[col])
-        return self
+        return self._cast(columns, "bool")
 
     def to_str(self, columns: List[str]) -> "DataConverter":
-        for row in self._data:
-            for col in columns:
-                if col in row:
-                    row[col] = to_str(row[col])
-        return self
+        return self._cast(columns, "str")
 
     def to_date_iso(self, columns: List[str]) -> "DataConverter":
-        for row in self._data:
-            for col in columns:
-                if col in row:
-                    row[col] = to_iso(to_str(row[col]))
-        return self
-
-    def cast(self, schema: Dict[str, str]) -> "DataConverter":
-        """Cast multiple columns at once using schema dict."""
-        type_map = {
-            "int":   lambda cols: self.to_int(cols),
-            "float": lambda cols: self.to_float(cols),
-            "bool":  lambda cols: self.to_bool(cols),
-            "str":   lambda cols: self.to_str(cols),
-            "date":  lambda cols: self.to_date_iso(cols),
-        }
-        grouped: Dict[str, List[str]] = {}
-        for col, dtype in schema.items():
-            grouped.setdefault(dtype, []).append(col)
-        for dtype, cols in grouped.items():
-            if dtype not in type_map:
-                raise DataConverterError(f"Unknown type: {dtype!r}. Use: {list(type_map.keys())}")
-            type_map[dtype](cols)
-        return self
-
-    def to_list(self) -> List[Dict[str, Any]]:
-        return self._data
+        return self._cast(columns, "date")
+
+    def cast(
+        self,
+        schema: Dict[str, str],
+        errors: Optional[Union[str, Dict[str, str]]] = None,
+        defaults: Optional[Dict[str, Any]] = None,
+    ) -> "DataConverter":
+        """
+        Cast multiple columns at once using schema dict, in one pass over
+        the rows. With `errors` or `defaults`, the schema is compiled into
+        a RowConverter with those error policies (see convert()).
+        """
+        if errors is not None or defaults is not None:
+            return self.convert(RowConverter(schema, errors or "default", defaults))
+        for dtype in schema.values():
+            if dtype not in CASTS:
+                raise DataConverterError(f"Unknown type: {dtype!r}. Use: {list(CASTS.keys())}")
+        return self._apply(Step("cast", args=tuple(schema.items())))
+
+    def convert(self, converter: RowConverter) -> "DataConverter":
+        """
+        Convert every row with a compiled RowConverter, which keeps its
+        error counts (and collected errors) across the chains and batches
+        it is used for. Filters are not moved ahead of it, so its row
+        numbers are those of the chain as written.
+        """
+        if not isinstance(converter, RowConverter):
+            raise DataConverterError(f"Expected a RowConverter, got {type(converter).__name__}")
+        self._converters.append(converter)
+        return self._apply(Step("convert", args=converter))
+
+    def error_counts(self) -> Dict[str, int]:
+        """Failed cells per column, summed over this chain's converters (cast with errors / convert)."""
+        counts: Dict[str, int] = {}
+        for converter in self._converters:
+            for col, count in converter.error_counts.items():
+                counts[col] = counts.get(col, 0) + count
+        return counts
 
     def __len__(self) -> int:
         return self.count
 
     def __repr__(self) -> str:
+        if self._stream:
+            return f"DataConverter(streaming, pending_steps={len(self._plan)})"
+        if self._plan:
+            return f"DataConverter(rows={len(self._data)}, pending_steps={len(self._plan)}, lazy=True)"
         return f"DataConverter(rows={self.count}, columns={self.columns})"
@@ -0,0 +1,313 @@
+"""
+Duplicate detection for DataCleaner.drop_duplicates.
+"""
+import os
+import sys
+import math
+import pickle
+import shutil
+import struct
+import tempfile
+from hashlib import blake2b
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+STRATEGIES = ("exact", "hash", "bloom", "spill")
+
+# (fingerprint, row number) records of the spill partitions.
+_PAIR = struct.Struct("<QQ")
+
+# Element types of key tuples fingerprinted with hash() (see fingerprint).
+_STR = {str}
+
+# Identifiers whose size is measured to estimate the memory of the exact strategy.
+_SIZE_SAMPLE = 256
+
+
+def canonical(value: Any) -> str:
+    """
+    A text encoding equal for equal values (1, 1.0 and True alike, dicts in
+    any key order), including unhashable ones such as lists and dicts.
+    """
+    if isinstance(value, str):
+        return f"s{len(value)}:{value}"
+    if value is None:
+        return "n"
+    if isinstance(value, int):
+        return f"i{int(value)};"
+    if isinstance(value, float):
+        return f"i{int(value)};" if value.is_integer() else f"f{value!r};"
+    if isinstance(value, (tuple, list)):
+        return f"{'t' if isinstance(value, tuple) else 'l'}{len(value)}(" + "".join(map(canonical, value)) + ")"
+    if isinstance(value, dict):
+        return f"d{len(value)}(" + "".join(sorted(canonical(k) + canonical(v) for k, v in value.items())) + ")"
+    text = repr(value)
+    return f"o{type(value).__qualname__}:{len(text)}:{text}"
+
+
+def fingerprint(value: Any, size: int = 8) -> int:
+    """
+    A `size`-byte hash of canonical(value). 8-byte fingerprints of tuples
+    of strings use Python's own (SipHash, per-process seeded) hash, which
+    is much cheaper: such fingerprints only compare within one process.
+    """
+    if size == 8 and type(value) is tuple and set(map(type, value)) <= _STR:
+        return hash(value) & 0xFFFFFFFFFFFFFFFF
+    digest = blake2b(canonical(value).encode("utf-8", "surrogatepass"), digest_size=size).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _deep_size(value: Any) -> int:
+    size = sys.getsizeof(value)
+    if isinstance(value, (tuple, list)):
+        size += sum(map(_deep_size, value))
+    elif isinstance(value, dict):
+        size += sum(_deep_size(k) + _deep_size(v) for k, v in value.items())
+    return size
+
+
+class DedupStats:
+    """
+    Counters of one drop_duplicates pass.
+
+    `memory_bytes` is what the strategy holds to remember rows (for spill:
+    the peak while resolving a partition, plus its row bitmap), and
+    `false_positive_rate` the chance that a new, unique row is taken for a
+    duplicate at the current fill: 0 for exact, about n / 2**65 for 64-bit
+    fingerprints, and the Bloom filter's estimate for bloom.
+    """
+
+    __slots__ = ("strategy", "rows", "dropped", "partitions", "_memory", "_fp_rate", "_seen")
+
+    def __init__(self, strategy: str, seen: Any = None):
+        self.strategy = strategy
+        self.rows = 0
+        self.dropped = 0
+        self.partitions = 0
+        self._memory = 0
+        self._fp_rate = 0.0
+        self._seen = seen
+
+    @property
+    def unique(self) -> int:
+        return self.rows - self.dropped
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._seen.memory() if self._seen is not None else self._memory
+
+    @property
+    def false_positive_rate(self) -> float:
+        return self._seen.false_positive_rate() if self._seen is not None else self._fp_rate
+
+    def as_dict(self) -> Dict[str, Any]:
+        names = ("strategy", "rows", "dropped", "unique", "memory_bytes", "false_positive_rate", "partitions")
+        return {name: getattr(self, name) for name in names}
+
+    def __repr__(self) -> str:
+        return (
+            f"DedupStats(strategy={self.strategy!r}, rows={self.rows}, dropped={self.dropped}, "
+            f"memory_bytes={self.memory_bytes}, false_positive_rate={self.false_positive_rate:.2g})"
+        )
+
+
+class _Exact:
+    """The key itself in a set; unhashable keys by their canonical encoding."""
+
+    def __init__(self, strategy: str):
+        self.stats = DedupStats(strategy, self)
+        self.seen = set()
+        self.sizes = []
+
+    def __call__(self, key: Any) -> bool:
+        if type(key) is dict:
+            try:
+                key = tuple(sorted(key.items()))
+            except TypeError:
+                key = canonical(key)
+        try:
+            new = key not in self.seen
+        except TypeError:
+            key = canonical(key)
+            new = key not in self.seen
+        self.stats.rows += 1
+        if not new:
+            self.stats.dropped += 1
+            return False
+        self.seen.add(key)
+        if len(self.sizes) < _SIZE_SAMPLE:
+            self.sizes.append(_deep_size(key))
+        return True
+
+    def memory(self) -> int:
+        average = sum(self.sizes) / len(self.sizes) if self.sizes else 0
+        return sys.getsizeof(self.seen) + int(average * len(self.seen))
+
+    def false_positive_rate(self) -> float:
+        return 0.0
+
+
+class _Hashed:
+    """64-bit fingerprints of the keys in a set."""
+
+    def __init__(self, strategy: str):
+        self.stats = DedupStats(strategy, self)
+        self.seen = set()
+
+    def __call__(self, key: Any) -> bool:
+        fp = fingerprint(key)
+        self.stats.rows += 1
+        if fp in self.seen:
+            self.stats.dropped += 1
+            return False
+        self.seen.add(fp)
+        return True
+
+    def memory(self) -> int:
+        return sys.getsizeof(self.seen) + len(self.seen) * sys.getsizeof(1 << 63)
+
+    def false_positive_rate(self) -> float:
+        return len(self.seen) / 2 ** 65
+
+
+class _Bloom:
+    """A Bloom filter sized for `capacity` keys at `error_rate`; never grows."""
+
+    def __init__(self, strategy: str, capacity: int, error_rate: float):
+        self.stats = DedupStats(strategy, self)
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.added = 0
+
+    def __call__(self, key: Any) -> bool:
+        fp = fingerprint(key, 16)
+        h1, h2 = fp & 0xFFFFFFFFFFFFFFFF, fp >> 64 | 1
+        bits, size = self.bits, self.size
+        present = True
+        for i in range(self.hashes):
+            position = (h1 + i * h2) % size
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                present = False
+                bits[position >> 3] |= mask
+        self.stats.rows += 1
+        if present:
+            self.stats.dropped += 1
+            return False
+        self.added += 1
+        return True
+
+    def memory(self) -> int:
+        return len(self.bits)
+
+    def false_positive_rate(self) -> float:
+        return (1 - math.exp(-self.hashes * self.added / self.size)) ** self.hashes
+
+
+class Dedup:
+    """
+    How drop_duplicates remembers the rows it has seen.
+
+    exact  keeps every key (the default). Keys holding unhashable values
+           (lists, dicts from JsonParser) are compared by their canonical
+           encoding instead of failing.
+    hash   keeps a 64-bit fingerprint per unique key: a fixed ~70 bytes
+           per key whatever its width, with about n / 2**65 odds of a
+           unique row being dropped.
+    bloom  a Bloom filter of `capacity` keys at `error_rate`: fixed
+           memory, some unique rows dropped (never a duplicate kept).
+    spill  writes rows and fingerprints to hash partitions in `spill_dir`
+           and resolves one partition at a time, so memory is a bitmap of
+           the row count plus one partition. Rows come out, in order, only
+           once the input is exhausted.
+
+    `stats` holds the DedupStats of the latest pass.
+    """
+
+    def __init__(
+        self,
+        strategy: str = "exact",
+        capacity: int = 1_000_000,
+        error_rate: float = 0.001,
+        spill_dir: Optional[str] = None,
+        partitions: int = 64,
+    ):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy: {strategy!r}. Use: {list(STRATEGIES)}")
+        if capacity < 1 or not 0 < error_rate < 1 or partitions < 1:
+            raise ValueError("capacity and partitions must be >= 1 and error_rate between 0 and 1")
+        self.strategy = strategy
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.spill_dir = spill_dir
+        self.partitions = partitions
+        self.stats: Optional[DedupStats] = None
+
+    @property
+    def blocking(self) -> bool:
+        """Whether rows are only released after the whole input was read."""
+        return self.strategy == "spill"
+
+    def start(self) -> Callable[[Any], bool]:
+        """A fresh seen-set for one pass: called with each row's key, True if it is new."""
+        if self.strategy == "bloom":
+            seen = _Bloom(self.strategy, self.capacity, self.error_rate)
+        elif self.strategy == "hash":
+            seen = _Hashed(self.strategy)
+        else:
+            seen = _Exact(self.strategy)
+        self.stats = seen.stats
+        return seen
+
+    def spill(self, items: Iterable[Any], key: Callable[[Any], Any]) -> Iterator[Any]:
+        """The first item per key, in order, resolved through partitions on disk."""
+        stats = self.stats = DedupStats("spill")
+        stats.partitions = self.partitions
+        directory = tempfile.mkdtemp(prefix="tlnk-dedup-", dir=self.spill_dir)
+        try:
+            spool_path = os.path.join(directory, "items")
+            paths = [os.path.join(directory, f"part-{n}") for n in range(self.partitions)]
+            parts = [open(path, "wb") for path in paths]
+            try:
+                with open(spool_path, "wb") as spool:
+                    for seq, item in enumerate(items):
+                        fp = fingerprint(key(item))
+                        spool.write(pickle.dumps(item, pickle.HIGHEST_PROTOCOL))
+                        parts[fp % self.partitions].write(_PAIR.pack(fp, seq))
+                        stats.rows += 1
+            finally:
+                for part in parts:
+                    part.close()
+
+            keep = bytearray((stats.rows + 7) // 8)
+            peak = 0
+            for path in paths:
+                with open(path, "rb") as f:
+                    data = f.read()
+                seen = set()
+                for fp, seq in _PAIR.iter_unpack(data):
+                    if fp not in seen:
+                        seen.add(fp)
+                        keep[seq >> 3] |= 1 << (seq & 7)
+                peak = max(peak, len(data) + sys.getsizeof(seen) + len(seen) * sys.getsizeof(1 << 63))
+                os.remove(path)
+            unique = sum(bin(byte).count("1") for byte in keep)
+            stats.dropped = stats.rows - unique
+            stats._memory = len(keep) + peak
+            stats._fp_rate = unique / 2 ** 65
+
+            with open(spool_path, "rb") as spool:
+                for seq in range(stats.rows):
+                    item = pickle.load(spool)
+                    if keep[seq >> 3] >> (seq & 7) & 1:
+                        yield item
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def __repr__(self) -> str:
+        options = {
+            "exact": "", "hash": "",
+            "bloom": f", capacity={self.capacity}, error_rate={self.error_rate}",
+            "spill": f", partitions={self.partitions}",
+        }[self.strategy]
+        return f"Dedup({self.strategy!r}{options})"
@@ -0,0 +1,211 @@
+"""
+Running DataCleaner / DataConverter plans on a pool of worker processes.
+"""
+import operator
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+from typing import Optional, Dict, Any, Iterable, Iterator, List, Tuple
+from ..utils import default_workers
+from .dedup import Dedup
+from .plan import Step, run, _dedup_key, _first_write, _row_function
+
+# Set in each worker process by _init_worker: the row functions between
+# drop_duplicates steps, the key function of each of those steps, and the
+# RowConverters of the convert steps.
+_worker_segments: List[List[Any]] = []
+_worker_keys: List[Any] = []
+_worker_converters: List[Any] = []
+
+
+def _init_worker(steps: List[Step]) -> None:
+    global _worker_segments, _worker_keys, _worker_converters
+    _worker_segments, _worker_keys, _worker_converters = [[]], [], []
+    # Unpickled rows still share the objects repeated in the chunk: copy on write, as run() does.
+    first = _first_write(steps)
+    for i, step in enumerate(steps):
+        if i == first:
+            _worker_segments[-1].append(operator.methodcaller("copy"))
+        if step.op == "drop_duplicates":
+            _worker_keys.append(_dedup_key(step.columns))
+            _worker_segments.append([])
+        else:
+            _worker_segments[-1].append(_row_function(step))
+        if step.op == "convert":
+            _worker_converters.append(step.args)
+
+
+def _run_chunk(rows: List[Dict[str, Any]]) -> Tuple[List[Any], int, List[Any]]:
+    """
+    The chunk through every row-local step. Without drop_duplicates steps
+    the result is the surviving rows. Otherwise it is a (row, keys) record
+    per row reaching the first of them: the key at each drop_duplicates
+    step the row reached, and the row, or None if a later step dropped it.
+    Rows whose first key repeats within the chunk are dropped here and
+    counted. Each converter's counters for the chunk come back too.
+    """
+    out, repeated = _run_steps(rows)
+    counters = []
+    for converter in _worker_converters:
+        counters.append((converter.rows, converter.error_counts, converter.errors))
+        converter.reset()
+    return out, repeated, counters
+
+
+def _run_steps(rows: List[Dict[str, Any]]) -> Tuple[List[Any], int]:
+    first, *rest = _worker_segments
+    out: List[Any] = []
+    repeated = 0
+    is_new = Dedup().start() if _worker_keys else None
+    for row in rows:
+        for func in first:
+            row = func(row)
+            if row is None:
+                break
+        if row is None:
+            continue
+        if is_new is None:
+            out.append(row)
+            continue
+        keys = []
+        for key, segment in zip(_worker_keys, rest):
+            value = key(row)
+            # A whole-row key must not change with the steps still to run on the row.
+            keys.append(value.copy() if value is row else value)
+            if len(keys) == 1 and not is_new(keys[0]):
+                repeated += 1
+                break
+            for func in segment:
+                row = func(row)
+                if row is None:
+                    break
+            if row is None:
+                break
+        else:
+            out.append((row, tuple(keys)))
+            continue
+        if row is None:
+            out.append((None, tuple(keys)))
+    return out, repeated
+
+
+def _stage(records: Iterable[Any], index: int, dedup: Dedup) -> Iterator[Any]:
+    """Records reaching drop_duplicates step `index` that are the first with their key."""
+    reached = (record for record in records if len(record[1]) > index)
+    if dedup.blocking:
+        yield from dedup.spill(reached, lambda record: record[1][index])
+        return
+    is_new = dedup.start()
+    for record in reached:
+        if is_new(record[1][index]):
+            yield record
+
+
+def run_parallel(
+    steps: List[Step],
+    rows: Iterable[Dict[str, Any]],
+    workers: Optional[int] = None,
+    chunksize: int = 10000,
+) -> Iterator[Dict[str, Any]]:
+    """
+    The rows through the optimized `steps`, with the same result as run().
+
+    Rows go to worker processes in chunks of `chunksize` (one pickled
+    list each way per chunk) and results come back in input order. The
+    row-local steps all run in the workers. drop_duplicates is split:
+    each worker computes the keys and drops repeats within its chunk,
+    then this process keeps the first row per key across chunks, in
+    order, with the step's own strategy (so hash fingerprints are never
+    compared across processes). Input that fits in one chunk runs here.
+
+    convert steps before the first drop_duplicates run in the workers,
+    whose counters are added to the RowConverter in chunk order; those
+    after it run here, on the rows that are kept, so error counts and row
+    numbers are the same as in one process.
+    """
+    rows = iter(rows)
+    head = list(islice(rows, chunksize))
+    if len(head) < chunksize:
+        yield from run(steps, head, copy=True)
+        return
+    ops = [step.op for step in steps]
+    split = next((i for i, op in enumerate(ops) if op == "convert" and "drop_duplicates" in ops[:i]), len(steps))
+    pooled = _run_pooled(steps[:split], head, rows, workers, chunksize)
+    # Rows from the workers are new dicts, so the steps left here own them.
+    yield from run(steps[split:], pooled, copy=False) if split < len(steps) else pooled
+
+
+def _run_pooled(
+    steps: List[Step],
+    head: List[Dict[str, Any]],
+    rows: Iterator[Dict[str, Any]],
+    workers: Optional[int],
+    chunksize: int,
+) -> Iterator[Dict[str, Any]]:
+    """`head` and the rest of `rows` through `steps` on a worker pool (see run_parallel)."""
+    dedups = [step.args or Dedup() for step in steps if step.op == "drop_duplicates"]
+    shipped = [step.but(args=None) if step.op == "drop_duplicates" else step for step in steps]
+    workers = workers or default_workers()
+    converters = [step.args for step in steps if step.op == "convert"]
+    repeated = [0]
+
+    def chunks() -> Iterator[List[Dict[str, Any]]]:
+        yield head
+        while True:
+            chunk = list(islice(rows, chunksize))
+            if not chunk:
+                return
+            yield chunk
+
+    def records() -> Iterator[Any]:
+        for out, count, counters in ordered:
+            repeated[0] += count
+            for converter, (converted, counts, errors) in zip(converters, counters):
+                converter._absorb(converted, counts, errors)
+            yield from out
+
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(shipped,))
+    ordered = _ordered(pool, chunks(), workers * 2)
+    try:
+        if not dedups:
+            yield from records()
+            return
+        stream: Iterable[Any] = records()
+        for index, dedup in enumerate(dedups):
+            stream = _stage(stream, index, dedup)
+        for row, _ in stream:
+            if row is not None:
+                yield row
+        # Repeats dropped in the workers never reached the first step's runner.
+        stats = dedups[0].stats
+        stats.rows += repeated[0]
+        stats.dropped += repeated[0]
+    finally:
+        ordered.close()  # cancels the chunks not yet started
+        pool.shutdown(wait=True)
+
+
+def _ordered(pool: ProcessPoolExecutor, chunks: Iterator[List[Dict[str, Any]]], window: int) -> Iterator[Any]:
+    """_run_chunk over `chunks` on `pool`, results in input order, at most `window` chunks in flight or buffered."""
+    in_flight: Dict[Any, int] = {}
+    buffered: Dict[int, Any] = {}
+    next_chunk = 0
+    submitted = 0
+    try:
+        while True:
+            while len(in_flight) + len(buffered) < window:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                in_flight[pool.submit(_run_chunk, chunk)] = submitted
+                submitted += 1
+            if not in_flight:
+                return
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                buffered[in_flight.pop(future)] = future.result()
+            while next_chunk in buffered:
+                yield buffered.pop(next_chunk)
+                next_chunk += 1
+    finally:
+        for future in in_flight:
+            future.cancel()
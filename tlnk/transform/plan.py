@@ -0,0 +1,750 @@
+"""
+Row plans: the steps of a DataCleaner / DataConverter chain, optimized and run in one pass.
+"""
+import os
+import json
+import operator
+from itertools import islice
+from typing import Optional, Dict, Any, Callable, Iterable, Iterator, List, Tuple
+from ..utils import TextPipeline, clean_whitespace, is_empty, to_int, to_float, to_bool, to_str, to_iso, to_ints, to_floats, to_bools, to_isos
+from .dedup import Dedup
+
+
+def _to_date_iso(value: Any) -> Optional[str]:
+    return to_iso(to_str(value))
+
+
+def _to_date_isos(values: List[Any]) -> List[Optional[str]]:
+    return to_isos([to_str(value) for value in values])
+
+
+# Casts by DataConverter type name.
+CASTS: Dict[str, Callable[[Any], Any]] = {
+    "int": to_int,
+    "float": to_float,
+    "bool": to_bool,
+    "str": to_str,
+    "date": _to_date_iso,
+}
+
+# Column-at-a-time versions of CASTS, same results (see utils.dtype / utils.date).
+BULK_CASTS: Dict[str, Callable[[List[Any]], List[Any]]] = {
+    "int": to_ints,
+    "float": to_floats,
+    "bool": to_bools,
+    "date": _to_date_isos,
+}
+
+
+def cast_values(values: List[Any], dtype: str) -> List[Any]:
+    """`values` cast to `dtype`, in bulk where a bulk cast exists."""
+    bulk = BULK_CASTS.get(dtype)
+    return bulk(values) if bulk is not None else list(map(CASTS[dtype], values))
+
+
+# Casts that turn a missing value (None) into something else, so they may not
+# move behind a projection that fills missing columns with None.
+_NONE_UNSAFE = {"str"}
+
+# strip_whitespace as a text pipeline, for fusing it into normalize_text.
+WHITESPACE = TextPipeline().collapse_whitespace()
+
+# Projection source for columns that cannot exist (rename targets nothing maps to).
+_ABSENT = object()
+
+# Values of the executor argument: where a plan's rows are processed besides this process.
+EXECUTORS = ("process",)
+
+FILTERS = ("drop_nulls",)
+MAPS = ("strip_whitespace", "normalize_text", "fill_null", "cast", "convert")
+RESHAPES = ("project", "rename_columns")
+
+
+class Step:
+    """
+    One operation of a chain. Steps are plain data (names, columns and
+    arguments) so a plan can be inspected, rewritten and compiled later.
+
+    op / args:
+        drop_nulls        columns or None (all)
+        drop_duplicates   columns or None (whole row), args = Dedup or None (exact)
+        strip_whitespace  columns or None
+        normalize_text    columns or None, args = TextPipeline
+        fill_null         columns or None, args = fill value
+        cast              args = ((column, type name), ...)
+        convert           args = RowConverter (kept in place: nothing moves across it)
+        rename_columns    args = {old: new}
+        select_columns    args = columns
+        project           args = ((output, source), ...) - select_columns with fused renames
+    """
+
+    __slots__ = ("op", "columns", "args", "notes")
+
+    def __init__(self, op: str, columns: Optional[List[str]] = None, args: Any = None, notes: Tuple[str, ...] = ()):
+        self.op = op
+        self.columns = tuple(columns) if columns else None
+        self.args = args
+        self.notes = notes
+
+    def but(self, columns: Any = False, args: Any = False, note: Optional[str] = None) -> "Step":
+        """A copy with other columns / args and one more note."""
+        return Step(
+            self.op,
+            self.columns if columns is False else columns,
+            self.args if args is False else args,
+            self.notes + ((note,) if note else ()),
+        )
+
+    def describe(self) -> str:
+        if self.op == "project":
+            parts = [out if src == out else f"{out} <- {'|'.join(_names(src)) or '(missing)'}" for out, src in self.args]
+            return f"project({', '.join(parts)})"
+        if self.op == "cast":
+            return f"cast({', '.join(f'{col}: {dtype}' for col, dtype in self.args)})"
+        if self.op == "convert":
+            return f"convert({', '.join(f'{col}: {dtype}' for col, dtype in self.args.schema.items())}; compiled)"
+        if self.op in ("rename_columns", "select_columns"):
+            return f"{self.op}({self.args if self.op == 'rename_columns' else list(self.args)})"
+        columns = list(self.columns) if self.columns else "all columns"
+        if self.op in ("fill_null", "normalize_text"):
+            return f"{self.op}({self.args!r}, {columns})"
+        if self.op == "drop_duplicates" and self.args is not None and self.args.strategy != "exact":
+            return f"drop_duplicates({columns}, {self.args!r})"
+        return f"{self.op}({columns})"
+
+    def __repr__(self) -> str:
+        return f"Step({self.describe()})"
+
+
+# ── Column algebra ───────────────────────────────────────────────
+#
+# A projection source is a column name, _ABSENT, or a tuple of names when
+# a fused rename lets several input columns land on the same output: the
+# value then comes from the last of them present in the row, as it does
+# for rename_columns itself.
+
+def _rename_source(mapping: Dict[str, str], column: str) -> Any:
+    """The input column(s) that end up as `column` after the rename, or _ABSENT."""
+    candidates = [old for old, new in mapping.items() if new == column]
+    if column not in mapping:
+        candidates.append(column)
+    if not candidates:
+        return _ABSENT
+    return candidates[0] if len(candidates) == 1 else tuple(candidates)
+
+
+def _names(source: Any) -> Tuple[str, ...]:
+    if source is _ABSENT:
+        return ()
+    return source if isinstance(source, tuple) else (source,)
+
+
+def _fuse(first: Step, second: Step) -> Optional[Step]:
+    """`second` applied after `first` as a single step, or None."""
+    if first.op == "project" and second.op == "project":
+        sources = dict(first.args)
+        if any(isinstance(src, tuple) for _, src in second.args):
+            return None
+        pairs = tuple((out, sources.get(src, _ABSENT)) for out, src in second.args)
+        return Step("project", args=pairs, notes=first.notes + second.notes)
+    if first.op == "project" and second.op == "rename_columns":
+        fused: Dict[str, Any] = {}
+        for out, src in first.args:
+            fused[second.args.get(out, out)] = src
+        return Step("project", args=tuple(fused.items()), notes=first.notes + ("rename_columns fused",))
+    if first.op == "rename_columns" and second.op == "project":
+        if any(isinstance(src, tuple) for _, src in second.args):
+            return None
+        pairs = tuple((out, _rename_source(first.args, src) if src is not _ABSENT else _ABSENT) for out, src in second.args)
+        return Step("project", args=pairs, notes=("rename_columns fused",) + second.notes)
+    if first.op == "cast" and second.op == "cast":
+        return Step("cast", args=first.args + second.args, notes=first.notes + second.notes)
+    if first.op == "strip_whitespace" and second.op == "strip_whitespace":
+        if first.columns is None or second.columns is None:
+            columns = None
+        else:
+            columns = list(dict.fromkeys(first.columns + second.columns))
+        return Step("strip_whitespace", columns, notes=first.notes + second.notes)
+    if {first.op, second.op} <= {"strip_whitespace", "normalize_text"} and first.columns == second.columns:
+        # A strip is the whitespace collapse of a text pipeline: one pipeline, compiled as one.
+        steps = sum((WHITESPACE.steps if step.op == "strip_whitespace" else step.args.steps for step in (first, second)), ())
+        return Step("normalize_text", first.columns, args=TextPipeline(steps), notes=first.notes + second.notes)
+    return None
+
+
+def _touched(step: Step) -> Optional[Tuple[str, ...]]:
+    """Columns a per-column step may change; None for all of them."""
+    if step.op == "cast":
+        return tuple(col for col, _ in step.args)
+    return step.columns
+
+
+def _project_past(step: Step, project: Step) -> Any:
+    """
+    `step` rewritten to run after `project` with the same result, None if
+    it cannot be, or False when the projection drops everything it touches.
+    """
+    outs_of: Dict[Any, List[str]] = {}
+    for out, src in project.args:
+        if isinstance(src, tuple):
+            touched = _touched(step)
+            if touched is not None and set(src) & set(touched):
+                return None
+            continue
+        outs_of.setdefault(src, []).append(out)
+    if step.op in ("strip_whitespace", "normalize_text"):
+        if step.columns is None:
+            return step
+        columns = [out for col in step.columns for out in outs_of.get(col, ())]
+        return step.but(columns) if columns else False
+    if step.op == "fill_null":
+        # Unlisted columns are filled only when present; after the projection every column is.
+        if step.columns is None:
+            return None
+        columns = [out for col in step.columns for out in outs_of.get(col, ())]
+        return step.but(columns) if columns else False
+    if step.op == "cast":
+        pairs = []
+        for col, dtype in step.args:
+            outs = outs_of.get(col, ())
+            if outs and dtype in _NONE_UNSAFE:
+                return None
+            pairs.extend((out, dtype) for out in outs)
+        return step.but(args=tuple(pairs)) if pairs else False
+    return None
+
+
+def _prune_after(before: List[Step], step: Step) -> Any:
+    """
+    `step` without the columns no row can have after the `before` steps
+    (False if none are left), or None when nothing is pruned. Columns are
+    known from the last projection; only fill_null adds any after it.
+    """
+    outs = set()
+    for prev in reversed(before):
+        if prev.op == "project":
+            outs.update(out for out, _ in prev.args)
+            break
+        if prev.op == "rename_columns":
+            return None
+        if prev.op == "fill_null" and prev.columns is not None:
+            outs.update(prev.columns)
+    else:
+        return None
+    if step.op == "cast":
+        pairs = tuple((col, dtype) for col, dtype in step.args if col in outs)
+        return None if len(pairs) == len(step.args) else (step.but(args=pairs, note="pruned to projected columns") if pairs else False)
+    if step.op in ("strip_whitespace", "normalize_text") and step.columns is not None:
+        columns = [col for col in step.columns if col in outs]
+        return None if len(columns) == len(step.columns) else (step.but(columns, note="pruned to projected columns") if columns else False)
+    return None
+
+
+def _filter_before(step: Step, prev: Step) -> Optional[Step]:
+    """The drop_nulls `step` rewritten to run before `prev`, or None if it cannot move."""
+    columns = step.columns
+    if columns is None:
+        return None
+    if prev.op == "strip_whitespace":
+        # Collapsing whitespace never changes whether a value is empty.
+        return step
+    if prev.op in ("normalize_text", "fill_null", "cast"):
+        touched = _touched(prev)
+        if touched is None or set(touched) & set(columns):
+            return None
+        return step
+    if prev.op == "project":
+        sources = dict(prev.args)
+        origins = [sources.get(col, _ABSENT) for col in columns]
+    elif prev.op == "rename_columns":
+        origins = [_rename_source(prev.args, col) for col in columns]
+    else:
+        return None
+    if any(origin is _ABSENT or isinstance(origin, tuple) for origin in origins):
+        return None
+    return step.but(list(dict.fromkeys(origins)))
+
+
+def _project_before_filter(step: Step, project: Step) -> Optional[Step]:
+    """The drop_nulls `step` rewritten to run after `project`, or None."""
+    if step.columns is None:
+        return None
+    out_of = {}
+    for out, src in project.args:
+        if not isinstance(src, tuple):
+            out_of.setdefault(src, out)
+    if any(col not in out_of for col in step.columns):
+        return None
+    return step.but([out_of[col] for col in step.columns])
+
+
+def optimize(steps: List[Step]) -> List[Step]:
+    """
+    Rewrite a chain into an equivalent, cheaper one:
+
+    - select_columns becomes a projection; adjacent projections, renames,
+      casts and strip_whitespace steps fuse into one step each, as do
+      normalize_text / strip_whitespace steps on the same columns;
+    - projections move ahead of strip_whitespace / normalize_text /
+      fill_null / cast, which are narrowed to the projected columns (or
+      dropped), and casts or strips right after a projection lose the
+      columns it drops;
+    - drop_nulls on listed columns moves ahead of steps that cannot change
+      those columns, so dropped rows skip the remaining work.
+
+    drop_duplicates and convert keep their positions: nothing moves across them.
+    """
+    plan = [
+        Step("project", args=tuple((col, col) for col in dict.fromkeys(step.args)), notes=("select_columns",))
+        if step.op == "select_columns" else step
+        for step in steps
+    ]
+    while True:
+        i = 1
+        while i < len(plan):
+            fused = _fuse(plan[i - 1], plan[i])
+            if fused is not None:
+                plan[i - 1:i + 1] = [fused]
+            else:
+                i += 1
+        if not _rewrite_once(plan):
+            return plan
+
+
+def _rewrite_once(plan: List[Step]) -> bool:
+    """Apply the first applicable move to `plan` in place; False when none applies."""
+    for i in range(1, len(plan)):
+        prev, step = plan[i - 1], plan[i]
+        if step.op in MAPS:
+            pruned = _prune_after(plan[:i], step)
+            if pruned is not None:
+                plan[i:i + 1] = [] if pruned is False else [pruned]
+                return True
+        if step.op == "project" and prev.op in MAPS:
+            moved = _project_past(prev, step)
+            if moved is not None:
+                rest = [] if moved is False else [moved if moved is prev else moved.but(note="narrowed to projected columns")]
+                plan[i - 1:i + 1] = [step.but(note=f"moved before {prev.op}")] + rest
+                return True
+        if step.op == "project" and prev.op in FILTERS and i >= 2 and plan[i - 2].op in RESHAPES:
+            # Lift the projection over the filter only to fuse it with the reshape before.
+            fused = _fuse(plan[i - 2], step)
+            moved = _project_before_filter(prev, step) if fused is not None else None
+            if moved is not None:
+                plan[i - 2:i + 1] = [fused, moved]
+                return True
+        if step.op in FILTERS and (prev.op in MAPS or prev.op in RESHAPES):
+            moved = _filter_before(step, prev)
+            if moved is not None:
+                plan[i - 1:i + 1] = [moved.but(note=f"moved before {prev.op}"), prev]
+                return True
+    return False
+
+
+# ── Execution ────────────────────────────────────────────────────
+
+def _pick(row: Dict[str, Any], candidates: Tuple[str, ...]) -> Any:
+    """The value of the last of `candidates` in the row's key order (what rename_columns keeps)."""
+    present = [col for col in candidates if col in row]
+    if len(present) < 2:
+        return row[present[0]] if present else None
+    last = None
+    for key in row:
+        if key in candidates:
+            last = key
+    return row[last]
+
+
+def _dedup_key(columns: Optional[Tuple[str, ...]]) -> Callable[[Dict[str, Any]], Any]:
+    """What drop_duplicates compares: the values of `columns`, or the whole row."""
+    if columns:
+        return lambda row: tuple(row.get(k) for k in columns)
+    return lambda row: row
+
+
+def _row_function(step: Step) -> Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """A function returning the transformed row, or None to drop it."""
+    op, columns, args = step.op, step.columns, step.args
+    if op == "drop_nulls":
+        def drop_nulls(row):
+            for col in columns or row:
+                if is_empty(to_str(row.get(col, ""))):
+                    return None
+            return row
+        return drop_nulls
+    if op == "drop_duplicates":
+        is_new = (args or Dedup()).start()
+        key = _dedup_key(columns)
+        return lambda row: row if is_new(key(row)) else None
+    if op == "strip_whitespace":
+        def strip_whitespace(row):
+            for col in columns or list(row):
+                value = row.get(col)
+                if isinstance(value, str):
+                    row[col] = clean_whitespace(value)
+            return row
+        return strip_whitespace
+    if op == "normalize_text":
+        def normalize_text(row):
+            for col in columns or list(row):
+                value = row.get(col)
+                if isinstance(value, str):
+                    row[col] = args(value)
+            return row
+        return normalize_text
+    if op == "fill_null":
+        def fill_null(row):
+            for col in columns or list(row):
+                if is_empty(to_str(row.get(col, ""))):
+                    row[col] = args
+            return row
+        return fill_null
+    if op == "cast":
+        # Every column inlined into one generated function (same results as CASTS).
+        from .compiled import load_schema
+        return load_schema(tuple(args))["convert"]
+    if op == "convert":
+        return args
+    if op == "rename_columns":
+        mapping = args
+        return lambda row: {mapping.get(k, k): v for k, v in row.items()}
+    if op in ("project", "select_columns"):
+        pairs = args if op == "project" else tuple((col, col) for col in args)
+        if not any(isinstance(src, tuple) for _, src in pairs):
+            return lambda row: {out: row.get(src) for out, src in pairs}
+        return lambda row: {out: _pick(row, src) if isinstance(src, tuple) else row.get(src) for out, src in pairs}
+    raise ValueError(f"Unknown step: {op!r}")
+
+
+def cast_rows(step: Step, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """The cast `step` run over owned `rows` in place, in one generated loop."""
+    from .compiled import load_schema
+    load_schema(tuple(step.args))["convert_rows"](rows, 0)
+    return rows
+
+
+def _first_write(steps: List[Step]) -> Optional[int]:
+    """Position of the first step editing rows in place before any step builds new ones."""
+    for i, step in enumerate(steps):
+        if step.op in RESHAPES or step.op == "select_columns":
+            return None
+        if step.op in MAPS:
+            return i
+    return None
+
+
+def needs_copy(steps: List[Step]) -> bool:
+    """Whether a step edits rows in place before any step builds new ones."""
+    return _first_write(steps) is not None
+
+
+def run(steps: List[Step], rows: Iterable[Dict[str, Any]], copy: bool = True) -> Iterator[Dict[str, Any]]:
+    """Rows passed through every step in a single pass (split at drop_duplicates spilling to disk)."""
+    for i, step in enumerate(steps):
+        if step.op == "drop_duplicates" and step.args is not None and step.args.blocking:
+            # Spilled rows are read back as new dicts, so the steps after own them.
+            spilled = step.args.spill(run(steps[:i], rows, copy), _dedup_key(step.columns))
+            yield from run(steps[i + 1:], spilled, copy=False)
+            return
+    functions = [_row_function(step) for step in steps]
+    first = _first_write(steps) if copy else None
+    if first is not None:
+        # Copy on write: rows dropped by the filters before the first edit are never copied.
+        functions.insert(first, operator.methodcaller("copy"))
+    if len(functions) == 1:
+        func = functions[0]
+        for row in rows:
+            row = func(row)
+            if row is not None:
+                yield row
+        return
+    for row in rows:
+        for func in functions:
+            row = func(row)
+            if row is None:
+                break
+        else:
+            yield row
+
+
+class RowPlan:
+    """The pending steps of a lazy chain."""
+
+    __slots__ = ("steps",)
+
+    def __init__(self, steps: Optional[List[Step]] = None):
+        self.steps: List[Step] = list(steps or [])
+
+    def add(self, step: Step) -> None:
+        self.steps.append(step)
+
+    def optimized(self) -> List[Step]:
+        return optimize(self.steps)
+
+    def run(self, rows: Iterable[Dict[str, Any]], copy: bool = True) -> Iterator[Dict[str, Any]]:
+        return run(self.optimized(), rows, copy=copy)
+
+    def explain(self, copy: bool = True) -> str:
+        steps = self.optimized()
+        lines = [f"Optimized plan: {len(steps)} step(s) in 1 pass "
+                 f"(from {len(self.steps)}; rows copied: {'yes' if copy and needs_copy(steps) else 'no'})"]
+        for n, step in enumerate(steps, 1):
+            note = f"  # {'; '.join(step.notes)}" if step.notes else ""
+            lines.append(f"  {n}. {step.describe()}{note}")
+        lines.append("Original chain:")
+        lines += [f"  {n}. {step.describe()}" for n, step in enumerate(self.steps, 1)]
+        return "\n".join(lines)
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def __repr__(self) -> str:
+        return f"RowPlan(steps={len(self.steps)})"
+
+
+class StreamStats:
+    """Counts of the last full pass over a streamed source."""
+
+    __slots__ = ("input", "output", "columns", "done")
+
+    def __init__(self):
+        self.input = 0
+        self.output = 0
+        self.columns: List[str] = []
+        self.done = False
+
+    def __repr__(self) -> str:
+        return f"StreamStats(input={self.input}, output={self.output}, done={self.done})"
+
+
+class RowChain:
+    """
+    Row storage shared by DataCleaner and DataConverter. Eager chains run
+    each step as it is called; lazy ones record it in a RowPlan that runs
+    on to_list() / iteration.
+
+    Any other iterable of dicts (a generator, a JsonStream, a DB cursor) is
+    streamed: steps are always recorded, and iteration, iter_chunks() or
+    write() pull rows through the plan one at a time, so only the current
+    chunk and the state of drop_duplicates are held in memory.
+
+    executor="process" records the steps too and runs the plan on
+    `workers` processes, `chunksize` rows at a time (see run_parallel).
+    """
+
+    _error: type = ValueError
+
+    def _init_rows(
+        self,
+        data: Any,
+        lazy: bool,
+        storage: Optional[str] = None,
+        executor: Optional[str] = None,
+        workers: Optional[int] = None,
+        chunksize: int = 10000,
+        copy: bool = True,
+    ) -> None:
+        if storage not in (None, "rows", "columns"):
+            raise self._error(f"Unknown storage: {storage!r}. Use: ['rows', 'columns']")
+        if executor is None and isinstance(data, RowChain) and data._executor is not None:
+            executor, workers, chunksize = data._executor, workers or data._workers, data._chunksize
+        if executor is not None:
+            if executor not in EXECUTORS:
+                raise self._error(f"Unknown executor: {executor!r}. Use: {list(EXECUTORS)}")
+            if storage == "columns":
+                raise self._error("executor='process' runs row plans; use storage='rows'")
+            if (workers is not None and workers < 1) or chunksize < 1:
+                raise self._error("workers and chunksize must be >= 1")
+            storage, lazy = "rows", True
+        self._executor, self._workers, self._chunksize = executor, workers, chunksize
+        self._stats: Optional[StreamStats] = None
+        if isinstance(data, RowChain):
+            storage = storage or ("columns" if data._columnar else "rows")
+            if data._columnar and storage == "columns":
+                # Tables are never modified in place: share it, and any pending plan.
+                self._data, self._owned, self._stream, self._columnar = data._data, True, False, True
+                self._plan = RowPlan(data._plan.steps) if data._plan is not None else (RowPlan() if lazy else None)
+                return
+            if data._plan is not None and not data._columnar and storage == "rows":
+                # Continue the other chain's pending plan: both run in the same pass.
+                self._data, self._owned, self._plan = data._data, data._owned and not copy, RowPlan(data._plan.steps)
+                self._stream, self._columnar = data._stream, False
+                data._owned = False
+                return
+            # The other chain gives up its rows: shared now, or handed over with
+            # copy=False (only if they were its own).
+            source = data
+            data, copy = source.to_list(), copy or not source._owned
+            source._owned = source._owned and source._columnar
+        self._columnar = storage == "columns"
+        if self._columnar:
+            from .columnar import ColumnTable
+            if isinstance(data, (str, bytes, dict)) or not hasattr(data, "__iter__"):
+                raise self._error("Data must be a list or an iterable of dicts.")
+            self._data, self._owned, self._stream = ColumnTable.from_rows(data), True, False
+            self._plan = RowPlan() if lazy else None
+            return
+        if isinstance(data, list):
+            # Rows are shared until a step edits them (copy on write), or taken over with copy=False.
+            self._data, self._owned, self._stream = data if lazy else list(data), not copy, False
+            self._plan = RowPlan() if lazy else None
+            return
+        if isinstance(data, (str, bytes, dict)) or not hasattr(data, "__iter__"):
+            raise self._error("Data must be a list or an iterable of dicts.")
+        self._data, self._owned, self._plan, self._stream = data, not copy, RowPlan(), True
+
+    @property
+    def lazy(self) -> bool:
+        return self._plan is not None
+
+    @property
+    def streaming(self) -> bool:
+        """Whether rows come from an iterable that is read on demand."""
+        return self._stream
+
+    @property
+    def storage(self) -> str:
+        """How rows are held: "rows" (a list of dicts) or "columns" (a ColumnTable)."""
+        return "columns" if self._columnar else "rows"
+
+    def _apply(self, step: Step) -> Any:
+        if self._plan is not None:
+            self._plan.add(step)
+        elif self._columnar:
+            self._data = self._data.apply(step)
+        elif step.op in ("cast", "convert"):
+            rows = self._data if self._owned else [row.copy() for row in self._data]
+            self._data = cast_rows(step, rows) if step.op == "cast" else step.args.convert(rows)
+            self._owned = True
+        else:
+            self._data = list(run([step], self._data, copy=not self._owned))
+            # Filters keep the rows they were given; the other steps leave copies or new rows.
+            self._owned = self._owned or step.op not in FILTERS + ("drop_duplicates",)
+        return self
+
+    def _run_plan(self, rows: Iterable[Dict[str, Any]], copy: bool = True) -> Iterator[Dict[str, Any]]:
+        if self._executor is None:
+            return self._plan.run(rows, copy=copy)
+        from .parallel import run_parallel
+        return run_parallel(self._plan.optimized(), rows, self._workers, self._chunksize)
+
+    def _table(self) -> Any:
+        """The ColumnTable of a columnar chain, running the pending plan first (once)."""
+        if self._plan:
+            table = self._data
+            for step in self._plan.optimized():
+                table = table.apply(step)
+            self._data, self._plan = table, RowPlan()
+        return self._data
+
+    def _rows(self) -> List[Dict[str, Any]]:
+        """The rows, running the pending plan first (once)."""
+        if self._columnar:
+            return self._table().to_rows()
+        if self._stream:
+            self._data = list(self._iter_stream())
+            self._stream = False
+        elif self._plan:
+            self._data = list(self._run_plan(self._data, copy=not self._owned))
+        else:
+            return self._data
+        self._owned = True
+        self._plan = RowPlan()
+        return self._data
+
+    def _count(self) -> int:
+        if self._stream:
+            return self._stream_stats().output
+        if self._columnar:
+            return len(self._table())
+        return len(self._rows())
+
+    def _columns(self) -> List[str]:
+        if self._stream:
+            return self._stream_stats().columns
+        if self._columnar:
+            return self._table().first_columns()
+        rows = self._rows()
+        return list(rows[0].keys()) if rows else []
+
+    def _iter_stream(self) -> Iterator[Dict[str, Any]]:
+        source = self._data
+        if self._stats is not None and iter(source) is source:
+            raise self._error("The source iterator has already been consumed; pass a list or a re-iterable source.")
+        stats = self._stats = StreamStats()
+
+        def counted() -> Iterator[Dict[str, Any]]:
+            for row in source:
+                stats.input += 1
+                yield row
+
+        for row in self._run_plan(counted(), copy=not self._owned):
+            if not stats.output:
+                stats.columns = list(row)
+            stats.output += 1
+            yield row
+        stats.done = True
+
+    def _stream_stats(self) -> StreamStats:
+        """Counts of the streamed pass, draining the source if it has not been read yet."""
+        if self._stats is None or not self._stats.done:
+            for _ in self._iter_stream():
+                pass
+        return self._stats
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return self._rows()
+
+    def iter_chunks(self, size: int = 10000) -> Iterator[List[Dict[str, Any]]]:
+        """The resulting rows in lists of at most `size`."""
+        if size < 1:
+            raise ValueError("size must be >= 1")
+        rows = iter(self)
+        while True:
+            chunk = list(islice(rows, size))
+            if not chunk:
+                return
+            yield chunk
+
+    def write(self, sink: Any, chunk_size: int = 10000) -> int:
+        """
+        Write the resulting rows to `sink` chunk by chunk and return how
+        many were written. `sink` is a callable taking each list of rows,
+        a text file object, or a path; files receive one JSON object per
+        line (NDJSON, readable back with JsonStream).
+        """
+        written = 0
+        if callable(sink):
+            for chunk in self.iter_chunks(chunk_size):
+                sink(chunk)
+                written += len(chunk)
+            return written
+        f = open(sink, "w", encoding="utf-8") if isinstance(sink, (str, os.PathLike)) else sink
+        try:
+            dumps = json.JSONEncoder(ensure_ascii=False, default=str).encode
+            for chunk in self.iter_chunks(chunk_size):
+                f.write("".join(dumps(row) + "\n" for row in chunk))
+                written += len(chunk)
+        finally:
+            if f is not sink:
+                f.close()
+        return written
+
+    def explain(self) -> str:
+        """The optimized plan of the pending steps, next to the chain as written."""
+        if not self._plan:
+            return "No pending steps" + ("" if self.lazy else " (eager: steps run as they are called)")
+        text = self._plan.explain(copy=not self._owned)
+        if self._executor is not None:
+            workers = f"{self._workers} workers" if self._workers else "a worker per CPU"
+            text += f"\nExecutor: {self._executor} ({workers}, {self._chunksize} rows per chunk)"
+        return text
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        if self._columnar:
+            return self._table().iter_rows()
+        if self._stream:
+            return self._iter_stream()
+        if self._plan:
+            return self._run_plan(self._data)
+        return iter(self._data)
@@ -1,21 +1,27 @@
 from .logger import get_logger
-from .retry import retry
+from .retry import retry, RetryPolicy, RetryStats
+from .ratelimit import TokenBucket, HostRateLimiter
 from .headers import get_random_user_agent, get_default_headers
-from .text import normalize, clean_whitespace, remove_special_chars, to_snake_case, truncate, is_empty
-from .date import parse_date, to_iso, format_date, is_valid_date
-from .dtype import to_int, to_float, to_bool, to_str
+from .text import normalize, clean_whitespace, remove_special_chars, to_snake_case, truncate, is_empty, TextPipeline
+from .date import parse_date, to_iso, format_date, is_valid_date, DateParser, to_isos
+from .cpu import default_workers
+from .dtype import to_int, to_float, to_bool, to_str, to_ints, to_floats, to_bools
 
 __all__ = [
     # logger
     "get_logger",
     # retry
-    "retry",
+    "retry", "RetryPolicy", "RetryStats",
+    # rate limiting
+    "TokenBucket", "HostRateLimiter",
     # headers
     "get_random_user_agent", "get_default_headers",
     # text
-    "normalize", "clean_whitespace", "remove_special_chars", "to_snake_case", "truncate", "is_empty",
+    "normalize", "clean_whitespace", "remove_special_chars", "to_snake_case", "truncate", "is_empty", "TextPipeline",
     # date
-    "parse_date", "to_iso", "format_date", "is_valid_date",
+    "parse_date", "to_iso", "format_date", "is_valid_date", "DateParser", "to_isos",
+    # cpu
+    "default_workers",
     # dtype
-    "to_int", "to_float", "to_bool", "to_str",
+    "to_int", "to_float", "to_bool", "to_str", "to_ints", "to_floats", "to_bools",
 ]
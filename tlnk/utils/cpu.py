@@ -0,0 +1,11 @@
+"""
+CPU utility.
+"""
+import os
+
+
+def default_workers() -> int:
+    """CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
@@ -1,14 +1,24 @@
 """
 Date utilities.
 """
+import re
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 COMMON_FORMATS = [
     "%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%Y/%m/%d",
     "%d %b %Y", "%d %B %Y", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S",
 ]
 
+# Zero-padded ISO dates / datetimes, read by position instead of strptime.
+# ASCII only: strptime's \d also accepts other scripts' digits, which take the slow path.
+_ISO = re.compile(r"(\d{4})-(\d{2})-(\d{2})(?:[T ](\d{2}):(\d{2}):(\d{2}))?", re.ASCII)
+
+_UNSET = object()
+
+# Most distinct strings a DateParser keeps parsed; a full cache starts over.
+CACHE_SIZE = 4096
+
 
 def parse_date(value: str, formats: Optional[list] = None) -> Optional[datetime]:
     for fmt in (formats or COMMON_FORMATS):
@@ -31,3 +41,121 @@ def format_date(value: str, output_fmt: str = "%d/%m/%Y") -> Optional[str]:
 
 def is_valid_date(value: str) -> bool:
     return parse_date(value) is not None
+
+
+def _iso_date(dt: datetime) -> str:
+    """dt.strftime("%Y-%m-%d") without its per-call cost (which pads years below 1000 per platform)."""
+    if dt.year < 1000:
+        return dt.strftime("%Y-%m-%d")
+    return f"{dt.year}-{dt.month:02d}-{dt.day:02d}"
+
+
+class DateParser:
+    """
+    parse_date for whole columns, with the same results.
+
+    Each distinct string is parsed once, up to CACHE_SIZE of them; a full
+    cache starts over. Zero-padded ISO values are read by position. For
+    the rest, the formats are ranked by how many of a sample
+    of the column's values they parse, so a column of "15 January 2024"
+    tries "%d %B %Y" first instead of failing five formats per cell; values
+    in other formats still fall through to the remaining ones.
+
+    Ranking and the ISO shortcut apply to the default COMMON_FORMATS only:
+    a string two of them accept ("1 May 2024" under %b and %B) gives the
+    same date either way, so the order they are tried in cannot change a
+    result. Custom `formats` are tried in the order given.
+
+    Usage:
+        parser = DateParser()
+        parser.to_iso_many(["15 January 2024", "2024-02-01", "bad"])  # ["2024-01-15", "2024-02-01", None]
+    """
+
+    def __init__(self, formats: Optional[List[str]] = None, sample_size: int = 64):
+        self.formats = list(formats or COMMON_FORMATS)
+        self.sample_size = sample_size
+        self._rank = formats is None or self.formats == COMMON_FORMATS
+        self._order: Optional[List[str]] = None if self._rank else self.formats
+        self._cache: Dict[str, Optional[datetime]] = {}
+
+    @property
+    def order(self) -> List[str]:
+        """The formats in the order they are tried (ranked after the first parse_many)."""
+        return list(self._order or self.formats)
+
+    def _iso(self, text: str) -> Any:
+        match = _ISO.fullmatch(text)
+        if match is None:
+            return _UNSET
+        try:
+            return datetime(*map(int, filter(None, match.groups())))
+        except ValueError:
+            return None  # no other format accepts a zero-padded ISO shape
+
+    def _strptime(self, text: str, formats: List[str]) -> Optional[datetime]:
+        for fmt in formats:
+            try:
+                return datetime.strptime(text, fmt)
+            except ValueError:
+                continue
+        return None
+
+    def _infer(self, texts: List[str]) -> None:
+        sample = [text for text in texts if _ISO.fullmatch(text) is None][:self.sample_size]
+        if not sample:
+            return
+        hits = {fmt: 0 for fmt in self.formats}
+        for text in sample:
+            for fmt in self.formats:
+                if self._strptime(text, [fmt]) is not None:
+                    hits[fmt] += 1
+        self._order = sorted(self.formats, key=lambda fmt: -hits[fmt])
+
+    def _parse(self, text: str) -> Optional[datetime]:
+        if self._rank:
+            dt = self._iso(text)
+            if dt is not _UNSET:
+                return dt
+        return self._strptime(text, self._order or self.formats)
+
+    def parse(self, value: Any) -> Optional[datetime]:
+        if not isinstance(value, str):
+            return None
+        text = value.strip()
+        dt = self._cache.get(text, _UNSET)
+        if dt is _UNSET:
+            if len(self._cache) >= CACHE_SIZE:
+                self._cache.clear()
+            dt = self._cache[text] = self._parse(text)
+        return dt
+
+    def _lookup(self, values: List[Any]) -> Dict[Any, Optional[datetime]]:
+        """Parsed date per distinct value."""
+        lookup: Dict[Any, Optional[datetime]] = {}
+        texts = {}
+        for value in dict.fromkeys(value for value in values if isinstance(value, str)):
+            texts[value] = text = value.strip()
+        if self._order is None:
+            self._infer([text for text in dict.fromkeys(texts.values()) if text not in self._cache])
+        for value, text in texts.items():
+            lookup[value] = self.parse(text)
+        return lookup
+
+    def parse_many(self, values: Iterable[Any]) -> List[Optional[datetime]]:
+        values = values if isinstance(values, list) else list(values)
+        lookup = self._lookup(values)
+        return [lookup.get(value) if isinstance(value, str) else None for value in values]
+
+    def to_iso_many(self, values: Iterable[Any]) -> List[Optional[str]]:
+        values = values if isinstance(values, list) else list(values)
+        lookup = self._lookup(values)
+        iso = {value: _iso_date(dt) if dt else None for value, dt in lookup.items()}
+        return [iso.get(value) if isinstance(value, str) else None for value in values]
+
+    def __repr__(self) -> str:
+        return f"DateParser(order={self.order}, cached={len(self._cache)})"
+
+
+def to_isos(values: Iterable[Any], formats: Optional[List[str]] = None) -> List[Optional[str]]:
+    """to_iso over a whole column (see DateParser)."""
+    return DateParser(formats).to_iso_many(values)
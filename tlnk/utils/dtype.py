@@ -1,7 +1,14 @@
 """
 Data type casting utilities.
 """
-from typing import Optional, Any
+from functools import partial
+from typing import Optional, Any, Callable, Iterable, Iterator, List
+
+# Cells turned into text per bulk call, bounding the extra memory of to_ints / to_floats.
+_BLOCK = 65536
+
+# Leading cells checked for repeats before a column is cast per distinct value.
+_SAMPLE = 1024
 
 
 def to_int(value: Any, default: Optional[int] = None) -> Optional[int]:
@@ -35,3 +42,77 @@ def to_str(value: Any, default: str = "") -> str:
     if value is None:
         return default
     return str(value).strip()
+
+
+def _without_separators(block: List[Any]) -> List[str]:
+    """The cells as text with "," removed, in one replace over the joined block."""
+    try:
+        joined = "\x00".join(block)
+    except TypeError:
+        joined = "\x00".join(map(str, block))
+    if joined.count("\x00") != len(block) - 1:
+        return [str(value).replace(",", "") for value in block]
+    return joined.replace(",", "").split("\x00")
+
+
+def _by_distinct(values: List[Any], cast_all: Callable[[List[Any]], List[Any]]) -> Optional[List[Any]]:
+    """`cast_all` run once per distinct string, if `values` are strings that mostly repeat."""
+    sample = values[:_SAMPLE]
+    if len(set(map(type, sample))) != 1 or type(sample[0]) is not str or len(set(sample)) * 2 > len(sample):
+        return None
+    if set(map(type, values)) != {str}:
+        return None
+    distinct = list(set(values))
+    if len(distinct) * 2 > len(values):
+        return None
+    lookup = dict(zip(distinct, cast_all(distinct)))
+    return list(map(lookup.__getitem__, values))
+
+
+def _bulk(values: Iterable[Any], parse: Callable[[Iterator[str]], Iterator[Any]], cast: Callable[[Any], Any]) -> List[Any]:
+    """
+    `parse` mapped over the cells' text in C (once per distinct string when
+    they repeat); when a cell fails, only that cell goes through `cast` and
+    parsing resumes after it. float() skips the same surrounding whitespace
+    .strip() would whenever it succeeds.
+    """
+    values = values if isinstance(values, list) else list(values)
+    repeated = _by_distinct(values, lambda distinct: _bulk(distinct, parse, cast))
+    if repeated is not None:
+        return repeated
+    result: List[Any] = []
+    for start in range(0, len(values), _BLOCK):
+        block = values[start:start + _BLOCK]
+        texts = iter(_without_separators(block))
+        done = len(result)
+        while True:
+            try:
+                result.extend(parse(texts))
+                break
+            except (ValueError, TypeError, OverflowError):
+                # extend() keeps the cells parsed before the failing one, which
+                # `texts` has already passed; carry on with the next.
+                result.append(cast(block[len(result) - done]))
+    return result
+
+
+def to_ints(values: Iterable[Any], default: Optional[int] = None) -> List[Optional[int]]:
+    """
+    to_int over a whole column: separators are removed from all cells at
+    once and the cells parsed with map(), repeated strings only once; a
+    cell that does not parse falls back to to_int, so results (and
+    defaults) are identical.
+    """
+    return _bulk(values, lambda texts: map(int, map(float, texts)), partial(to_int, default=default))
+
+
+def to_floats(values: Iterable[Any], default: Optional[float] = None) -> List[Optional[float]]:
+    """to_float over a whole column, parsed in bulk like to_ints."""
+    return _bulk(values, lambda texts: map(float, texts), partial(to_float, default=default))
+
+
+def to_bools(values: Iterable[Any]) -> List[Optional[bool]]:
+    """to_bool over a whole column, computed once per distinct string."""
+    values = values if isinstance(values, list) else list(values)
+    repeated = _by_distinct(values, lambda distinct: list(map(to_bool, distinct)))
+    return repeated if repeated is not None else list(map(to_bool, values))
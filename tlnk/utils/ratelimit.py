@@ -0,0 +1,237 @@
+"""
+Rate limiting utilities.
+"""
+import time
+import asyncio
+import threading
+from collections import deque
+from typing import Any, Dict, Optional
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+THROTTLE_STATUSES = frozenset({429, 503})
+
+# How long a waiter sleeps before re-checking a full concurrency window.
+_POLL_INTERVAL = 0.01
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at `rate` tokens/second, holding at most `capacity`.
+
+    `try_acquire` never blocks: it returns 0 when a token was taken, or the
+    number of seconds until one will be available. `acquire` and
+    `acquire_async` wait on top of it. Thread-safe.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        wait = self.try_acquire(tokens)
+        while wait > 0:
+            time.sleep(wait)
+            wait = self.try_acquire(tokens)
+
+    async def acquire_async(self, tokens: float = 1.0) -> None:
+        wait = self.try_acquire(tokens)
+        while wait > 0:
+            await asyncio.sleep(wait)
+            wait = self.try_acquire(tokens)
+
+    def set_rate(self, rate: float) -> None:
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+
+    def __repr__(self) -> str:
+        return f"TokenBucket(rate={self.rate:.2f}, capacity={self.capacity})"
+
+
+class _HostState:
+    __slots__ = (
+        "bucket", "concurrency", "in_flight", "latency", "baseline",
+        "last_decrease", "requests", "throttled", "completed",
+    )
+
+    def __init__(self, rate: float, burst: Optional[float], concurrency: float):
+        self.bucket = TokenBucket(rate, burst)
+        self.concurrency = concurrency
+        self.in_flight = 0
+        self.latency: Optional[float] = None
+        self.baseline: Optional[float] = None
+        self.last_decrease = 0.0
+        self.requests = 0
+        self.throttled = 0
+        self.completed: deque = deque()
+
+
+class HostRateLimiter:
+    """
+    Per-host token-bucket rate limiter with AIMD concurrency control.
+
+    Each host gets its own bucket (`rate` requests/second, bursts of `burst`)
+    and a concurrency window. When `adaptive` is on, every completed request
+    feeds back into its host: a 429/503, or a latency EWMA above
+    `latency_factor` times the best seen, multiplies rate and concurrency by
+    `decrease` (at most once per `cooldown` seconds); every other success adds
+    roughly `increase` requests/second per second and one concurrency slot per
+    window. `snapshot()` reports the current effective values per host.
+
+    Usage:
+        limiter = HostRateLimiter(rate=5, concurrency=4)
+        with HttpClient(rate_limiter=limiter) as client:
+            ...
+        limiter.snapshot()["api.example.com"]["rate"]
+    """
+
+    def __init__(
+        self,
+        rate: float = 5.0,
+        burst: Optional[float] = None,
+        concurrency: int = 8,
+        adaptive: bool = True,
+        min_rate: float = 0.2,
+        max_rate: Optional[float] = None,
+        min_concurrency: int = 1,
+        max_concurrency: int = 64,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        latency_factor: float = 3.0,
+        cooldown: float = 1.0,
+        window: float = 10.0,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1")
+        self.rate = rate
+        self.burst = burst
+        self.concurrency = concurrency
+        self.adaptive = adaptive
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.cooldown = cooldown
+        self.window = window
+        self._hosts: Dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.rate, self.burst, float(self.concurrency))
+        return state
+
+    def try_acquire(self, host: str) -> float:
+        """Reserve a slot and a token for `host`; return 0, or seconds to wait before retrying."""
+        with self._lock:
+            state = self._state(host)
+            if state.in_flight >= int(state.concurrency):
+                return _POLL_INTERVAL
+            wait = state.bucket.try_acquire()
+            if wait > 0:
+                return wait
+            state.in_flight += 1
+            state.requests += 1
+            return 0.0
+
+    def acquire(self, host: str) -> None:
+        wait = self.try_acquire(host)
+        while wait > 0:
+            time.sleep(wait)
+            wait = self.try_acquire(host)
+
+    async def acquire_async(self, host: str) -> None:
+        wait = self.try_acquire(host)
+        while wait > 0:
+            await asyncio.sleep(wait)
+            wait = self.try_acquire(host)
+
+    def release(self, host: str, status: Optional[int] = None, latency: Optional[float] = None) -> None:
+        """Return the slot taken by `acquire` and feed the outcome into the AIMD controller."""
+        now = time.monotonic()
+        with self._lock:
+            state = self._state(host)
+            state.in_flight = max(0, state.in_flight - 1)
+            state.completed.append(now)
+            while state.completed and now - state.completed[0] > self.window:
+                state.completed.popleft()
+            if latency is not None:
+                state.latency = latency if state.latency is None else 0.8 * state.latency + 0.2 * latency
+                if state.baseline is None or state.latency < state.baseline:
+                    state.baseline = state.latency
+            throttled = status in THROTTLE_STATUSES
+            if throttled:
+                state.throttled += 1
+            if not self.adaptive:
+                return
+            slow = (
+                state.latency is not None and state.baseline
+                and state.latency > self.latency_factor * state.baseline
+            )
+            if throttled or slow:
+                self._decrease(host, state, now, "throttled" if throttled else "slow")
+            elif status is not None and status < 400:
+                self._increase(state)
+
+    def _decrease(self, host: str, state: _HostState, now: float, reason: str) -> None:
+        if now - state.last_decrease < self.cooldown:
+            return
+        state.last_decrease = now
+        state.bucket.set_rate(max(self.min_rate, state.bucket.rate * self.decrease))
+        state.concurrency = max(float(self.min_concurrency), state.concurrency * self.decrease)
+        logger.warning(
+            f"Backing off {host} ({reason}): rate={state.bucket.rate:.2f}/s, concurrency={int(state.concurrency)}"
+        )
+
+    def _increase(self, state: _HostState) -> None:
+        rate = state.bucket.rate + self.increase / state.bucket.rate
+        if self.max_rate is not None:
+            rate = min(self.max_rate, rate)
+        state.bucket.set_rate(rate)
+        state.concurrency = min(float(self.max_concurrency), state.concurrency + 1.0 / state.concurrency)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Current effective rate, concurrency and observed throughput per host."""
+        now = time.monotonic()
+        with self._lock:
+            result = {}
+            for host, state in self._hosts.items():
+                recent = [t for t in state.completed if now - t <= self.window]
+                result[host] = {
+                    "rate": round(state.bucket.rate, 3),
+                    "concurrency": int(state.concurrency),
+                    "in_flight": state.in_flight,
+                    "observed_rate": round(len(recent) / self.window, 3),
+                    "latency_ms": round(state.latency * 1000, 1) if state.latency is not None else None,
+                    "requests": state.requests,
+                    "throttled": state.throttled,
+                }
+            return result
+
+    def __repr__(self) -> str:
+        return f"HostRateLimiter(rate={self.rate}, concurrency={self.concurrency}, adaptive={self.adaptive})"
@@ -2,8 +2,12 @@
 Retry utility.
 """
 import time
+import random
+import asyncio
 import functools
-from typing import Callable, Tuple, Type
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple, Type
 from .logger import get_logger
 
 logger = get_logger(__name__)
@@ -32,3 +36,208 @@ def retry(
                     current_delay *= backoff
         return wrapper
     return decorator
+
+
+DEFAULT_RETRY_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+class RetryStats:
+    """
+    Retry counters for one call, or aggregated over many calls via merge().
+
+    `sleep_time` is the wall-clock time spent waiting between attempts and
+    `elapsed` the total time spent in the call, including the attempts.
+    """
+
+    __slots__ = ("calls", "attempts", "retries", "failures", "sleep_time", "elapsed")
+
+    def __init__(self):
+        self.calls = 0
+        self.attempts = 0
+        self.retries = 0
+        self.failures = 0
+        self.sleep_time = 0.0
+        self.elapsed = 0.0
+
+    def merge(self, other: "RetryStats") -> "RetryStats":
+        for name in self.__slots__:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        return self
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return (
+            f"RetryStats(calls={self.calls}, attempts={self.attempts}, retries={self.retries}, "
+            f"sleep_time={self.sleep_time:.2f})"
+        )
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    """
+    Retry policy with jittered exponential backoff, a total time budget,
+    HTTP status classification and Retry-After support.
+
+    HTTP errors are recognised by duck typing: a `response.status_code`
+    (requests) or a `status` attribute (aiohttp), with Retry-After read from
+    the matching headers; a Retry-After longer than `max_delay` is cut to
+    `max_delay`. Errors with a status outside `retry_statuses` (e.g. 404)
+    fail immediately.
+
+    Usage:
+        policy = RetryPolicy(max_attempts=5, budget=60)
+        stats = RetryStats()
+        data = policy.call(lambda: fetch(url), stats)
+        data = await policy.acall(lambda: fetch_async(url), stats)
+
+        @RetryPolicy(max_attempts=3, exceptions=(IOError,))
+        def flaky(): ...
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        multiplier: float = 2.0,
+        jitter: bool = True,
+        budget: Optional[float] = None,
+        retry_statuses: Iterable[int] = DEFAULT_RETRY_STATUSES,
+        respect_retry_after: bool = True,
+        exceptions: Tuple[Type[BaseException], ...] = (Exception,),
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be >= 1")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.budget = budget
+        self.retry_statuses = frozenset(retry_statuses)
+        self.respect_retry_after = respect_retry_after
+        self.exceptions = exceptions
+
+    def classify(self, exc: BaseException) -> Tuple[bool, Optional[float]]:
+        """Return (retryable, retry_after_seconds) for an exception."""
+        if not isinstance(exc, self.exceptions):
+            return False, None
+        response = getattr(exc, "response", None)
+        status = getattr(response, "status_code", None)
+        headers = getattr(response, "headers", None)
+        if status is None:
+            status = getattr(exc, "status", None)
+            headers = getattr(exc, "headers", None)
+        if not isinstance(status, int):
+            return True, None
+        if status not in self.retry_statuses:
+            return False, None
+        retry_after = None
+        if self.respect_retry_after and headers:
+            retry_after = _parse_retry_after(headers.get("Retry-After"))
+        return True, retry_after
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry number `attempt` (1-based), with full jitter."""
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def next_delay(self, attempt: int, exc: BaseException, elapsed: float) -> Optional[float]:
+        """Seconds to wait before the next attempt, or None to give up."""
+        retryable, retry_after = self.classify(exc)
+        if not retryable or attempt >= self.max_attempts:
+            return None
+        if retry_after is not None:
+            delay = min(retry_after, self.max_delay)
+        else:
+            delay = self.backoff(attempt)
+        if self.budget is not None and elapsed + delay > self.budget:
+            return None
+        return delay
+
+    def _give_up(self, attempt: int, exc: BaseException, stats: RetryStats, start: float) -> None:
+        stats.failures += 1
+        stats.elapsed += time.monotonic() - start
+        logger.error(f"Failed after {attempt} attempt(s): {exc}")
+
+    def call(self, func: Callable[[], Any], stats: Optional[RetryStats] = None) -> Any:
+        """Call `func()` until it succeeds or the policy gives up, sleeping between attempts."""
+        stats = stats if stats is not None else RetryStats()
+        stats.calls += 1
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            stats.attempts += 1
+            try:
+                result = func()
+            except BaseException as e:
+                delay = self.next_delay(attempt, e, time.monotonic() - start)
+                if delay is None:
+                    self._give_up(attempt, e, stats, start)
+                    raise
+                logger.warning(f"Attempt {attempt}/{self.max_attempts} failed: {e}. Retrying in {delay:.1f}s...")
+                stats.retries += 1
+                stats.sleep_time += delay
+                time.sleep(delay)
+                continue
+            stats.elapsed += time.monotonic() - start
+            return result
+
+    async def acall(self, func: Callable[[], Awaitable[Any]], stats: Optional[RetryStats] = None) -> Any:
+        """Await `func()` until it succeeds or the policy gives up, awaiting between attempts."""
+        stats = stats if stats is not None else RetryStats()
+        stats.calls += 1
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            stats.attempts += 1
+            try:
+                result = await func()
+            except asyncio.CancelledError:
+                raise
+            except BaseException as e:
+                delay = self.next_delay(attempt, e, time.monotonic() - start)
+                if delay is None:
+                    self._give_up(attempt, e, stats, start)
+                    raise
+                logger.warning(f"Attempt {attempt}/{self.max_attempts} failed: {e}. Retrying in {delay:.1f}s...")
+                stats.retries += 1
+                stats.sleep_time += delay
+                await asyncio.sleep(delay)
+                continue
+            stats.elapsed += time.monotonic() - start
+            return result
+
+    def __call__(self, func: Callable) -> Callable:
+        """Use the policy as a decorator on a plain or coroutine function."""
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                return await self.acall(lambda: func(*args, **kwargs))
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return self.call(lambda: func(*args, **kwargs))
+        return wrapper
+
+    def __repr__(self) -> str:
+        return f"RetryPolicy(max_attempts={self.max_attempts}, base_delay={self.base_delay}, budget={self.budget})"
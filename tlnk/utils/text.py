@@ -2,8 +2,33 @@
 Text utilities.
 """
 import re
+import operator
+import functools
 import unicodedata
-from typing import Optional
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+_SNAKE_SEPARATORS = re.compile(r"[\s\-]+")
+_NON_WORD = re.compile(r"[^\w]")
+
+# Thai block: consonants, vowels, tone marks, digits and signs.
+_THAI_FIRST, _THAI_LAST = "\u0e01", "\u0e5b"
+
+# Invisible characters pasted into Thai text as word-break hints.
+_ZERO_WIDTH = "\u200b\u200c\u200d\ufeff"
+
+_THAI_DIGITS = {0x0E50 + n: str(n) for n in range(10)}
+
+# Common Thai typing errors, in one pass:
+#   1. nikhahit + (tone) + sara aa, typed for (tone) + sara am;
+#   2. a tone mark typed before the upper / lower vowel of its consonant;
+#   3. the same vowel or mark typed twice;
+#   4. two sara e typed for sara ae.
+_THAI_FIXES = re.compile(
+    "\u0e4d([\u0e48-\u0e4b]?)\u0e32"
+    "|([\u0e48-\u0e4b])([\u0e31\u0e34-\u0e3a\u0e47])"
+    "|([\u0e31\u0e34-\u0e3a\u0e47-\u0e4e])\\4+"
+    "|\u0e40\u0e40"
+)
 
 
 def normalize(text: str) -> str:
@@ -11,17 +36,22 @@ def normalize(text: str) -> str:
 
 
 def clean_whitespace(text: str) -> str:
-    return re.sub(r"\s+", " ", text).strip()
+    # str.split() and re's \s agree on what whitespace is.
+    return " ".join(text.split())
+
+
+@functools.lru_cache(maxsize=256)
+def _special_chars(keep: str) -> "re.Pattern":
+    return re.compile(rf"[^a-zA-Z0-9\s{re.escape(keep)}]")
 
 
 def remove_special_chars(text: str, keep: str = "") -> str:
-    pattern = rf"[^a-zA-Z0-9\s{re.escape(keep)}]"
-    return re.sub(pattern, "", text)
+    return _special_chars(keep).sub("", text)
 
 
 def to_snake_case(text: str) -> str:
-    text = re.sub(r"[\s\-]+", "_", text.strip().lower())
-    return re.sub(r"[^\w]", "", text)
+    text = _SNAKE_SEPARATORS.sub("_", text.strip().lower())
+    return _NON_WORD.sub("", text)
 
 
 def truncate(text: str, max_length: int, suffix: str = "...") -> str:
@@ -32,3 +62,176 @@ def truncate(text: str, max_length: int, suffix: str = "...") -> str:
 
 def is_empty(value: Optional[str]) -> bool:
     return value is None or str(value).strip() == ""
+
+
+# ── TextPipeline ─────────────────────────────────────────────────
+
+def _fix_thai(match: "re.Match") -> str:
+    if match.group(2):
+        return match.group(3) + match.group(2)
+    if match.group(4):
+        return match.group(4)
+    if match.group(0) == "\u0e40\u0e40":
+        return "\u0e41"
+    return match.group(1) + "\u0e33"
+
+
+def _deleted(name: str, options: Any) -> str:
+    """The regex character class of what a filtering step deletes."""
+    if name == "keep_chars":
+        keep, thai = options
+        return rf"[^a-zA-Z0-9\s{re.escape(keep)}{_THAI_FIRST + '-' + _THAI_LAST if thai else ''}]"
+    if name == "remove_chars":
+        return f"[{re.escape(options)}]" if options else ""
+    return f"[{_ZERO_WIDTH}]"
+
+
+class TextPipeline:
+    """
+    Text normalization steps compiled into as few passes as possible.
+
+    Steps run in the order they are added. Consecutive filters
+    (keep_chars, remove_chars and the zero-width removal of thai) are
+    compiled into one regex deleting the union of what each deletes;
+    NFC / NFKC, casefold and whitespace collapse are one C call each, the
+    Thai fixes one regex. map() chains every pass over a whole column
+    through map(), so strings never go through a Python-level function
+    per cell. Pipelines are immutable: each method returns a new one.
+
+    Values that are not strings pass through unchanged.
+
+    Usage:
+        pipeline = (
+            TextPipeline()
+            .nfc()
+            .thai(digits=True)
+            .keep_chars("-.", thai=True)
+            .casefold()
+            .collapse_whitespace()
+        )
+        pipeline("  ราคา   ๑๐๐ บาท!! ")          # "ราคา 100 บาท"
+        names = pipeline.map(column_values)
+        print(pipeline.explain())
+    """
+
+    def __init__(self, steps: Tuple[Tuple[str, Any], ...] = ()):
+        self.steps = tuple(steps)
+        self._passes: Optional[List[Tuple[str, Callable[[str], str]]]] = None
+
+    def _then(self, name: str, options: Any = None) -> "TextPipeline":
+        return TextPipeline(self.steps + ((name, options),))
+
+    def nfc(self) -> "TextPipeline":
+        """Unicode NFC: composed characters, as normalize() does."""
+        return self._then("nfc")
+
+    def nfkc(self) -> "TextPipeline":
+        """Unicode NFKC: also folds compatibility forms (full-width letters, ligatures)."""
+        return self._then("nfkc")
+
+    def collapse_whitespace(self) -> "TextPipeline":
+        """Runs of whitespace become one space, ends stripped, as clean_whitespace() does."""
+        return self._then("collapse_whitespace")
+
+    def remove_chars(self, chars: str) -> "TextPipeline":
+        """Delete every character in `chars`."""
+        return self._then("remove_chars", chars)
+
+    def keep_chars(self, keep: str = "", thai: bool = False) -> "TextPipeline":
+        """
+        Delete what remove_special_chars() would: all but ASCII letters,
+        digits, whitespace and `keep`; with thai=True the Thai block stays too.
+        """
+        return self._then("keep_chars", (keep, thai))
+
+    def casefold(self) -> "TextPipeline":
+        return self._then("casefold")
+
+    def thai(self, digits: bool = False) -> "TextPipeline":
+        """
+        Remove zero-width characters, fix common Thai typing errors
+        (nikhahit + sara aa for sara am, a tone mark before its vowel,
+        doubled marks, two sara e for sara ae) and, with digits=True,
+        turn Thai digits into ASCII ones.
+        """
+        return self._then("thai", digits)
+
+    # ── Compilation ──────────────────────────────────────────────
+
+    def _compile(self) -> List[Tuple[str, Callable[[str], str]]]:
+        passes: List[Tuple[str, Callable[[str], str]]] = []
+        deletions: List[Tuple[str, str]] = []
+
+        def flush() -> None:
+            # Consecutive filters delete the union of what each deletes: one regex.
+            classes = [cls for _, cls in deletions if cls]
+            if classes:
+                label = ", ".join(dict.fromkeys(name for name, _ in deletions))
+                passes.append((f"delete({label})", functools.partial(re.compile("|".join(classes)).sub, "")))
+            deletions.clear()
+
+        for name, options in self.steps:
+            if name in ("keep_chars", "remove_chars"):
+                deletions.append((name, _deleted(name, options)))
+                continue
+            if name == "thai":
+                deletions.append((name, _deleted(name, options)))
+                flush()
+                if options:
+                    passes.append(("thai digits", operator.methodcaller("translate", _THAI_DIGITS)))
+                passes.append(("thai marks", functools.partial(_THAI_FIXES.sub, _fix_thai)))
+                continue
+            flush()
+            if name in ("nfc", "nfkc"):
+                passes.append((name, functools.partial(unicodedata.normalize, name.upper())))
+            elif name == "casefold":
+                passes.append((name, str.casefold))
+            else:
+                passes.append((name, clean_whitespace))
+        flush()
+        return passes
+
+    @property
+    def passes(self) -> List[Tuple[str, Callable[[str], str]]]:
+        """(label, function) per pass, compiled on first use."""
+        if self._passes is None:
+            self._passes = self._compile()
+        return self._passes
+
+    def __call__(self, text: Any) -> Any:
+        if not isinstance(text, str):
+            return text
+        for _, func in self.passes:
+            text = func(text)
+        return text
+
+    def map(self, values: Iterable[Any]) -> List[Any]:
+        """The pipeline applied to every value of a column, in batch."""
+        values = values if isinstance(values, list) else list(values)
+        if not set(map(type, values)) <= {str}:
+            return [self(value) if isinstance(value, str) else value for value in values]
+        result: Iterable[Any] = values
+        for _, func in self.passes:
+            if func is clean_whitespace:
+                result = map(" ".join, map(str.split, result))
+            else:
+                result = map(func, result)
+        return list(result)
+
+    def explain(self) -> str:
+        lines = [f"TextPipeline: {len(self.steps)} steps in {len(self.passes)} passes"]
+        lines += [f"  {i}. {label}" for i, (label, _) in enumerate(self.passes, 1)]
+        return "\n".join(lines)
+
+    def __reduce__(self) -> Any:
+        # Ship the steps, not the compiled passes: they compile again on first use.
+        return TextPipeline, (self.steps,)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, TextPipeline) and self.steps == other.steps
+
+    def __hash__(self) -> int:
+        return hash(self.steps)
+
+    def __repr__(self) -> str:
+        return f"TextPipeline({', '.join(name for name, _ in self.steps)})"